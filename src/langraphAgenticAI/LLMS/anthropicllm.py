@@ -0,0 +1,24 @@
+from src.langraphAgenticAI.LLMS.base import BaseLLM
+
+class AnthropicLLM(BaseLLM):
+    provider = 'anthropic'
+    display_name = 'Anthropic'
+    api_key_name = 'ANTHROPIC_API_KEY'
+    default_model = 'claude-3-sonnet-20240229'
+
+    def _build_llm(self, settings):
+        """Create a new ChatAnthropic client for the given settings."""
+        try:
+            from langchain_anthropic import ChatAnthropic
+        except ImportError:
+            raise ValueError("Anthropic support requires the langchain-anthropic package (pip install langchain-anthropic).")
+        
+        # The Anthropic SDK keeps its own connection pool per client, which is
+        # reused because the client itself is cached
+        return ChatAnthropic(
+            api_key=settings['api_key'],
+            model=settings['model_name'],
+            temperature=settings['temperature'],
+            max_tokens=settings['max_tokens'],
+            streaming=True
+        )
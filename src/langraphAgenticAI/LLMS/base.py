@@ -0,0 +1,286 @@
+import streamlit as st
+from src.langraphAgenticAI.utils.env_loader import get_env_var
+from src.langraphAgenticAI.utils.cache import llm_client_cache, hash_secret
+from src.langraphAgenticAI.utils.response_cache import ResponseCache, build_cache_key, get_response_cache
+
+class BaseLLM:
+    """
+    Common behaviour of all LLM providers.
+    
+    Subclasses set the provider name, API key variable and default model, and
+    implement _build_llm. Clients are pooled in the process-wide LLM client
+    cache, keyed by provider, model, sampling parameters and API key hash.
+    """
+    
+    provider = None
+    display_name = None
+    api_key_name = None
+    # Environment variable overriding the provider's API endpoint, e.g. to
+    # point the client at a local stub server
+    base_url_name = None
+    default_model = None
+    
+    def __init__(self, user_controls):
+        self.user_controls = user_controls
+
+    def _get_api_key(self):
+        """Return the API key from user controls, then from environment variables."""
+        if not self.api_key_name:
+            return ''
+        return self.user_controls.get(self.api_key_name) or get_env_var(self.api_key_name, '')
+
+    def _get_base_url(self):
+        """Return the API base URL from user controls, then from environment variables."""
+        if not self.base_url_name:
+            return ''
+        return self.user_controls.get(self.base_url_name) or get_env_var(self.base_url_name, '')
+
+    def _get_settings(self):
+        """Resolve the model settings from user controls and environment variables."""
+        model_name = (
+            self.user_controls.get('selected_model')
+            or self.user_controls.get('selected_groq_model')
+            or self.default_model
+        )
+        return {
+            'api_key': self._get_api_key(),
+            'model_name': model_name,
+            'temperature': float(self.user_controls.get('temperature', 0.7)),
+            'max_tokens': int(self.user_controls.get('max_tokens', 4096)),
+            'base_url': self._get_base_url()
+        }
+
+    def get_cache_key(self):
+        """
+        Build the key identifying an LLM client for the current settings.
+
+        The API key is hashed so the raw secret never ends up in the cache.
+
+        Returns:
+            tuple: (provider, model name, temperature, max tokens, API key hash,
+            request coalescing flag, base URL).
+        """
+        settings = self._get_settings()
+        return (
+            self.provider,
+            settings['model_name'],
+            settings['temperature'],
+            settings['max_tokens'],
+            hash_secret(settings['api_key']),
+            bool(self.user_controls.get('coalesce_requests', False)),
+            settings['base_url']
+        )
+
+    def get_response_cache(self):
+        """
+        Return the exact-match response cache if responses may be cached.
+        
+        Returns:
+            ResponseCache: The shared cache, or None when caching is disabled
+            for the current settings.
+        """
+        temperature = float(self.user_controls.get('temperature', 0.7))
+        if not ResponseCache.is_cacheable(temperature, self.user_controls.get('cache_responses', False)):
+            return None
+        return get_response_cache(self.user_controls.get('response_cache_db'))
+    
+    def _response_cache_key(self, prompt):
+        """Build the response cache key for a prompt under the current settings."""
+        settings = self._get_settings()
+        return build_cache_key(
+            prompt,
+            model=settings['model_name'],
+            provider=self.provider,
+            temperature=settings['temperature'],
+            max_tokens=settings['max_tokens']
+        )
+
+    def _build_llm(self, settings):
+        """
+        Create a new chat model client for the given settings.
+        
+        Args:
+            settings (dict): The resolved settings from _get_settings().
+            
+        Returns:
+            BaseChatModel: The LangChain chat model.
+        """
+        raise NotImplementedError
+
+    def get_rate_limit_key(self):
+        """Return the rate limiter lane for the current API key and model."""
+        settings = self._get_settings()
+        return (self.provider, hash_secret(settings['api_key']), settings['model_name'])
+
+    def _attach_rate_limiter(self, llm, settings):
+        """Route every call of the client through the process-wide rate limiter."""
+        # Imported when a client is built, to keep LangChain out of the app's cold start
+        from src.langraphAgenticAI.utils.rate_limiter import get_rate_limiter
+        from src.langraphAgenticAI.utils.rate_limit_callbacks import rate_limit_callbacks
+
+        limiter = get_rate_limiter()
+        key = self.get_rate_limit_key()
+        limiter.configure(
+            key,
+            requests_per_minute=int(self.user_controls.get('rate_limit_rpm', 0)),
+            tokens_per_minute=int(self.user_controls.get('rate_limit_tpm', 0))
+        )
+        llm.callbacks = rate_limit_callbacks(limiter, key, max_tokens=settings['max_tokens'])
+        return llm
+
+    def _create_llm(self, settings):
+        """Build a rate limited client, sharing identical in-flight requests if enabled."""
+        llm = self._attach_rate_limiter(self._build_llm(settings), settings)
+        if self.user_controls.get('coalesce_requests', False):
+            from src.langraphAgenticAI.LLMS.coalescing import CoalescingChatModel
+            llm = CoalescingChatModel(inner=llm)
+        return llm
+
+    def get_llm_model(self):
+        try:
+            settings = self._get_settings()
+            
+            # Check if API key is provided
+            if self.api_key_name and not settings['api_key']:
+                raise ValueError(f"{self.display_name} API key is required. Please provide it in the configuration or .env file.")
+            
+            # Reuse the client (and its HTTP connection pool) across turns
+            llm = llm_client_cache.get_or_create(
+                self.get_cache_key(),
+                lambda: self._create_llm(settings)
+            )
+            
+            return llm
+        
+        except Exception as e:
+            st.error(f"Error initializing {self.display_name} LLM: {str(e)}")
+            return None
+    
+    def generate_response(self, prompt):
+        """
+        Generate a response using the LLM.
+        
+        Args:
+            prompt (str): The user prompt to generate a response for.
+            
+        Returns:
+            str: The generated response from the LLM.
+        """
+        try:
+            response_cache = self.get_response_cache()
+            if response_cache:
+                cache_key = self._response_cache_key(prompt)
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
+            llm = self.get_llm_model()
+            if llm:
+                response = llm.invoke(prompt)
+                if response_cache:
+                    response_cache.put(cache_key, response.content)
+                return response.content
+            else:
+                return "Error: Unable to initialize LLM model. Please check your API key and configuration."
+        
+        except Exception as e:
+            return f"Error generating response: {str(e)}"
+
+    def stream_response(self, prompt):
+        """
+        Stream a response from the LLM token by token.
+        
+        Args:
+            prompt (str): The user prompt to generate a response for.
+            
+        Yields:
+            str: Chunks of the generated response as they arrive.
+        """
+        try:
+            response_cache = self.get_response_cache()
+            if response_cache:
+                cache_key = self._response_cache_key(prompt)
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    yield cached
+                    return
+            
+            llm = self.get_llm_model()
+            if llm:
+                chunks = []
+                for chunk in llm.stream(prompt):
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield chunk.content
+                # Only complete responses are cached
+                if response_cache:
+                    response_cache.put(cache_key, "".join(chunks))
+            else:
+                yield "Error: Unable to initialize LLM model. Please check your API key and configuration."
+        
+        except Exception as e:
+            yield f"Error generating response: {str(e)}"
+
+    async def agenerate_response(self, prompt):
+        """
+        Async variant of generate_response.
+        
+        Args:
+            prompt (str): The user prompt to generate a response for.
+            
+        Returns:
+            str: The generated response from the LLM.
+        """
+        try:
+            response_cache = self.get_response_cache()
+            if response_cache:
+                cache_key = self._response_cache_key(prompt)
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
+            llm = self.get_llm_model()
+            if llm:
+                response = await llm.ainvoke(prompt)
+                if response_cache:
+                    response_cache.put(cache_key, response.content)
+                return response.content
+            else:
+                return "Error: Unable to initialize LLM model. Please check your API key and configuration."
+        
+        except Exception as e:
+            return f"Error generating response: {str(e)}"
+
+    async def astream_response(self, prompt):
+        """
+        Async variant of stream_response.
+        
+        Args:
+            prompt (str): The user prompt to generate a response for.
+            
+        Yields:
+            str: Chunks of the generated response as they arrive.
+        """
+        try:
+            response_cache = self.get_response_cache()
+            if response_cache:
+                cache_key = self._response_cache_key(prompt)
+                cached = response_cache.get(cache_key)
+                if cached is not None:
+                    yield cached
+                    return
+            
+            llm = self.get_llm_model()
+            if llm:
+                chunks = []
+                async for chunk in llm.astream(prompt):
+                    if chunk.content:
+                        chunks.append(chunk.content)
+                        yield chunk.content
+                if response_cache:
+                    response_cache.put(cache_key, "".join(chunks))
+            else:
+                yield "Error: Unable to initialize LLM model. Please check your API key and configuration."
+        
+        except Exception as e:
+            yield f"Error generating response: {str(e)}"
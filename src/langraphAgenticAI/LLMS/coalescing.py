@@ -0,0 +1,109 @@
+import hashlib
+import json
+from typing import Any
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableBinding
+from src.langraphAgenticAI.utils.single_flight import llm_flights
+
+# The shared upstream call must not report to any one caller's callbacks:
+# every subscriber reports its own tokens instead
+_UPSTREAM_CONFIG = {"callbacks": [], "tags": [], "run_name": "coalesced_upstream"}
+
+
+def _follower_copy(message):
+    """Drop the token usage from a follower's copy; the leader already reports it."""
+    return message.model_copy(update={"usage_metadata": None})
+
+
+def _model_identity(model):
+    """Identify a client together with its bound arguments (e.g. tools)."""
+    if isinstance(model, RunnableBinding):
+        return [id(model.bound), json.dumps(model.kwargs, sort_keys=True, default=str)]
+    return [id(model)]
+
+
+class CoalescingChatModel(BaseChatModel):
+    """
+    A chat model that shares in-flight calls between identical requests.
+
+    Requests are keyed by the wrapped client (provider, model and sampling
+    parameters are fixed per pooled client), its bound tools, the full
+    message history and call arguments. While a request is in flight,
+    identical ones subscribe to it instead of calling the provider again,
+    and receive the same streamed chunks. Nothing is kept after the call
+    finishes, so this only flattens bursts; it is not a cache. Only the
+    caller that started a call gets its token usage, so usage totals count
+    each provider call once.
+    """
+
+    inner: Any
+    flights: Any = None
+
+    @property
+    def _llm_type(self):
+        return "coalescing"
+
+    @property
+    def _flights(self):
+        return self.flights or llm_flights
+
+    def _flight_key(self, messages, stop, kwargs):
+        payload = json.dumps(
+            [
+                _model_identity(self.inner),
+                [
+                    [message.type, message.content, getattr(message, "tool_calls", None),
+                     getattr(message, "tool_call_id", None)]
+                    for message in messages
+                ],
+                stop,
+                kwargs
+            ],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._flight_key(messages, stop, kwargs)
+        message, = self._flights.stream(
+            key, lambda: (self.inner.invoke(messages, stop=stop, config=_UPSTREAM_CONFIG, **kwargs),),
+            follower_copy=_follower_copy
+        )
+        # Each subscriber gets its own copy; the run id is assigned per caller
+        return ChatResult(generations=[ChatGeneration(message=message.model_copy(update={"id": None}))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._flight_key(messages, stop, kwargs)
+
+        async def call():
+            yield await self.inner.ainvoke(messages, stop=stop, config=_UPSTREAM_CONFIG, **kwargs)
+
+        message, = [message async for message in self._flights.astream(key, call, follower_copy=_follower_copy)]
+        return ChatResult(generations=[ChatGeneration(message=message.model_copy(update={"id": None}))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._flight_key(messages, stop, kwargs)
+        for chunk in self._flights.stream(
+            key, lambda: self.inner.stream(messages, stop=stop, config=_UPSTREAM_CONFIG, **kwargs),
+            follower_copy=_follower_copy
+        ):
+            generation = ChatGenerationChunk(message=chunk.model_copy(update={"id": None}))
+            if run_manager:
+                run_manager.on_llm_new_token(generation.text, chunk=generation)
+            yield generation
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._flight_key(messages, stop, kwargs)
+        async for chunk in self._flights.astream(
+            key, lambda: self.inner.astream(messages, stop=stop, config=_UPSTREAM_CONFIG, **kwargs),
+            follower_copy=_follower_copy
+        ):
+            generation = ChatGenerationChunk(message=chunk.model_copy(update={"id": None}))
+            if run_manager:
+                await run_manager.on_llm_new_token(generation.text, chunk=generation)
+            yield generation
+
+    def bind_tools(self, tools, **kwargs):
+        return CoalescingChatModel(inner=self.inner.bind_tools(tools, **kwargs), flights=self.flights)
@@ -0,0 +1,91 @@
+import asyncio
+import hashlib
+import re
+import time
+from typing import List
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_TOKEN_RE = re.compile(r"\S+\s*")
+
+
+class FakeStreamingChatModel(BaseChatModel):
+    """
+    A deterministic chat model that simulates provider latency and streaming.
+
+    The response is picked from `responses` by a stable hash of the prompt,
+    so the same conversation always gets the same answer. `latency` delays
+    the first token and `tokens_per_second` paces the rest, which makes the
+    model suitable for offline tests and benchmarks of the streaming path.
+    """
+
+    responses: List[str] = ["This is a simulated response from the fake LLM provider."]
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+    model_name: str = "fake-model"
+
+    @property
+    def _llm_type(self):
+        return "fake-streaming"
+
+    def _pick_response(self, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        text = self.responses[int.from_bytes(digest[:4], "little") % len(self.responses)]
+        return prompt, text
+
+    def _usage(self, prompt, tokens):
+        input_tokens = len(_TOKEN_RE.findall(prompt))
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": len(tokens),
+            "total_tokens": input_tokens + len(tokens)
+        }
+
+    def _token_delay(self):
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt, text = self._pick_response(messages)
+        tokens = _TOKEN_RE.findall(text)
+        time.sleep(self.latency + self._token_delay() * len(tokens))
+        message = AIMessage(content=text, usage_metadata=self._usage(prompt, tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt, text = self._pick_response(messages)
+        tokens = _TOKEN_RE.findall(text)
+        await asyncio.sleep(self.latency + self._token_delay() * len(tokens))
+        message = AIMessage(content=text, usage_metadata=self._usage(prompt, tokens))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt, text = self._pick_response(messages)
+        tokens = _TOKEN_RE.findall(text)
+        time.sleep(self.latency)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(self._token_delay())
+            usage = self._usage(prompt, tokens) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt, text = self._pick_response(messages)
+        tokens = _TOKEN_RE.findall(text)
+        await asyncio.sleep(self.latency)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self._token_delay())
+            usage = self._usage(prompt, tokens) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def bind_tools(self, tools, **kwargs):
+        """The fake model never calls tools, so binding is a no-op."""
+        return self
@@ -0,0 +1,33 @@
+from src.langraphAgenticAI.LLMS.base import BaseLLM
+
+
+class FakeLLM(BaseLLM):
+    provider = 'fake'
+    display_name = 'Fake'
+    api_key_name = None
+    default_model = 'fake-model'
+
+    def _get_fake_options(self):
+        return (
+            float(self.user_controls.get('fake_latency', 0.0)),
+            float(self.user_controls.get('fake_tokens_per_second', 0.0)),
+            tuple(self.user_controls.get('fake_responses') or ())
+        )
+
+    def get_cache_key(self):
+        """Include the simulated latency settings in the client cache key."""
+        return super().get_cache_key() + self._get_fake_options()
+
+    def _build_llm(self, settings):
+        """Create a new fake chat model for the given settings."""
+        # Imported on first use to keep LangChain out of the app's cold start
+        from src.langraphAgenticAI.LLMS.fake_chat_model import FakeStreamingChatModel
+
+        latency, tokens_per_second, responses = self._get_fake_options()
+        options = {"responses": list(responses)} if responses else {}
+        return FakeStreamingChatModel(
+            model_name=settings['model_name'],
+            latency=latency,
+            tokens_per_second=tokens_per_second,
+            **options
+        )
@@ -1,58 +1,28 @@
-import os
-import streamlit as st
-from langchain_groq import ChatGroq
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
-from src.langraphAgenticAI.utils.env_loader import get_env_var
+from src.langraphAgenticAI.LLMS.base import BaseLLM
 
-class GroqLLM:
-    def __init__(self, user_controls):
-        self.user_controls = user_controls
+class GroqLLM(BaseLLM):
+    provider = 'groq'
+    display_name = 'Groq'
+    api_key_name = 'GROQ_API_KEY'
+    base_url_name = 'GROQ_BASE_URL'
+    default_model = 'mixtral-8x7b-32768'
 
-    def get_llm_model(self):
-        try:
-            # First try to get API key from user controls, then from environment variables
-            groq_api_key = self.user_controls.get('GROQ_API_KEY', get_env_var('GROQ_API_KEY', ''))
-            selected_groq_model = self.user_controls.get('selected_groq_model', 'mixtral-8x7b-32768')
-            temperature = float(self.user_controls.get('temperature', 0.7))
-            max_tokens = int(self.user_controls.get('max_tokens', 4096))
-            
-            # Check if API key is provided
-            if not groq_api_key:
-                raise ValueError("Groq API key is required. Please provide it in the configuration or .env file.")
-            
-            # Initialize the Groq LLM
-            llm = ChatGroq(
-                groq_api_key=groq_api_key,
-                model_name=selected_groq_model,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                streaming=True,
-                callbacks=[StreamingStdOutCallbackHandler()]
-            )
-            
-            return llm
+    def _build_llm(self, settings):
+        """Create a new ChatGroq client for the given settings."""
+        # Imported on first use to keep the SDK out of the app's cold start
+        from langchain_groq import ChatGroq
+        from src.langraphAgenticAI.utils.async_runner import get_http_clients
         
-        except Exception as e:
-            st.error(f"Error initializing Groq LLM: {str(e)}")
-            return None
-    
-    def generate_response(self, prompt):
-        """
-        Generate a response using the Groq LLM.
-        
-        Args:
-            prompt (str): The user prompt to generate a response for.
-            
-        Returns:
-            str: The generated response from the LLM.
-        """
-        try:
-            llm = self.get_llm_model()
-            if llm:
-                response = llm.invoke(prompt)
-                return response.content
-            else:
-                return "Error: Unable to initialize LLM model. Please check your API key and configuration."
-        
-        except Exception as e:
-            return f"Error generating response: {str(e)}"
\ No newline at end of file
+        # All clients share the process-wide connection pools
+        http_client, http_async_client = get_http_clients()
+        return ChatGroq(
+            groq_api_key=settings['api_key'],
+            model_name=settings['model_name'],
+            temperature=settings['temperature'],
+            max_tokens=settings['max_tokens'],
+            streaming=True,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            # Only override the SDK's default endpoint when one is configured
+            **({"base_url": settings['base_url']} if settings['base_url'] else {})
+        )
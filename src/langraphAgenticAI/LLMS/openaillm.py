@@ -0,0 +1,28 @@
+from src.langraphAgenticAI.LLMS.base import BaseLLM
+
+class OpenAILLM(BaseLLM):
+    provider = 'openai'
+    display_name = 'OpenAI'
+    api_key_name = 'OPENAI_API_KEY'
+    base_url_name = 'OPENAI_BASE_URL'
+    default_model = 'gpt-3.5-turbo'
+
+    def _build_llm(self, settings):
+        """Create a new ChatOpenAI client for the given settings."""
+        # Imported on first use to keep the SDK out of the app's cold start
+        from langchain_openai import ChatOpenAI
+        from src.langraphAgenticAI.utils.async_runner import get_http_clients
+        
+        # All clients share the process-wide connection pools
+        http_client, http_async_client = get_http_clients()
+        return ChatOpenAI(
+            api_key=settings['api_key'],
+            model=settings['model_name'],
+            temperature=settings['temperature'],
+            max_tokens=settings['max_tokens'],
+            streaming=True,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            # Only override the SDK's default endpoint when one is configured
+            **({"base_url": settings['base_url']} if settings['base_url'] else {})
+        )
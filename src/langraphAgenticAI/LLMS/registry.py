@@ -0,0 +1,59 @@
+import importlib
+import streamlit as st
+
+# Provider name as shown in the sidebar -> dotted path of its LLM handler
+# class. Handlers are imported on first use, so listing the providers does
+# not load their modules.
+LLM_PROVIDERS = {
+    "Groq": "src.langraphAgenticAI.LLMS.groqllm.GroqLLM",
+    "OpenAI": "src.langraphAgenticAI.LLMS.openaillm.OpenAILLM",
+    "Anthropic": "src.langraphAgenticAI.LLMS.anthropicllm.AnthropicLLM",
+    "Fake": "src.langraphAgenticAI.LLMS.fakellm.FakeLLM"
+}
+
+
+def register_provider(name, handler_class):
+    """
+    Register an additional LLM provider.
+
+    Args:
+        name (str): Provider name as selected in the UI.
+        handler_class: A BaseLLM subclass, or its dotted path.
+    """
+    LLM_PROVIDERS[name] = handler_class
+
+
+def get_provider_class(name):
+    """
+    Return the LLM handler class of a provider, importing it on first use.
+
+    Args:
+        name (str): Provider name as selected in the UI.
+
+    Returns:
+        type: The BaseLLM subclass, or None if the provider is unknown.
+    """
+    handler_class = LLM_PROVIDERS.get(name)
+    if isinstance(handler_class, str):
+        module_name, _, class_name = handler_class.rpartition(".")
+        handler_class = getattr(importlib.import_module(module_name), class_name)
+        LLM_PROVIDERS[name] = handler_class
+    return handler_class
+
+
+def get_llm_handler(user_controls):
+    """
+    Get the LLM handler for the provider selected in the user controls.
+
+    Args:
+        user_controls (dict): User configuration options.
+
+    Returns:
+        BaseLLM: The provider's handler, or None if the provider is unknown.
+    """
+    llm_provider = user_controls.get("llm_provider", "Groq")
+    handler_class = get_provider_class(llm_provider)
+    if handler_class is None:
+        st.error(f"LLM provider {llm_provider} not implemented yet.")
+        return None
+    return handler_class(user_controls)
@@ -0,0 +1,487 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import Runnable
+from langchain_core.runnables.config import ensure_config
+from src.langraphAgenticAI.LLMS.registry import LLM_PROVIDERS, get_provider_class
+from src.langraphAgenticAI.graph.streaming import no_stream_config
+from src.langraphAgenticAI.utils.async_runner import get_background_loop
+
+
+class ModelStats:
+    """Rolling latency and error statistics for one model."""
+
+    def __init__(self, window=50, error_threshold=0.5, cooldown=30.0):
+        """
+        Initialize the statistics.
+
+        Args:
+            window (int): Number of recent calls the statistics are based on.
+            error_threshold (float): Error rate above which the model is
+                considered unhealthy.
+            cooldown (float): Seconds an unhealthy model is skipped before it
+                is tried again.
+        """
+        self.samples = deque(maxlen=window)
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.unhealthy_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency, ok):
+        """Record the outcome of one call."""
+        with self._lock:
+            self.samples.append((latency, ok))
+            samples = list(self.samples)
+        if not ok and len(samples) >= 3 and self._error_rate(samples) > self.error_threshold:
+            self.unhealthy_until = time.monotonic() + self.cooldown
+
+    def _snapshot(self):
+        """Return a copy of the samples that other threads cannot change."""
+        with self._lock:
+            return list(self.samples)
+
+    @staticmethod
+    def _error_rate(samples):
+        if not samples:
+            return 0.0
+        return sum(1 for _, ok in samples if not ok) / len(samples)
+
+    @staticmethod
+    def _quantile(samples, q):
+        latencies = sorted(latency for latency, ok in samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+
+    def error_rate(self):
+        return self._error_rate(self._snapshot())
+
+    def quantile(self, q):
+        """Return the q-quantile of successful call latencies, or None without data."""
+        return self._quantile(self._snapshot(), q)
+
+    def successes(self):
+        """Return the number of successful calls in the window."""
+        return sum(1 for _, ok in self._snapshot() if ok)
+
+    def is_healthy(self):
+        return time.monotonic() >= self.unhealthy_until
+
+    def snapshot(self):
+        samples = self._snapshot()
+        return {
+            'calls': len(samples),
+            'p50': self._quantile(samples, 0.5),
+            'p95': self._quantile(samples, 0.95),
+            'error_rate': self._error_rate(samples),
+            'healthy': self.is_healthy()
+        }
+
+
+# Statistics are process-wide so they survive graph rebuilds and are shared
+# by every session routing to the same model
+_model_stats = {}
+_model_stats_lock = threading.Lock()
+
+
+def get_model_stats(key):
+    """Return the shared statistics for a (provider, model) key."""
+    with _model_stats_lock:
+        if key not in _model_stats:
+            _model_stats[key] = ModelStats()
+        return _model_stats[key]
+
+
+def get_all_model_stats():
+    """Return a snapshot of the statistics of every model seen so far."""
+    with _model_stats_lock:
+        items = list(_model_stats.items())
+    return {f"{provider}/{model}": stats.snapshot() for (provider, model), stats in items}
+
+
+# Exception classes of the provider SDKs and httpx that mark a failure as
+# transient, matched by name so no SDK has to be imported
+_TRANSIENT_ERROR_NAMES = {"APIConnectionError", "APITimeoutError", "TransportError"}
+
+
+def is_transient_error(error):
+    """
+    Return True if a failed call may succeed when retried.
+
+    Timeouts, connection errors, rate limits (429) and server errors (5xx)
+    are transient; authentication errors and bad requests are not.
+
+    Args:
+        error (Exception): The error raised by a model call.
+
+    Returns:
+        bool: Whether retrying the call makes sense.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+class _TokenWatch(BaseCallbackHandler):
+    """Note whether a call has streamed tokens the user can see."""
+
+    run_inline = True
+
+    def __init__(self, on_first_token=None):
+        self.emitted = False
+        self._hidden_runs = set()
+        self._on_first_token = on_first_token
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, tags=None, **kwargs):
+        if tags and "nostream" in tags:
+            self._hidden_runs.add(run_id)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if self.emitted or run_id in self._hidden_runs:
+            return
+        self.emitted = True
+        if self._on_first_token:
+            self._on_first_token()
+
+
+def _watched(config, watch):
+    """Return a copy of a runnable config that also reports to watch."""
+    config = ensure_config(config)
+    callbacks = config.get("callbacks")
+    if callbacks is None:
+        callbacks = [watch]
+    elif isinstance(callbacks, list):
+        callbacks = [*callbacks, watch]
+    else:
+        callbacks = callbacks.copy()
+        callbacks.add_handler(watch, inherit=True)
+    return {**config, "callbacks": callbacks}
+
+
+class ModelRouter(Runnable):
+    """
+    Route chat model calls to the fastest healthy model.
+
+    Candidates are ranked by their rolling p50 latency; models without data
+    are tried first so every candidate gets measured. Calls failing with a
+    transient error (timeout, connection error, 429 or 5xx) are retried
+    with jittered exponential backoff; after that, or after any other
+    error, the next candidate is tried. A call that already streamed tokens
+    to the user is never retried, since shown output cannot be retracted.
+
+    With hedging enabled, a second request is sent to the next candidate
+    once the primary has not answered, nor streamed a token, by its p95
+    latency; whichever answers first wins and the other is cancelled. The
+    primary streams as usual and only the hedge request is hidden, so once
+    the primary streams its first token it is the answer.
+    """
+
+    def __init__(self, candidates, max_retries=1, backoff_base=0.2, backoff_max=2.0,
+                 hedge=False, hedge_quantile=0.95, min_samples=5):
+        """
+        Initialize the router.
+
+        Args:
+            candidates (list): (key, chat model) pairs, where key is a
+                (provider, model name) tuple.
+            max_retries (int): Retries per candidate before falling back.
+            backoff_base (float): Base delay in seconds for retry backoff.
+            backoff_max (float): Maximum backoff delay in seconds.
+            hedge (bool): Send a hedged request after the p95 deadline.
+            hedge_quantile (float): Latency quantile used as hedge deadline.
+            min_samples (int): Successful calls needed before hedging a model.
+        """
+        if not candidates:
+            raise ValueError("ModelRouter needs at least one candidate model.")
+        self.candidates = list(candidates)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.min_samples = min_samples
+
+    def rank(self):
+        """
+        Return the candidates ordered by preference.
+
+        Returns:
+            list: (key, model) pairs, healthy models first, then by p50 latency.
+        """
+        def sort_key(candidate):
+            stats = get_model_stats(candidate[0])
+            p50 = stats.quantile(0.5)
+            return (not stats.is_healthy(), p50 is not None, p50 or 0.0)
+        return sorted(self.candidates, key=sort_key)
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff delay for a retry attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _hedge_deadline(self, key):
+        stats = get_model_stats(key)
+        if stats.successes() < self.min_samples:
+            return None
+        return stats.quantile(self.hedge_quantile)
+
+    def _timed_invoke(self, key, model, input, config, **kwargs):
+        started = time.monotonic()
+        try:
+            result = model.invoke(input, config, **kwargs)
+        except Exception:
+            get_model_stats(key).record(time.monotonic() - started, False)
+            raise
+        get_model_stats(key).record(time.monotonic() - started, True)
+        return result
+
+    def _invoke_hedged(self, ranked, index, input, config, **kwargs):
+        key, model = ranked[index]
+        if self._hedge_deadline(key) is None or index + 1 >= len(ranked):
+            return self._timed_invoke(key, model, input, config, **kwargs)
+        # Threads cannot be cancelled, so the race runs on the background
+        # loop, where the losing request is cancelled as in the async path
+        return get_background_loop().run(self._ainvoke_hedged(ranked, index, input, config, **kwargs))
+
+    def invoke(self, input, config=None, **kwargs):
+        """Invoke the best available model, retrying and falling back on failure."""
+        ranked = self.rank()
+        last_error = None
+        for index in range(len(ranked)):
+            for attempt in range(self.max_retries + 1):
+                # Graph "messages" streaming shows the tokens of invoke calls too
+                watch = _TokenWatch()
+                call_config = _watched(config, watch)
+                try:
+                    if self.hedge:
+                        return self._invoke_hedged(ranked, index, input, call_config, **kwargs)
+                    key, model = ranked[index]
+                    return self._timed_invoke(key, model, input, call_config, **kwargs)
+                except Exception as e:
+                    if watch.emitted:
+                        raise
+                    last_error = e
+                    if not is_transient_error(e):
+                        break
+                    if attempt < self.max_retries:
+                        time.sleep(self._backoff(attempt))
+        raise last_error
+
+    async def _atimed_invoke(self, key, model, input, config, **kwargs):
+        started = time.monotonic()
+        try:
+            result = await model.ainvoke(input, config, **kwargs)
+        except Exception:
+            get_model_stats(key).record(time.monotonic() - started, False)
+            raise
+        get_model_stats(key).record(time.monotonic() - started, True)
+        return result
+
+    async def _ainvoke_hedged(self, ranked, index, input, config, **kwargs):
+        key, model = ranked[index]
+        deadline = self._hedge_deadline(key)
+        if deadline is None or index + 1 >= len(ranked):
+            return await self._atimed_invoke(key, model, input, config, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        first_token = asyncio.Event()
+        watch = _TokenWatch(lambda: loop.call_soon_threadsafe(first_token.set))
+        primary = asyncio.ensure_future(self._atimed_invoke(key, model, input, _watched(config, watch), **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=deadline)
+        if done or watch.emitted:
+            return await primary
+
+        # Only the hedge request is hidden from token streaming
+        hedge_key, hedge_model = ranked[index + 1]
+        secondary = asyncio.ensure_future(
+            self._atimed_invoke(hedge_key, hedge_model, input, no_stream_config(config), **kwargs)
+        )
+        streaming = asyncio.ensure_future(first_token.wait())
+        pending = {primary, secondary}
+        error = None
+        try:
+            while pending:
+                watched = pending | {streaming} if primary in pending else pending
+                done, _ = await asyncio.wait(watched, return_when=asyncio.FIRST_COMPLETED)
+                if streaming in done and primary in pending:
+                    # The user already sees the primary's answer
+                    return await primary
+                for task in done - {streaming}:
+                    pending.discard(task)
+                    if task.exception() is None:
+                        return task.result()
+                    if task is primary and watch.emitted:
+                        raise task.exception()
+                    error = task.exception()
+            raise error
+        finally:
+            # The losing request is cancelled instead of left running
+            streaming.cancel()
+            for task in pending:
+                task.cancel()
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        """Async variant of invoke."""
+        ranked = self.rank()
+        last_error = None
+        for index in range(len(ranked)):
+            for attempt in range(self.max_retries + 1):
+                watch = _TokenWatch()
+                call_config = _watched(config, watch)
+                try:
+                    if self.hedge:
+                        return await self._ainvoke_hedged(ranked, index, input, call_config, **kwargs)
+                    key, model = ranked[index]
+                    return await self._atimed_invoke(key, model, input, call_config, **kwargs)
+                except Exception as e:
+                    if watch.emitted:
+                        raise
+                    last_error = e
+                    if not is_transient_error(e):
+                        break
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self._backoff(attempt))
+        raise last_error
+
+    def stream(self, input, config=None, **kwargs):
+        """
+        Stream from the best available model.
+
+        Falls back to the next candidate only if a model fails before its
+        first chunk; once output has been sent it cannot be retracted.
+        """
+        last_error = None
+        for key, model in self.rank():
+            for attempt in range(self.max_retries + 1):
+                started = time.monotonic()
+                emitted = False
+                try:
+                    for chunk in model.stream(input, config, **kwargs):
+                        emitted = True
+                        yield chunk
+                    get_model_stats(key).record(time.monotonic() - started, True)
+                    return
+                except Exception as e:
+                    get_model_stats(key).record(time.monotonic() - started, False)
+                    if emitted:
+                        raise
+                    last_error = e
+                    if not is_transient_error(e):
+                        break
+                    if attempt < self.max_retries:
+                        time.sleep(self._backoff(attempt))
+        raise last_error
+
+    async def astream(self, input, config=None, **kwargs):
+        """Async variant of stream."""
+        last_error = None
+        for key, model in self.rank():
+            for attempt in range(self.max_retries + 1):
+                started = time.monotonic()
+                emitted = False
+                try:
+                    async for chunk in model.astream(input, config, **kwargs):
+                        emitted = True
+                        yield chunk
+                    get_model_stats(key).record(time.monotonic() - started, True)
+                    return
+                except Exception as e:
+                    get_model_stats(key).record(time.monotonic() - started, False)
+                    if emitted:
+                        raise
+                    last_error = e
+                    if not is_transient_error(e):
+                        break
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(self._backoff(attempt))
+        raise last_error
+
+    def bind_tools(self, tools, **kwargs):
+        """Return a router whose candidates are all bound to the tools."""
+        return ModelRouter(
+            [(key, model.bind_tools(tools, **kwargs)) for key, model in self.candidates],
+            max_retries=self.max_retries,
+            backoff_base=self.backoff_base,
+            backoff_max=self.backoff_max,
+            hedge=self.hedge,
+            hedge_quantile=self.hedge_quantile,
+            min_samples=self.min_samples
+        )
+
+
+def build_router(user_controls, model_options, **router_options):
+    """
+    Build a router over the configured models of every provider with an API key.
+
+    The model selected in the sidebar is listed first; other candidates come
+    from the *_MODEL_OPTIONS settings.
+
+    Args:
+        user_controls (dict): User configuration options.
+        model_options (dict): Provider name (lowercase) -> list of model names.
+        **router_options: Passed to ModelRouter.
+
+    Returns:
+        ModelRouter: The router, or None if no model could be initialized.
+    """
+    selected_provider = user_controls.get("llm_provider", "Groq")
+    selected_model = user_controls.get("selected_model") or user_controls.get("selected_groq_model")
+
+    pairs = [(selected_provider, selected_model)]
+    for provider in LLM_PROVIDERS:
+        for model_name in model_options.get(provider.lower(), []):
+            if (provider, model_name) not in pairs:
+                pairs.append((provider, model_name))
+
+    candidates = []
+    for provider, model_name in pairs:
+        handler_class = get_provider_class(provider)
+        if handler_class is None:
+            continue
+        handler = handler_class({
+            **user_controls,
+            "llm_provider": provider,
+            "selected_model": model_name
+        })
+        # Skip providers without credentials instead of reporting an error
+        if handler.api_key_name and not handler._get_api_key():
+            continue
+        llm = handler.get_llm_model()
+        if llm is not None:
+            candidates.append(((handler.provider, model_name), llm))
+
+    if not candidates:
+        return None
+    return ModelRouter(candidates, **router_options)
+
+
+def get_cascade_model(user_controls):
+    """
+    Return the small model a cascade drafts answers with.
+
+    CASCADE_SMALL_MODEL must name the model. Which configured model is
+    smaller cannot be told from the model list, so without it the cascade
+    is disabled rather than drafting with a model that may be the larger one.
+
+    Args:
+        user_controls (dict): User configuration options.
+
+    Returns:
+        BaseChatModel: The small model's pooled client, or None if no small
+        model distinct from the selected one is configured.
+    """
+    provider = user_controls.get("llm_provider", "Groq")
+    selected_model = user_controls.get("selected_model") or user_controls.get("selected_groq_model")
+    small_model = user_controls.get("cascade_small_model")
+    handler_class = get_provider_class(provider)
+    if not small_model or small_model == selected_model or handler_class is None:
+        return None
+    return handler_class({**user_controls, "selected_model": small_model}).get_llm_model()
@@ -0,0 +1,236 @@
+"""
+Batch inference entry point for offline prompt workloads.
+
+Usage:
+    python -m src.langraphAgenticAI.batch --input prompts.jsonl --output results.jsonl
+
+Each input line is a JSON object with a "prompt" and an optional "id". Results
+are appended to the output file as they complete, so an interrupted run can be
+resumed by running the same command again. Failed prompts are retried on the
+next run; once a run finishes, the output is compacted to the last record of
+each id.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from langchain_core.messages import HumanMessage
+from src.langraphAgenticAI.graph.factory import get_graph
+from src.langraphAgenticAI.ui.uiconfigfile import Config
+from src.langraphAgenticAI.utils.env_loader import load_env_variables
+from src.langraphAgenticAI.utils.rate_limiter import PRIORITY_BATCH
+
+
+def read_prompts(path, skip_ids=None):
+    """
+    Stream prompts from a JSONL file.
+
+    Args:
+        path (str): The input file.
+        skip_ids (set): Ids that were already processed.
+
+    Yields:
+        tuple: (id, prompt) pairs.
+    """
+    skip_ids = skip_ids or set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            prompt_id = str(record.get("id", line_number))
+            if prompt_id in skip_ids:
+                continue
+            yield prompt_id, record["prompt"]
+
+
+def read_completed_ids(path):
+    """Return the ids already present in an output file."""
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn last line from an interrupted run is retried
+                continue
+            if "error" not in record:
+                completed.add(str(record["id"]))
+    return completed
+
+
+def compact_results(path):
+    """
+    Keep only the last record of every id in an output file.
+
+    A prompt that failed and succeeded on a later run has both records in
+    the file; the last one wins. Records keep the order of their ids' first
+    appearance, and the file is replaced atomically.
+
+    Args:
+        path (str): The output file.
+
+    Returns:
+        int: Number of superseded records removed.
+    """
+    if not os.path.exists(path):
+        return 0
+    latest = {}
+    lines = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            lines += 1
+            latest[str(record["id"])] = line if line.endswith("\n") else line + "\n"
+    removed = lines - len(latest)
+    if removed:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(latest.values())
+        os.replace(tmp_path, path)
+    return removed
+
+
+def build_graph(args):
+    """Build the chatbot graph for the batch settings through the shared graph factory."""
+    config = Config()
+    llm_options = config.get_llm_options()
+    user_controls = {
+        "llm_provider": args.provider,
+        "selected_model": args.model or llm_options['model_options'].get(args.provider.lower(), [None])[0],
+        "temperature": args.temperature if args.temperature is not None else llm_options['temperature'],
+        "max_tokens": args.max_tokens or llm_options['max_tokens'],
+        "usecase": "Basic Chatbot",
+        **config.get_cache_options(),
+        **config.get_rate_limit_options()
+    }
+    graph = get_graph(user_controls)
+    if graph is None:
+        raise SystemExit("Unable to initialize the LLM. Check the provider, model and API key.")
+    return graph
+
+
+class ThroughputReporter:
+    """Track and print batch throughput."""
+
+    def __init__(self, interval=10.0):
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.completed = 0
+        self.failed = 0
+        self.output_tokens = 0
+
+    def record(self, ok, output_tokens=0):
+        if ok:
+            self.completed += 1
+            self.output_tokens += output_tokens
+        else:
+            self.failed += 1
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.report()
+            self.last_report = now
+
+    def report(self, final=False):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        print(
+            f"{'done' if final else 'progress'}: {self.completed} ok, {self.failed} failed in {elapsed:.1f}s "
+            f"({self.completed / elapsed:.2f} prompts/s, {self.output_tokens / elapsed:.1f} output tokens/s)",
+            file=sys.stderr
+        )
+
+
+async def run_batch(graph, prompts, output_path, concurrency=8):
+    """
+    Run prompts through the graph and append results as they complete.
+
+    Prompts are read lazily and a new one is started as soon as any run
+    finishes, so concurrency stays at its limit until the input runs out
+    and memory use is bounded by the number of runs in flight.
+
+    Args:
+        graph: The compiled graph.
+        prompts: Iterable of (id, prompt) pairs.
+        output_path (str): The JSONL file results are appended to.
+        concurrency (int): Maximum concurrent graph runs.
+
+    Returns:
+        ThroughputReporter: The final throughput statistics.
+    """
+    reporter = ThroughputReporter()
+    config = {"metadata": {"priority": PRIORITY_BATCH}}
+    prompts = iter(prompts)
+
+    async def run(prompt_id, prompt):
+        try:
+            return prompt_id, await graph.ainvoke({"messages": [HumanMessage(content=prompt)]}, config)
+        except Exception as e:
+            return prompt_id, e
+
+    pending = set()
+    with open(output_path, "a", encoding="utf-8") as out:
+        while True:
+            for prompt_id, prompt in itertools.islice(prompts, concurrency - len(pending)):
+                pending.add(asyncio.create_task(run(prompt_id, prompt)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                prompt_id, result = task.result()
+                if isinstance(result, Exception):
+                    record = {"id": prompt_id, "error": str(result)}
+                    reporter.record(False)
+                else:
+                    answer = result["messages"][-1]
+                    usage = getattr(answer, "usage_metadata", None) or {}
+                    record = {"id": prompt_id, "response": answer.content, "usage": usage}
+                    reporter.record(True, usage.get("output_tokens", 0))
+                out.write(json.dumps(record) + "\n")
+                # Flush per result so a crash loses at most the in-flight prompts
+                out.flush()
+
+    reporter.report(final=True)
+    return reporter
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a JSONL file of prompts through the chatbot graph.")
+    parser.add_argument("--input", required=True, help="JSONL file with {\"id\", \"prompt\"} records")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--provider", default="Groq", help="LLM provider (Groq, OpenAI, Anthropic, Fake)")
+    parser.add_argument("--model", default=None, help="Model name (defaults to the first configured model)")
+    parser.add_argument("--temperature", type=float, default=None)
+    parser.add_argument("--max-tokens", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum concurrent requests")
+    parser.add_argument("--no-resume", action="store_true", help="Reprocess prompts already in the output file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    load_env_variables()
+
+    completed = set() if args.no_resume else read_completed_ids(args.output)
+    if completed:
+        print(f"Resuming: skipping {len(completed)} completed prompts", file=sys.stderr)
+
+    graph = build_graph(args)
+    prompts = read_prompts(args.input, skip_ids=completed)
+    asyncio.run(run_batch(graph, prompts, args.output, args.concurrency))
+    removed = compact_results(args.output)
+    if removed:
+        print(f"Compacted output: removed {removed} superseded records", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
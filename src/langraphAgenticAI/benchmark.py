@@ -0,0 +1,273 @@
+"""
+Offline benchmarks of the graph and chatbot node against a fake chat model.
+
+Usage:
+    python -m src.langraphAgenticAI.benchmark --output bench.json
+    python -m src.langraphAgenticAI.benchmark --baseline bench.json
+
+No network or API key is needed: every benchmark runs against
+FakeStreamingChatModel, so the numbers measure framework overhead (graph
+compilation, prompt formatting, state handling, streaming plumbing) rather
+than provider latency. With --baseline, results are compared to an earlier
+run and the command exits non-zero on regressions.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from src.langraphAgenticAI.LLMS.fake_chat_model import FakeStreamingChatModel
+from src.langraphAgenticAI.graph.graph_builder import GraphBuilder
+from src.langraphAgenticAI.graph.streaming import stream_graph_response
+from src.langraphAgenticAI.nodes.basic_chatbot_node import BasicChatBot
+from src.langraphAgenticAI.tool_node.parallel_tool_node import ParallelToolNode
+
+RESPONSE = "The quick brown fox jumps over the lazy dog and keeps on running through the field."
+
+
+@tool
+def echo(text: str) -> str:
+    """Return the given text."""
+    return text
+
+
+def summarize(samples):
+    """
+    Summarize timing samples in milliseconds.
+
+    Args:
+        samples (list): Durations in seconds.
+
+    Returns:
+        dict: Sample count, mean, median and p95 in milliseconds.
+    """
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        "n": len(ms),
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": ms[len(ms) // 2],
+        "p95_ms": ms[min(int(len(ms) * 0.95), len(ms) - 1)]
+    }
+
+
+def timed(func, repeat, warmup=2):
+    """Call func repeatedly and return the durations of the timed calls."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def make_history(turns):
+    """Build a conversation with the given number of user/assistant turns."""
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"Question {i}: what happened next in the story?"))
+        messages.append(AIMessage(content=f"Answer {i}: {RESPONSE}"))
+    return messages
+
+
+def bench_compile(repeat):
+    """Time building and compiling both graph variants."""
+    llm = FakeStreamingChatModel(responses=[RESPONSE])
+    return {
+        "basic": summarize(timed(lambda: GraphBuilder(llm).basic_chatbot_build_graph(), repeat)),
+        "tools": summarize(timed(lambda: GraphBuilder(llm).tool_using_chatbot_build_graph([echo]), repeat))
+    }
+
+
+def bench_turn_overhead(repeat):
+    """
+    Time one turn through each graph and through the bare model.
+
+    The difference is the per-turn cost of the graph, prompt and node code.
+    """
+    llm = FakeStreamingChatModel(responses=[RESPONSE])
+    basic = GraphBuilder(llm).basic_chatbot_build_graph()
+    tools = GraphBuilder(llm).tool_using_chatbot_build_graph([echo])
+    prompt = [HumanMessage(content="Tell me a story.")]
+
+    direct = summarize(timed(lambda: llm.invoke(prompt), repeat))
+    results = {"direct_model": direct}
+    for name, graph in (("basic", basic), ("tools", tools)):
+        stats = summarize(timed(lambda: graph.invoke({"messages": list(prompt)}), repeat))
+        stats["overhead_p50_ms"] = stats["p50_ms"] - direct["p50_ms"]
+        results[name] = stats
+
+    node = ParallelToolNode([echo])
+    call_state = {"messages": [AIMessage(content="", tool_calls=[
+        {"name": "echo", "args": {"text": str(i)}, "id": f"call_{i}"} for i in range(4)
+    ])]}
+    results["tool_node_4_calls"] = summarize(timed(lambda: node.invoke(call_state), repeat))
+    return results
+
+
+def bench_history_scaling(repeat, lengths=(0, 10, 100, 500)):
+    """Time BasicChatBot.run as the conversation grows."""
+    chatbot = BasicChatBot(FakeStreamingChatModel(responses=[RESPONSE]))
+    results = {}
+    for turns in lengths:
+        state = {"messages": make_history(turns) + [HumanMessage(content="And then?")]}
+        results[str(turns)] = summarize(timed(lambda: chatbot.run(state), repeat))
+    return results
+
+
+def bench_ttft(repeat, latency=0.05, tokens_per_second=200.0):
+    """
+    Time to the first streamed chunk through the graph.
+
+    The simulated model latency is subtracted, leaving the streaming overhead.
+    """
+    llm = FakeStreamingChatModel(responses=[RESPONSE], latency=latency, tokens_per_second=tokens_per_second)
+    graph = GraphBuilder(llm).basic_chatbot_build_graph()
+    ttft, total = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        first = None
+        for _chunk in stream_graph_response(graph, [HumanMessage(content="Tell me a story.")]):
+            if first is None:
+                first = time.perf_counter() - started
+        ttft.append(first)
+        total.append(time.perf_counter() - started)
+    results = {"ttft": summarize(ttft), "total": summarize(total)}
+    results["ttft"]["overhead_p50_ms"] = results["ttft"]["p50_ms"] - latency * 1000
+    return results
+
+
+def bench_throughput(sessions=(1, 8, 32), turns=4, latency=0.05):
+    """Completed turns per second with many concurrent sessions."""
+    llm = FakeStreamingChatModel(responses=[RESPONSE], latency=latency)
+    graph = GraphBuilder(llm).basic_chatbot_build_graph()
+
+    async def session(index):
+        messages = []
+        for turn in range(turns):
+            messages.append(HumanMessage(content=f"Session {index}, turn {turn}"))
+            result = await graph.ainvoke({"messages": list(messages)})
+            messages = result["messages"]
+
+    async def run(count):
+        started = time.perf_counter()
+        await asyncio.gather(*(session(i) for i in range(count)))
+        return time.perf_counter() - started
+
+    results = {}
+    for count in sessions:
+        elapsed = asyncio.run(run(count))
+        results[str(count)] = {
+            "elapsed_s": elapsed,
+            "turns_per_s": count * turns / elapsed,
+            # With perfect concurrency every session finishes in turns * latency
+            "efficiency": turns * latency / elapsed
+        }
+    return results
+
+
+def run_benchmarks(repeat=20):
+    """
+    Run every benchmark.
+
+    Args:
+        repeat (int): Timed repetitions per measurement.
+
+    Returns:
+        dict: The results, with environment details.
+    """
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "compile": bench_compile(repeat),
+        "turn_overhead": bench_turn_overhead(repeat),
+        "history_scaling": bench_history_scaling(repeat),
+        "ttft": bench_ttft(max(repeat // 2, 3)),
+        "throughput": bench_throughput()
+    }
+
+
+def _flatten(results, prefix=""):
+    """Yield (path, value) for the numeric leaves of a results dict."""
+    for key, value in results.items():
+        if key == "environment":
+            continue
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from _flatten(value, path)
+        elif isinstance(value, (int, float)):
+            yield path, value
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=0.5):
+    """
+    Compare results with a baseline run.
+
+    Latencies (p50) regress when they grow by more than tolerance and
+    min_delta_ms; throughput regresses when it drops by more than tolerance.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): The baseline results.
+        tolerance (float): Allowed relative change.
+        min_delta_ms (float): Ignore latency changes smaller than this.
+
+    Returns:
+        list: Descriptions of the regressions found.
+    """
+    previous = dict(_flatten(baseline))
+    regressions = []
+    for path, value in _flatten(results):
+        old = previous.get(path)
+        if old is None or old <= 0:
+            continue
+        if path.endswith("p50_ms") and value > old * (1 + tolerance) and value - old > min_delta_ms:
+            regressions.append(f"{path}: {old:.2f} -> {value:.2f} ms")
+        elif path.endswith("turns_per_s") and value < old * (1 - tolerance):
+            regressions.append(f"{path}: {old:.1f} -> {value:.1f} turns/s")
+    return regressions
+
+
+def print_summary(results):
+    for path, value in _flatten(results):
+        if path.endswith(("p50_ms", "overhead_p50_ms", "turns_per_s")):
+            print(f"{path:55s} {value:10.2f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark graph overhead against a fake chat model.")
+    parser.add_argument("--output", default=None, help="JSON file the results are written to")
+    parser.add_argument("--baseline", default=None, help="Earlier results to compare against")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions per measurement")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_benchmarks(args.repeat)
+    print_summary(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import threading
+from langgraph.checkpoint.memory import MemorySaver
+from src.langraphAgenticAI.state.serialization import CompactSerializer
+from src.langraphAgenticAI.utils.async_runner import get_background_loop
+
+CHECKPOINTER_KINDS = ("none", "memory", "sqlite")
+
+_checkpointers = {}
+_lock = threading.Lock()
+
+
+def _create_sqlite_checkpointer(path):
+    """
+    Create a SQLite checkpointer bound to the background event loop.
+
+    AsyncSqliteSaver serves both graph.astream (on the loop) and the sync
+    graph APIs (by scheduling onto the loop), so one saver covers both paths.
+    """
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    async def open_saver():
+        conn = await aiosqlite.connect(path)
+        saver = AsyncSqliteSaver(conn, serde=CompactSerializer())
+        await saver.setup()
+        return saver
+
+    return get_background_loop().run(open_saver())
+
+
+def get_checkpointer(kind="memory", path=None):
+    """
+    Return the process-wide checkpointer of the given kind.
+
+    Args:
+        kind (str): "memory" for an in-process saver, "sqlite" for a saver that
+            survives restarts, or "none" to disable checkpointing.
+        path (str): Database path for the SQLite checkpointer.
+
+    Returns:
+        BaseCheckpointSaver: The shared checkpointer, or None for "none".
+    """
+    if kind in (None, "", "none"):
+        return None
+    if kind not in CHECKPOINTER_KINDS:
+        raise ValueError(f"Unknown checkpointer {kind!r}. Expected one of {CHECKPOINTER_KINDS}.")
+
+    with _lock:
+        key = (kind, path)
+        if key not in _checkpointers:
+            if kind == "memory":
+                _checkpointers[key] = MemorySaver(serde=CompactSerializer())
+            else:
+                _checkpointers[key] = _create_sqlite_checkpointer(path or ".cache/checkpoints.sqlite")
+        return _checkpointers[key]
+
+
+def thread_config(thread_id):
+    """
+    Build the runnable config selecting a conversation thread.
+
+    Args:
+        thread_id (str): The conversation's thread id.
+
+    Returns:
+        dict: Config passed to graph.invoke/stream.
+    """
+    return {"configurable": {"thread_id": thread_id}}
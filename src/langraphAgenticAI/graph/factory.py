@@ -0,0 +1,169 @@
+"""
+Graph construction shared by every entry point.
+"""
+from src.langraphAgenticAI.LLMS.registry import get_llm_handler
+from src.langraphAgenticAI.utils.cache import graph_cache
+
+
+def get_graph(user_controls, tools=None):
+    """
+    Build (or fetch the cached) compiled graph for the given settings.
+    
+    Shared by the Streamlit app, the HTTP server and other entry points, so
+    every client runs the same graphs.
+    
+    Args:
+        user_controls (dict): User configuration options.
+        tools (list): Tools for the tool-using chatbot. If given, the tool
+            graph is built instead of the use case's graph.
+        
+    Returns:
+        object: A compiled LangGraph, or None if the LLM could not be initialized.
+    """
+    # Get LLM based on user selection
+    llm_handler = get_llm_handler(user_controls)
+    
+    if llm_handler:
+        # Initialize (or reuse) the provider's pooled client
+        llm = llm_handler.get_llm_model()
+        
+        if not llm:
+            return None
+        
+        # Compiled graphs are cached per LLM settings, use case, history
+        # settings and tool set
+        usecase = user_controls.get("usecase", "Basic Chatbot")
+        history_token_budget = int(user_controls.get("history_token_budget", 0))
+        summarize_history = bool(user_controls.get("summarize_history", False))
+        use_semantic_cache = bool(user_controls.get("semantic_cache", False))
+        response_cache = llm_handler.get_response_cache()
+        checkpointer_kind = user_controls.get("checkpointer", "none")
+        checkpoint_db = user_controls.get("checkpoint_db")
+        routing = bool(user_controls.get("routing", False))
+        hedge_requests = bool(user_controls.get("hedge_requests", False))
+        tracing = bool(user_controls.get("tracing", False))
+        cascade = bool(user_controls.get("cascade", False)) and usecase == "Basic Chatbot" and not tools
+        cascade_settings = (
+            user_controls.get("cascade_small_model"),
+            user_controls.get("cascade_complexity_threshold"),
+            user_controls.get("cascade_confidence_threshold")
+        ) if cascade else ()
+        cache_key = (
+            llm_handler.get_cache_key(),
+            usecase,
+            (history_token_budget, summarize_history, use_semantic_cache, response_cache is not None),
+            (checkpointer_kind, checkpoint_db),
+            (routing, hedge_requests),
+            (tracing, user_controls.get("trace_file")) if tracing else (),
+            cascade_settings,
+            (
+                user_controls.get("rag_index_dir"),
+                user_controls.get("rag_top_k"),
+                user_controls.get("rag_max_context_chars")
+            ) if usecase == "RAG Chatbot" else (),
+            (
+                user_controls.get("map_reduce_chunk_chars"),
+                user_controls.get("map_reduce_group_size"),
+                user_controls.get("map_reduce_max_concurrency")
+            ) if usecase == "Document Summarizer" else (),
+            tuple(sorted(tool.name for tool in tools or []))
+        )
+        
+        def build_graph():
+            from src.langraphAgenticAI.graph.graph_builder import GraphBuilder
+            from src.langraphAgenticAI.graph.checkpointer import get_checkpointer
+            from src.langraphAgenticAI.utils.history_manager import HistoryManager, LLMSummarizer
+            from src.langraphAgenticAI.utils.tracing import get_tracer
+            
+            history_manager = HistoryManager.from_config(
+                llm_handler.get_cache_key()[1],
+                user_controls.get("max_tokens", 4096),
+                token_budget=history_token_budget,
+                summarizer=LLMSummarizer(llm) if summarize_history else None
+            )
+            semantic_cache = None
+            if use_semantic_cache:
+                from src.langraphAgenticAI.vectorstore.semantic_cache import SemanticCache, get_semantic_cache
+                from src.langraphAgenticAI.nodes.semantic_cache_node import SemanticCacheNode
+                
+                # Answers are only shared between identical model settings;
+                # the API key hash is left out so all users share the cache.
+                semantic_cache = SemanticCacheNode(
+                    get_semantic_cache(
+                        threshold=user_controls.get("semantic_cache_threshold", 0.92),
+                        ttl_seconds=user_controls.get("semantic_cache_ttl_seconds"),
+                        persist_dir=user_controls.get("semantic_cache_dir")
+                    ),
+                    SemanticCache.namespace_key(*llm_handler.get_cache_key()[:4])
+                )
+            llm_key = llm_handler.get_cache_key()
+            model = llm
+            if routing:
+                from src.langraphAgenticAI.LLMS.router import build_router
+                
+                # Route each call to the fastest healthy configured model
+                model = build_router(
+                    user_controls,
+                    user_controls.get("model_options", {}),
+                    hedge=hedge_requests,
+                    max_retries=user_controls.get("router_max_retries", 1)
+                ) or llm
+            cascade_node = None
+            if cascade:
+                from src.langraphAgenticAI.LLMS.router import get_cascade_model
+                from src.langraphAgenticAI.nodes.cascade_node import CascadeNode
+                
+                # Without a configured small model every turn goes to the chatbot
+                small_model = get_cascade_model(user_controls)
+                if small_model is not None:
+                    cascade_node = CascadeNode(
+                        small_model,
+                        history_manager=history_manager,
+                        complexity_threshold=user_controls.get("cascade_complexity_threshold", 0.6),
+                        confidence_threshold=user_controls.get("cascade_confidence_threshold", 0.7)
+                    )
+            builder = GraphBuilder(
+                model,
+                history_manager=history_manager,
+                semantic_cache=semantic_cache,
+                response_cache=response_cache,
+                cache_params={
+                    "model": llm_key[1],
+                    "provider": llm_key[0],
+                    "temperature": llm_key[2],
+                    "max_tokens": llm_key[3]
+                },
+                checkpointer=get_checkpointer(checkpointer_kind, checkpoint_db),
+                tracer=get_tracer(user_controls.get("trace_file")) if tracing else None,
+                cascade=cascade_node
+            )
+            if tools:
+                return builder.tool_using_chatbot_build_graph(tools)
+            if usecase == "RAG Chatbot":
+                from src.langraphAgenticAI.vectorstore.document_index import get_document_index
+                from src.langraphAgenticAI.nodes.retrieval_node import RetrievalNode
+                
+                # Documents are added with the vectorstore.ingest command
+                return builder.rag_chatbot_build_graph(RetrievalNode(
+                    get_document_index(user_controls.get("rag_index_dir", ".cache/rag")),
+                    k=user_controls.get("rag_top_k", 4),
+                    max_chars=user_controls.get("rag_max_context_chars", 4000)
+                ))
+            if usecase == "Document Summarizer":
+                from src.langraphAgenticAI.nodes.map_reduce_node import MapReduceNode
+                
+                return builder.map_reduce_build_graph(MapReduceNode(
+                    model,
+                    chunk_chars=user_controls.get("map_reduce_chunk_chars", 6000),
+                    group_size=user_controls.get("map_reduce_group_size", 4),
+                    max_concurrency=user_controls.get("map_reduce_max_concurrency", 4)
+                ))
+            return builder.basic_chatbot_build_graph()
+        
+        # Build the graph only on a cache miss
+        graph = graph_cache.get_or_create(cache_key, build_graph)
+        
+        return graph
+    
+    else:
+        return None
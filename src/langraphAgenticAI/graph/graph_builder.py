@@ -1,13 +1,55 @@
 from langgraph.graph import StateGraph, END, MessagesState
-from langgraph.prebuilt import tools_condition, ToolNode
+from langgraph.prebuilt import tools_condition
 from langchain_core.prompts import ChatMessagePromptTemplate
-from src.langraphAgenticAI.state.state import AgentState
+from langchain_core.runnables import RunnableLambda
+from src.langraphAgenticAI.state.state import AgentState, DocumentState
 from src.langraphAgenticAI.nodes.basic_chatbot_node import BasicChatBot
+from src.langraphAgenticAI.tool_node.parallel_tool_node import ParallelToolNode
+from src.langraphAgenticAI.utils.tracing import traced_node
 
 
 class GraphBuilder:
-    def __init__(self, model):
+    def __init__(self, model, history_manager=None, semantic_cache=None,
+                 response_cache=None, cache_params=None, checkpointer=None, tracer=None, cascade=None):
         self.llm = model
+        self.history_manager = history_manager
+        self.semantic_cache = semantic_cache
+        # With a cascade node, a small model drafts answers before the main one
+        self.cascade = cascade
+        self.response_cache = response_cache
+        self.cache_params = cache_params
+        # With a checkpointer, conversation state is stored per thread_id and
+        # each run only needs to submit the new messages
+        self.checkpointer = checkpointer
+        # With a tracer, every node call is recorded as a latency span
+        self.tracer = tracer
+    
+    def _node(self, name, func, afunc=None):
+        """
+        Wrap node functions in a named runnable, traced if a tracer is set.
+        
+        Args:
+            name (str): The node name.
+            func: The sync node function.
+            afunc: The async node function, if any.
+            
+        Returns:
+            RunnableLambda: The node runnable.
+        """
+        if self.tracer:
+            func = traced_node(name, func, self.tracer)
+            afunc = traced_node(name, afunc, self.tracer) if afunc else None
+        return RunnableLambda(func, afunc=afunc, name=name)
+    
+    def _create_chatbot(self, tools=None):
+        """Create the chatbot node with the builder's shared settings."""
+        return BasicChatBot(
+            self.llm,
+            tools=tools,
+            history_manager=self.history_manager,
+            response_cache=self.response_cache,
+            cache_params=self.cache_params
+        )
         
     def basic_chatbot_build_graph(self):
         """
@@ -20,32 +62,130 @@ class GraphBuilder:
         graph = StateGraph(AgentState)
         
         # Create the basic chatbot node
-        chatbot_node = BasicChatBot(self.llm)
+        chatbot_node = self._create_chatbot()
         
         # Add the chatbot node to the graph
-        graph.add_node("chatbot", chatbot_node.run)
+        graph.add_node("chatbot", self._node("chatbot", chatbot_node.run, chatbot_node.arun))
+        
+        answer_entry = "chatbot"
+        if self.cascade:
+            # Accepted drafts of the small model end the turn; the rest
+            # escalate to the chatbot
+            graph.add_node("cascade", self._node("cascade", self.cascade.run, self.cascade.arun))
+            graph.add_conditional_edges(
+                "cascade",
+                self.cascade.route,
+                {"chatbot": "chatbot", END: END}
+            )
+            answer_entry = "cascade"
+        
+        if self.semantic_cache:
+            # Answer near-duplicate prompts from the cache and skip the LLM
+            graph.add_node("cache_lookup", self._node("cache_lookup", self.semantic_cache.lookup))
+            graph.add_node("cache_store", self._node("cache_store", self.semantic_cache.store))
+            graph.set_entry_point("cache_lookup")
+            graph.add_conditional_edges(
+                "cache_lookup",
+                self.semantic_cache.route,
+                {"chatbot": answer_entry, END: END}
+            )
+            graph.add_edge("chatbot", "cache_store")
+            graph.add_edge("cache_store", END)
+        else:
+            # Set the entry point for the graph
+            graph.set_entry_point(answer_entry)
+            
+            # Add conditional edges
+            graph.add_conditional_edges(
+                "chatbot",
+                # For now, we're just ending after one response
+                lambda state: END
+            )
         
-        # Set the entry point for the graph
-        graph.set_entry_point("chatbot")
+        # Compile the graph
+        compiled_graph = graph.compile(checkpointer=self.checkpointer)
         
-        # Add conditional edges
-        graph.add_conditional_edges(
-            "chatbot",
-            # For now, we're just ending after one response
-            lambda state: END
-        )
+        return compiled_graph
+    
+    def rag_chatbot_build_graph(self, retrieval_node):
+        """
+        Build a retrieval-augmented chatbot graph.
+        
+        The retrieval node searches the document index for the user message
+        and the chatbot answers with the retrieved chunks in its prompt.
+        
+        Args:
+            retrieval_node (RetrievalNode): The node searching the document index.
+            
+        Returns:
+            StateGraph: A compiled LangGraph state graph.
+        """
+        # Create a state graph with the defined state
+        graph = StateGraph(AgentState)
+        
+        # Create the basic chatbot node
+        chatbot_node = self._create_chatbot()
+        
+        # Retrieve context first, then answer
+        graph.add_node("retrieve", self._node("retrieve", retrieval_node.retrieve))
+        graph.add_node("chatbot", self._node("chatbot", chatbot_node.run, chatbot_node.arun))
+        graph.set_entry_point("retrieve")
+        graph.add_edge("retrieve", "chatbot")
+        graph.add_edge("chatbot", END)
+        
+        # Compile the graph
+        compiled_graph = graph.compile(checkpointer=self.checkpointer)
+        
+        return compiled_graph
+    
+    def map_reduce_build_graph(self, map_reduce_node):
+        """
+        Build a map-reduce graph for long documents.
+        
+        The document is split into chunks that are processed in parallel
+        branches; the partial results are merged level by level until the
+        combine node writes the answer.
+        
+        Args:
+            map_reduce_node (MapReduceNode): The node holding the split, map
+                and reduce steps.
+            
+        Returns:
+            StateGraph: A compiled LangGraph state graph.
+        """
+        node = map_reduce_node
+        
+        # Create a state graph with the document state
+        graph = StateGraph(DocumentState)
+        
+        graph.add_node("split", self._node("split", node.split))
+        graph.add_node("map_chunk", self._node("map_chunk", node.map_chunk, node.amap_chunk))
+        graph.add_node("collect", self._node("collect", node.collect))
+        graph.add_node("reduce_group", self._node("reduce_group", node.reduce_group, node.areduce_group))
+        graph.add_node("combine", self._node("combine", node.combine, node.acombine))
+        graph.set_entry_point("split")
+        
+        # One branch per chunk, then per group of partial results, until
+        # few enough remain to combine
+        graph.add_conditional_edges("split", node.fan_out, ["map_chunk", "combine"])
+        graph.add_edge("map_chunk", "collect")
+        graph.add_conditional_edges("collect", node.route_reduce, ["reduce_group", "combine"])
+        graph.add_edge("reduce_group", "collect")
+        graph.add_edge("combine", END)
         
         # Compile the graph
-        compiled_graph = graph.compile()
+        compiled_graph = graph.compile(checkpointer=self.checkpointer)
         
         return compiled_graph
     
-    def tool_using_chatbot_build_graph(self, tools=None):
+    def tool_using_chatbot_build_graph(self, tools=None, **tool_node_options):
         """
         Build a LangGraph chatbot with tools.
         
         Args:
             tools (list): List of tools the chatbot can use.
+            **tool_node_options: Passed to ParallelToolNode (timeouts,
+                concurrency limits, cacheable tools).
             
         Returns:
             StateGraph: A compiled LangGraph state graph with tools.
@@ -57,16 +197,16 @@ class GraphBuilder:
         graph = StateGraph(AgentState)
         
         # Create the basic chatbot node
-        chatbot_node = BasicChatBot(self.llm, tools=tools)
+        chatbot_node = self._create_chatbot(tools=tools)
         
-        # Create a tool node
-        tool_node = ToolNode(tools)
+        # Create a tool node that runs the tool calls of one turn concurrently
+        tool_node = ParallelToolNode(tools, **tool_node_options)
         
         # Add the chatbot node to the graph
-        graph.add_node("chatbot", chatbot_node.run)
+        graph.add_node("chatbot", self._node("chatbot", chatbot_node.run, chatbot_node.arun))
         
         # Add the tool node to the graph
-        graph.add_node("tools", tool_node)
+        graph.add_node("tools", self._node("tools", tool_node.invoke, tool_node.ainvoke))
         
         # Set the entry point for the graph
         graph.set_entry_point("chatbot")
@@ -85,6 +225,6 @@ class GraphBuilder:
         graph.add_edge("tools", "chatbot")
         
         # Compile the graph
-        compiled_graph = graph.compile()
+        compiled_graph = graph.compile(checkpointer=self.checkpointer)
         
         return compiled_graph
\ No newline at end of file
@@ -0,0 +1,93 @@
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+from langchain_core.runnables.config import ensure_config
+
+# Nodes whose messages make up the answer shown to the user
+RESPONSE_NODES = ("chatbot", "cache_lookup", "cascade", "combine")
+
+
+def no_stream_config(config):
+    """
+    Return a copy of a runnable config whose LLM tokens are not streamed.
+
+    LangGraph's "messages" stream mode skips runs tagged "nostream", so
+    intermediate calls (drafts, hedged attempts) stay hidden from the user.
+
+    Args:
+        config (dict): The runnable config, or None.
+
+    Returns:
+        dict: The config with the "nostream" tag added.
+    """
+    config = ensure_config(config)
+    return {**config, "tags": list(config.get("tags") or []) + ["nostream"]}
+
+
+def history_to_messages(history):
+    """
+    Convert Streamlit chat history into LangChain messages.
+
+    Args:
+        history (list): List of {"role": ..., "content": ...} dicts.
+
+    Returns:
+        list: The equivalent HumanMessage/AIMessage objects.
+    """
+    messages = []
+    for message in history:
+        if message["role"] == "user":
+            messages.append(HumanMessage(content=message["content"]))
+        else:
+            messages.append(AIMessage(content=message["content"]))
+    return messages
+
+
+def stream_graph_response(graph, messages, config=None, nodes=RESPONSE_NODES):
+    """
+    Stream the response of a compiled graph token by token.
+
+    Uses LangGraph's "messages" stream mode, which surfaces LLM tokens as
+    they are generated inside a node instead of waiting for the node to
+    finish.
+
+    Args:
+        graph: A compiled LangGraph.
+        messages (list): The input messages for the graph.
+        config (dict): Optional runnable config passed to the graph.
+        nodes (tuple): Only messages emitted by these nodes are yielded.
+
+    Yields:
+        str: Text chunks of the response.
+    """
+    for message, metadata in graph.stream(
+        {"messages": messages},
+        config=config,
+        stream_mode="messages"
+    ):
+        if nodes and metadata.get("langgraph_node") not in nodes:
+            continue
+        if isinstance(message, (AIMessageChunk, AIMessage)) and message.content:
+            yield message.content
+
+
+async def astream_graph_response(graph, messages, config=None, nodes=RESPONSE_NODES):
+    """
+    Async variant of stream_graph_response.
+
+    Args:
+        graph: A compiled LangGraph.
+        messages (list): The input messages for the graph.
+        config (dict): Optional runnable config passed to the graph.
+        nodes (tuple): Only messages emitted by these nodes are yielded.
+
+    Yields:
+        str: Text chunks of the response.
+    """
+    async for message, metadata in graph.astream(
+        {"messages": messages},
+        config=config,
+        stream_mode="messages"
+    ):
+        if nodes and metadata.get("langgraph_node") not in nodes:
+            continue
+        if isinstance(message, (AIMessageChunk, AIMessage)) and message.content:
+            yield message.content
@@ -0,0 +1,316 @@
+"""
+End-to-end load test against a local stub of the provider API.
+
+Usage:
+    python -m src.langraphAgenticAI.loadtest --sessions 100 --turns 3 --latency 0.3 --tokens-per-second 80
+    python -m src.langraphAgenticAI.loadtest --base-url http://10.0.0.5:9000 --sessions 500 --output load.json
+
+Unless --base-url is given, stub_llm_server is started on a free local port.
+The provider client is pointed at it through its base-URL setting
+(GROQ_BASE_URL / OPENAI_BASE_URL), so every turn goes through the real SDK,
+HTTP connection pool, retries and streaming parser. Simulated sessions run
+concurrently through the same graph the app serves, on the shared
+background loop. The report covers throughput, time to first token and
+p50/p95/p99 latencies, plus the stub's counters (requests above the number
+of turns are SDK retries).
+
+The in-process stub shares the CPU with the clients; for large runs start
+it separately with python -m src.langraphAgenticAI.stub_llm_server and pass
+--base-url.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+import uuid
+from collections import Counter
+from langchain_core.messages import AIMessage, HumanMessage
+from src.langraphAgenticAI.LLMS.registry import get_provider_class
+from src.langraphAgenticAI.graph.checkpointer import thread_config
+from src.langraphAgenticAI.graph.factory import get_graph
+from src.langraphAgenticAI.graph.streaming import astream_graph_response
+from src.langraphAgenticAI.server import default_user_controls
+from src.langraphAgenticAI.stub_llm_server import add_stub_arguments, create_stub_app, stub_options
+from src.langraphAgenticAI.utils.async_runner import get_background_loop
+from src.langraphAgenticAI.utils.rate_limiter import PRIORITY_INTERACTIVE
+
+# Path of the chat-completions API below the stub's root, per provider SDK
+API_PATHS = {
+    "Groq": "",
+    "OpenAI": "/v1"
+}
+
+QUESTIONS = (
+    "What is a good name for a small bakery?",
+    "How do I keep basil fresh for longer?",
+    "Explain what a load balancer does in two sentences.",
+    "Suggest a weekend hiking checklist."
+)
+
+
+def percentiles(samples, quantiles=(0.5, 0.95, 0.99)):
+    """
+    Summarize durations in milliseconds.
+
+    Args:
+        samples (list): Durations in seconds.
+        quantiles (tuple): The quantiles to report.
+
+    Returns:
+        dict: Sample count, mean and the requested percentiles.
+    """
+    if not samples:
+        return {"n": 0}
+    ms = sorted(sample * 1000 for sample in samples)
+    summary = {"n": len(ms), "mean_ms": sum(ms) / len(ms)}
+    for q in quantiles:
+        summary[f"p{round(q * 100)}_ms"] = ms[min(int(q * len(ms)), len(ms) - 1)]
+    return summary
+
+
+def _free_port(host):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """Run the stub provider API in a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=None, **options):
+        """
+        Initialize the server.
+
+        Args:
+            host (str): Interface to listen on.
+            port (int): Port to listen on; a free one is picked by default.
+            **options: Passed to create_stub_app.
+        """
+        self.host = host
+        self.port = port or _free_port(host)
+        self.app = create_stub_app(**options)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout=10.0):
+        """Start serving and wait until the socket accepts connections."""
+        import uvicorn
+
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, name="stub-llm-server", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError(f"Stub server did not start on {self.url}.")
+            time.sleep(0.02)
+        return self
+
+    def stats(self):
+        return self.app.state.stats.snapshot()
+
+    def stop(self):
+        if self._server:
+            self._server.should_exit = True
+            self._thread.join(5.0)
+
+
+def build_user_controls(provider, model, base_url, api_key="stub-key", rate_limits=False):
+    """
+    Build graph settings that send every turn to the given endpoint.
+
+    Caches, request coalescing, routing and the cascade are turned off so
+    each turn makes exactly one upstream call.
+
+    Args:
+        provider (str): "Groq" or "OpenAI".
+        model (str): Model name; defaults to the first configured model.
+        base_url (str): Root URL of the stub (or provider) API.
+        api_key (str): API key sent to the endpoint.
+        rate_limits (bool): Keep the configured client-side rate limits.
+
+    Returns:
+        dict: Settings in the format the Streamlit sidebar produces.
+    """
+    controls = default_user_controls()
+    handler_class = get_provider_class(provider)
+    models = controls['model_options'].get(provider.lower(), [])
+    controls.update({
+        "llm_provider": provider,
+        "selected_model": model or (models[0] if models else handler_class.default_model),
+        "usecase": "Basic Chatbot",
+        handler_class.api_key_name: api_key,
+        handler_class.base_url_name: base_url + API_PATHS.get(provider, ""),
+        "semantic_cache": False,
+        "cache_responses": False,
+        "coalesce_requests": False,
+        "routing": False,
+        "hedge_requests": False,
+        "cascade": False,
+        "tracing": False
+    })
+    if not rate_limits:
+        controls.update(rate_limit_rpm=0, rate_limit_tpm=0)
+    return controls
+
+
+async def run_session(graph, run_id, index, turns, start_delay, think_time, results):
+    """
+    Simulate one user having a conversation of the given number of turns.
+
+    Args:
+        graph: The compiled graph.
+        run_id (str): Distinguishes the threads of this run from earlier ones.
+        index (int): Session number.
+        turns (int): User messages to send.
+        start_delay (float): Seconds to wait before the first message.
+        think_time (float): Seconds between an answer and the next message.
+        results (list): One record per turn is appended here.
+    """
+    await asyncio.sleep(start_delay)
+    history = []
+    for turn in range(turns):
+        # Distinct prompts, so no cache or coalescing can answer for the stub
+        message = HumanMessage(content=f"[{run_id} session {index} turn {turn}] {QUESTIONS[(index + turn) % len(QUESTIONS)]}")
+        if graph.checkpointer:
+            config = thread_config(f"loadtest-{run_id}-{index}")
+            messages = [message]
+        else:
+            config = {}
+            messages = history + [message]
+        config["metadata"] = {"priority": PRIORITY_INTERACTIVE}
+
+        started = time.perf_counter()
+        first_chunk, chunks, text = None, 0, []
+        try:
+            async for chunk in astream_graph_response(graph, messages, config=config):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - started
+                chunks += 1
+                text.append(chunk)
+            results.append({"ok": True, "ttft": first_chunk, "latency": time.perf_counter() - started,
+                            "chunks": chunks})
+        except Exception as e:
+            results.append({"ok": False, "error": type(e).__name__, "latency": time.perf_counter() - started})
+            return
+        history = messages + [AIMessage(content="".join(text))]
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+async def run_load(graph, sessions, turns, ramp_up=0.0, think_time=0.0):
+    """
+    Run concurrent sessions through the graph.
+
+    Args:
+        graph: The compiled graph.
+        sessions (int): Number of simulated users.
+        turns (int): Messages per user.
+        ramp_up (float): Seconds over which session starts are spread.
+        think_time (float): Seconds between an answer and the next message.
+
+    Returns:
+        tuple: (per-turn results, elapsed seconds).
+    """
+    run_id = uuid.uuid4().hex[:8]
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_session(graph, run_id, i, turns, ramp_up * i / max(sessions, 1), think_time, results)
+        for i in range(sessions)
+    ))
+    return results, time.perf_counter() - started
+
+
+def build_report(results, elapsed, upstream=None):
+    """
+    Summarize per-turn results.
+
+    Args:
+        results (list): Records appended by run_session.
+        elapsed (float): Wall-clock seconds of the run.
+        upstream (dict): The stub's counters, if it ran in process.
+
+    Returns:
+        dict: Throughput, error counts and latency percentiles.
+    """
+    ok = [r for r in results if r["ok"]]
+    report = {
+        "turns": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "errors": dict(Counter(r["error"] for r in results if not r["ok"])),
+        "elapsed_s": elapsed,
+        "turns_per_s": len(ok) / elapsed if elapsed else 0.0,
+        "chunks_per_s": sum(r["chunks"] for r in ok) / elapsed if elapsed else 0.0,
+        "ttft": percentiles([r["ttft"] for r in ok if r["ttft"] is not None]),
+        "latency": percentiles([r["latency"] for r in ok])
+    }
+    if upstream is not None:
+        report["upstream"] = upstream
+    return report
+
+
+def print_report(report):
+    print(f"turns: {report['succeeded']}/{report['turns']} succeeded in {report['elapsed_s']:.1f}s "
+          f"({report['turns_per_s']:.1f} turns/s, {report['chunks_per_s']:.0f} chunks/s)")
+    for name in ("ttft", "latency"):
+        stats = report[name]
+        if stats["n"]:
+            print(f"{name:8s} p50 {stats['p50_ms']:8.0f} ms  p95 {stats['p95_ms']:8.0f} ms  "
+                  f"p99 {stats['p99_ms']:8.0f} ms")
+    if report["errors"]:
+        print(f"errors: {report['errors']}")
+    if "upstream" in report:
+        print(f"upstream: {report['upstream']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the chat graph against a stub provider API.")
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=3, help="Messages per user")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which sessions start")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds between a reply and the next message")
+    parser.add_argument("--provider", choices=sorted(API_PATHS), default="Groq")
+    parser.add_argument("--model", default=None, help="Model name sent to the API")
+    parser.add_argument("--base-url", default=None, help="Use a running stub (or provider) instead of starting one")
+    parser.add_argument("--api-key", default="stub-key", help="API key sent to the endpoint")
+    parser.add_argument("--rate-limits", action="store_true", help="Keep the configured client-side rate limits")
+    parser.add_argument("--output", default=None, help="JSON file the report is written to")
+    add_stub_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stub = None if args.base_url else StubServer(**stub_options(args)).start()
+    try:
+        controls = build_user_controls(
+            args.provider, args.model, args.base_url or stub.url, args.api_key, args.rate_limits
+        )
+        graph = get_graph(controls)
+        if graph is None:
+            raise SystemExit("Unable to initialize the LLM. Check the provider and model.")
+        # The graph's async HTTP client belongs to the background loop
+        results, elapsed = get_background_loop().run(
+            run_load(graph, args.sessions, args.turns, args.ramp_up, args.think_time)
+        )
+        report = build_report(results, elapsed, stub.stats() if stub else None)
+    finally:
+        if stub:
+            stub.stop()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,29 @@
+import logging
 import os
 import sys
 import streamlit as st
 
-# Add debugging to see environment variables
-print("Current working directory:", os.getcwd())
-print("Checking if .env file exists:", os.path.exists(".env"))
-
 # Add the root directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+# Only light modules are imported here. Streamlit re-executes this script on
+# every interaction, and LangGraph, the provider SDKs and FAISS are imported
+# on first use so the page renders before they finish loading.
 from src.langraphAgenticAI.ui.streamlitui.loadui import LoadStreamUI
-from src.langraphAgenticAI.graph.graph_builder import GraphBuilder
-from src.langraphAgenticAI.LLMS.groqllm import GroqLLM
-from src.langraphAgenticAI.utils.env_loader import load_env_variables, get_env_var
-from src.langraphAgenticAI.loadui import load_ui
+from src.langraphAgenticAI.LLMS.registry import get_llm_handler
+from src.langraphAgenticAI.utils.env_loader import load_env_variables
+from src.langraphAgenticAI.graph.factory import get_graph
+
+logger = logging.getLogger(__name__)
 
-# Load environment variables from .env file
-load_env_variables()
 
-# Debug: Print all environment variables to check if loading worked
-print("After loading .env, GROQ_API_KEY exists:", "GROQ_API_KEY" in os.environ)
-if "GROQ_API_KEY" in os.environ:
-    print("GROQ_API_KEY value length:", len(os.environ["GROQ_API_KEY"]))
-else:
-    print("GROQ_API_KEY not found in environment variables")
+@st.cache_resource(show_spinner=False)
+def startup():
+    """Run process-wide startup work once instead of on every rerun."""
+    # Load environment variables from .env file
+    load_env_variables()
+    logger.debug(".env found: %s, GROQ_API_KEY set: %s", os.path.exists(".env"), "GROQ_API_KEY" in os.environ)
+    return True
 
 def initialize_graph(user_controls):
     """
@@ -35,64 +35,60 @@ def initialize_graph(user_controls):
     Returns:
         object: A compiled LangGraph.
     """
-    # Get LLM based on user selection
-    llm_provider = user_controls.get("llm_provider", "Groq")
-    
-    if llm_provider == "Groq":
-        # Initialize Groq LLM
-        llm_handler = GroqLLM(user_controls)
-        llm = llm_handler.get_llm_model()
-        
-        if not llm:
-            st.error("Failed to initialize the LLM. Please check your API key and configuration.")
-            return None
-        
-        # Create graph builder with the LLM
-        graph_builder = GraphBuilder(llm)
-        
-        # Build a basic chatbot graph
-        graph = graph_builder.basic_chatbot_build_graph()
-        
-        return graph
-    
-    else:
-        st.error(f"LLM provider {llm_provider} not implemented yet.")
+    if get_llm_handler(user_controls) is None:
         return None
+    
+    graph = get_graph(user_controls)
+    if graph is None:
+        st.error("Failed to initialize the LLM. Please check your API key and configuration.")
+    return graph
 
 def main():
+    startup()
+    
     # Load UI and get user inputs
-    ui_data = load_ui()
+    ui = LoadStreamUI()
+    ui.setup_page()
+    ui.create_sidebar()
     
-    # Initialize GroqLLM with user controls
-    groq_llm = GroqLLM(ui_data["user_controls"])
+    # Build (or fetch the cached) graph for the selected settings
+    graph = initialize_graph(ui.user_controls)
     
-    # Handle chat input
-    if ui_data["user_input"]:
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": ui_data["user_input"]})
+    if graph:
+        from langchain_core.messages import HumanMessage
+        from src.langraphAgenticAI.graph.checkpointer import thread_config
+        from src.langraphAgenticAI.graph.streaming import astream_graph_response, history_to_messages
+        from src.langraphAgenticAI.utils.async_runner import get_background_loop
+        from src.langraphAgenticAI.utils.tracing import get_tracer, traced_config, traced_stream
         
-        # Display the user message
-        with st.chat_message("user"):
-            st.markdown(ui_data["user_input"])
+        if graph.checkpointer:
+            # The checkpointer holds the conversation, so each turn only
+            # submits the new user message for this session's thread
+            config = thread_config(ui.get_thread_id())
+            ui.restore_messages(graph, config)
+            get_input_messages = lambda prompt: [HumanMessage(content=prompt)]
+        else:
+            config = None
+            get_input_messages = lambda prompt: history_to_messages(st.session_state.messages)
         
-        # Display assistant response
-        with st.chat_message("assistant"):
-            message_placeholder = st.empty()
-            message_placeholder.markdown("Thinking...")
-            
-            try:
-                # Get response from GroqLLM
-                response = groq_llm.generate_response(ui_data["user_input"])
-                
-                # Update placeholder with response
-                message_placeholder.markdown(response)
-                
-                # Add assistant response to chat history
-                st.session_state.messages.append({"role": "assistant", "content": response})
-                
-            except Exception as e:
-                message_placeholder.markdown(f"Error: {str(e)}")
-                st.session_state.messages.append({"role": "assistant", "content": f"Error: {str(e)}"})
+        tracer = get_tracer(ui.user_controls.get("trace_file")) if ui.user_controls.get("tracing") else None
+        
+        def process_message(prompt):
+            # Stream tokens from the graph straight into the chat view. The
+            # graph runs on the shared background event loop; this is called
+            # after the new user message has been appended.
+            run_config = config
+            if tracer:
+                run_config, trace_id = traced_config(tracer, config)
+                st.session_state.last_trace_id = trace_id
+            chunks = get_background_loop().iterate(
+                astream_graph_response(graph, get_input_messages(prompt), config=run_config)
+            )
+            return traced_stream(chunks, trace_id, tracer=tracer) if tracer else chunks
+        
+        ui.message_processor = process_message
+    
+    ui.create_main_interface()
 
 if __name__ == "__main__":
     main()
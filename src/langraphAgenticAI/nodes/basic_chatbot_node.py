@@ -1,7 +1,90 @@
+import asyncio
 from typing import Dict, List, Tuple, Optional, Any
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.tools import BaseTool
+from src.langraphAgenticAI.utils.cache import LRUCache
+from src.langraphAgenticAI.utils.response_cache import build_cache_key
+
+# Tool-bound models, shared by every node built for the same model and tools.
+# Entries hold a reference to the model, so its id() cannot be reused while cached.
+bound_llm_cache = LRUCache(maxsize=32, name="bound_llms")
+
+# Prompt | model chains, shared per (model, tool set, system prompt)
+chain_cache = LRUCache(maxsize=32, name="chains")
+
+# Kept free of per-request values (dates, user names, tool lists) so the
+# prompt prefix is byte-identical on every call and provider-side prompt
+# caching can reuse it
+SYSTEM_PROMPT = (
+    "You are a helpful AI assistant built with LangGraph.\n\n"
+    "Your goal is to provide useful, accurate, and friendly responses to the user's questions."
+)
+
+
+def get_bound_llm(llm, tools):
+    """
+    Return the model bound to the given tools for native function calling.
+    
+    Args:
+        llm: The chat model.
+        tools (list): The tools to bind. If empty, the model is returned as is.
+        
+    Returns:
+        Runnable: The model, bound to the tools if any.
+    """
+    if not tools:
+        return llm
+    key = (id(llm), tuple(sorted(tool.name for tool in tools)))
+    return bound_llm_cache.get_or_create(key, lambda: llm.bind_tools(tools))
+
+
+def build_prompt(system_prompt=SYSTEM_PROMPT):
+    """
+    Build the chatbot prompt template.
+    
+    The system prompt is added as a literal SystemMessage rather than a
+    template, so formatting can never change its bytes.
+    
+    Args:
+        system_prompt (str): The system prompt.
+        
+    Returns:
+        ChatPromptTemplate: The prompt template.
+    """
+    # Tools are not described here: they are bound to the model, so the
+    # provider receives their schemas through native function calling
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=system_prompt),
+        MessagesPlaceholder(variable_name="chat_history"),
+        # Retrieved documents come after the history, so the system prompt
+        # and history stay a stable prefix across turns
+        MessagesPlaceholder(variable_name="context", optional=True),
+        ("human", "{input}"),
+        # Tool calls and results produced while answering the input
+        MessagesPlaceholder(variable_name="agent_scratchpad", optional=True)
+    ])
+
+
+def get_chain(llm, tools=None, system_prompt=SYSTEM_PROMPT):
+    """
+    Return the prompt | model chain for a model, tool set and system prompt.
+    
+    Chains are built once and shared by every node (and graph) with the same
+    configuration instead of being composed on each turn.
+    
+    Args:
+        llm: The chat model.
+        tools (list): The tools bound to the model.
+        system_prompt (str): The system prompt.
+        
+    Returns:
+        Runnable: The chain.
+    """
+    tools = tools or []
+    key = (id(llm), tuple(sorted(tool.name for tool in tools)), system_prompt)
+    return chain_cache.get_or_create(key, lambda: build_prompt(system_prompt) | get_bound_llm(llm, tools))
+
 
 class BasicChatBot:
     """
@@ -11,87 +94,147 @@ class BasicChatBot:
     using the specified LLM.
     """
     
-    def __init__(self, llm, tools=None):
+    def __init__(self, llm, tools=None, history_manager=None, response_cache=None, cache_params=None,
+                 system_prompt=SYSTEM_PROMPT):
         """
         Initialize the basic chatbot node.
         
         Args:
             llm: The language model to use for generating responses.
             tools (Optional[List[BaseTool]]): List of tools the chatbot can use.
+            history_manager (Optional[HistoryManager]): Trims the chat history
+                to a token budget. If None, the full history is sent.
+            response_cache (Optional[ResponseCache]): Exact-match cache for
+                responses. Callers only pass one when caching is allowed for
+                the model settings.
+            cache_params (Optional[dict]): Model name and sampling parameters
+                that are part of the response cache key.
+            system_prompt (str): The system prompt.
         """
         self.llm = llm
         self.tools = tools or []
+        self.history_manager = history_manager
+        self.response_cache = response_cache
+        self.cache_params = cache_params or {}
         
-        # Set up the prompt template
-        self._setup_prompt()
+        # The prompt and chain are shared per model, tool set and system prompt
+        self.system_prompt = system_prompt
+        self.model = get_bound_llm(llm, self.tools)
+        self.chain = get_chain(llm, self.tools, system_prompt)
+        self.prompt = self.chain.first
     
-    def _setup_prompt(self):
-        """Set up the prompt template for the chatbot."""
-        template = """You are a helpful AI assistant built with LangGraph.
+    def _prepare(self, messages, context=None):
+        """
+        Build the chain inputs for the latest user message.
         
-Your goal is to provide useful, accurate, and friendly responses to the user's questions.
-
-{chat_history}
-
-User: {input}"""
-
-        if self.tools:
-            # If tools are available, add tool instructions
-            tool_names = [tool.name for tool in self.tools]
-            tool_descs = [f"{tool.name}: {tool.description}" for tool in self.tools]
+        Args:
+            messages (list): The conversation messages.
+            context (str): Retrieved document context, if any.
             
-            # Add tool instructions to the prompt
-            template += f"""
-
-You have access to the following tools:
-{tool_descs}
-
-To use a tool, please use the following format:
-Action: the action to take, should be one of {tool_names}
-Action Input: the input to the action
-Observation: the result of the action
-
-When you have a response to say to the human, or if you don't need to use a tool, you MUST use the format:
-Thought: I now know the final answer
-Final Answer: [your response here]"""
-        
-        # Create the prompt template
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", template),
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("human", "{input}")
-        ])
-        
-    def run(self, state):
+        Returns:
+            tuple: (inputs, cache_key, cached_response). inputs is None when
+            there is no user message to answer.
+        """
+        # Extract the input from the last human message
+        last_index = next(
+            (i for i in range(len(messages) - 1, -1, -1) if isinstance(messages[i], HumanMessage)),
+            None
+        )
+        if last_index is None:
+            return None, None, None
+        
+        last_human_msg = messages[last_index].content
+        
+        # Prepare chat history (everything before the last human message, which
+        # is sent separately as the input)
+        chat_history = messages[:last_index]
+        if self.history_manager:
+            chat_history = self.history_manager.trim(chat_history)
+        
+        # Tool calls and results since the last human message
+        scratchpad = messages[last_index + 1:]
+        
+        context_messages = [
+            SystemMessage(content=f"Use the following documents to answer if they are relevant:\n\n{context}")
+        ] if context else []
+        
+        inputs = {
+            "chat_history": chat_history,
+            "context": context_messages,
+            "input": last_human_msg,
+            "agent_scratchpad": scratchpad
+        }
+        
+        cache_key, cached = None, None
+        if self.response_cache:
+            cache_key = build_cache_key(
+                last_human_msg,
+                chat_history + context_messages + scratchpad,
+                tools=sorted(tool.name for tool in self.tools),
+                system_prompt=self.system_prompt,
+                **self.cache_params
+            )
+            cached = self.response_cache.get(cache_key)
+        
+        return inputs, cache_key, cached
+    
+    def _finish(self, response, cache_key):
+        """Cache the response and return it as a state update."""
+        # Responses requesting tool calls are not final answers
+        if self.response_cache and response.content and not response.tool_calls:
+            self.response_cache.put(cache_key, response.content)
+        
+        # Return only the new message; the add_messages reducer appends it.
+        # Any tool calls are kept so tools_condition can route to the tool node
+        return {"messages": [response]}
+        
+    def run(self, state, config=None):
         """
         Run the chatbot node on the given state.
         
         Args:
             state: The current state of the conversation.
+            config: The runnable config supplied by LangGraph. Passing it on to
+                the chain lets graph.stream(stream_mode="messages") surface
+                tokens while the node is still running.
             
         Returns:
-            dict: The updated state after generating a response.
+            dict: A state update with the new AI message.
         """
-        # Extract the input from the last human message
-        human_messages = [msg for msg in state.messages if isinstance(msg, HumanMessage)]
-        if not human_messages:
-            return state
-        
-        last_human_msg = human_messages[-1].content
+        inputs, cache_key, cached = self._prepare(state["messages"], state.get("context"))
+        if inputs is None:
+            return {"messages": []}
+        if cached is not None:
+            return {"messages": [AIMessage(content=cached, response_metadata={"cache": "exact"})]}
         
-        # Prepare chat history (all messages except the last human message)
-        chat_history = state.messages[:-1] if state.messages else []
+        # Generate response
+        response = self.chain.invoke(inputs, config=config)
         
-        # Get previous AI and human messages for the prompt
-        chain = self.prompt | self.llm
+        return self._finish(response, cache_key)
+    
+    async def arun(self, state, config=None):
+        """
+        Async variant of run, used when the graph is executed with ainvoke/astream.
         
-        # Generate response
-        response = chain.invoke({
-            "chat_history": chat_history,
-            "input": last_human_msg
-        })
+        Args:
+            state: The current state of the conversation.
+            config: The runnable config supplied by LangGraph.
+            
+        Returns:
+            dict: A state update with the new AI message.
+        """
+        if self.history_manager and self.history_manager.summarizer:
+            # Summarizing evicted turns calls the LLM synchronously, so keep
+            # it off the event loop
+            loop = asyncio.get_running_loop()
+            inputs, cache_key, cached = await loop.run_in_executor(None, self._prepare, state["messages"], state.get("context"))
+        else:
+            inputs, cache_key, cached = self._prepare(state["messages"], state.get("context"))
+        if inputs is None:
+            return {"messages": []}
+        if cached is not None:
+            return {"messages": [AIMessage(content=cached, response_metadata={"cache": "exact"})]}
         
-        # Update the state with the AI's response
-        state.messages.append(AIMessage(content=response.content))
+        response = await self.chain.ainvoke(inputs, config=config)
         
-        return state 
\ No newline at end of file
+        return self._finish(response, cache_key)
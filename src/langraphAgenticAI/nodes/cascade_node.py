@@ -0,0 +1,217 @@
+import math
+import re
+import threading
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END
+from src.langraphAgenticAI.graph.streaming import no_stream_config
+from src.langraphAgenticAI.nodes.basic_chatbot_node import SYSTEM_PROMPT, BasicChatBot
+from src.langraphAgenticAI.utils.history_manager import approximate_token_count
+
+# The small model checks itself: instead of guessing, it answers with this
+# marker, which costs one output token and no extra call
+ESCALATE_MARKER = "ESCALATE"
+
+DRAFT_SYSTEM_PROMPT = (
+    f"{SYSTEM_PROMPT}\n\n"
+    f"If answering needs expertise, multi-step reasoning or facts you are not sure about, "
+    f"reply with only the word {ESCALATE_MARKER}."
+)
+
+_COMPLEX_TERMS = re.compile(
+    r"\b(prove|derive|step[- ]by[- ]step|analy[sz]e|compare|trade-?offs?|design|architecture|"
+    r"implement|refactor|debug|optimi[sz]e|explain why|in detail|essay|algorithm|calculate)\b",
+    re.IGNORECASE
+)
+_MATH_OR_CODE = re.compile(r"```|\bdef |\bclass |[∑∫√]|\d+\s*[*/^]\s*\d+")
+_HEDGES = re.compile(
+    r"\b(I'?m not sure|I am not sure|I don'?t know|I do not know|not certain|I cannot|I can'?t|"
+    r"unable to|I do not have|I don'?t have access)\b",
+    re.IGNORECASE
+)
+
+
+def prompt_complexity(prompt):
+    """
+    Score how demanding a prompt looks, without calling a model.
+
+    Long prompts, reasoning or design requests, code and math, and several
+    questions in one message all raise the score.
+
+    Args:
+        prompt (str): The user message.
+
+    Returns:
+        float: A score between 0 (trivial) and 1 (complex).
+    """
+    score = min(approximate_token_count(prompt) / 500, 1.0) * 0.4
+    score += min(len(_COMPLEX_TERMS.findall(prompt)) * 0.2, 0.4)
+    if _MATH_OR_CODE.search(prompt):
+        score += 0.2
+    score += min(max(prompt.count("?") - 1, 0), 2) * 0.1
+    return min(score, 1.0)
+
+
+def response_confidence(response):
+    """
+    Score how much a draft answer can be trusted.
+
+    Empty answers, the escalation marker, truncated output and hedging
+    phrases lower the score. When the provider returns token log
+    probabilities, the score is also capped by the mean token probability.
+
+    Args:
+        response (AIMessage): The draft answer.
+
+    Returns:
+        float: A score between 0 and 1.
+    """
+    text = response.content if isinstance(response.content, str) else str(response.content)
+    if not text.strip() or text.strip().upper().startswith(ESCALATE_MARKER):
+        return 0.0
+    metadata = response.response_metadata or {}
+    score = 1.0
+    if metadata.get("finish_reason") == "length" or metadata.get("stop_reason") == "max_tokens":
+        score -= 0.5
+    score -= 0.3 * min(len(_HEDGES.findall(text)), 2)
+    logprobs = metadata.get("logprobs")
+    logprobs = logprobs.get("content") if isinstance(logprobs, dict) else None
+    if logprobs:
+        mean = sum(token["logprob"] for token in logprobs) / len(logprobs)
+        score = min(score, math.exp(mean))
+    return max(score, 0.0)
+
+
+class CascadeStats:
+    """Process-wide counters of cascade decisions."""
+
+    def __init__(self):
+        self.accepted = 0
+        self.escalated_by_prompt = 0
+        self.escalated_by_score = 0
+        self.confidence_total = 0.0
+        self.drafts = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome, confidence=None):
+        """
+        Record one turn.
+
+        Args:
+            outcome (str): "accepted", "prompt" or "score".
+            confidence (float): The draft's confidence, if a draft was made.
+        """
+        with self._lock:
+            if outcome == "accepted":
+                self.accepted += 1
+            elif outcome == "prompt":
+                self.escalated_by_prompt += 1
+            else:
+                self.escalated_by_score += 1
+            if confidence is not None:
+                self.drafts += 1
+                self.confidence_total += confidence
+
+    def snapshot(self):
+        with self._lock:
+            turns = self.accepted + self.escalated_by_prompt + self.escalated_by_score
+            escalated = self.escalated_by_prompt + self.escalated_by_score
+            return {
+                'turns': turns,
+                'accepted': self.accepted,
+                'escalated_by_prompt': self.escalated_by_prompt,
+                'escalated_by_score': self.escalated_by_score,
+                'escalation_rate': escalated / turns if turns else 0.0,
+                'avg_confidence': self.confidence_total / self.drafts if self.drafts else None
+            }
+
+
+# Shared by every graph in the process, like the router's model statistics
+cascade_stats = CascadeStats()
+
+
+class CascadeNode:
+    """
+    Answer with a small, fast model first and escalate to the main model when needed.
+
+    Prompts that look complex go straight to the main model. Others get a
+    draft from the small model, which is accepted if its confidence score
+    reaches the threshold; otherwise the draft is discarded and the main
+    chatbot answers. Drafts are not token-streamed, since a rejected draft
+    must never reach the user; an accepted one is shown in full.
+    """
+
+    def __init__(self, llm, history_manager=None, complexity_threshold=0.6, confidence_threshold=0.7,
+                 stats=None):
+        """
+        Initialize the cascade node.
+
+        Args:
+            llm: The small chat model.
+            history_manager (Optional[HistoryManager]): Trims the chat history
+                sent to the small model.
+            complexity_threshold (float): Prompts scoring above this skip the
+                small model.
+            confidence_threshold (float): Minimum confidence of an accepted draft.
+            stats (CascadeStats): Where decisions are counted; defaults to the
+                process-wide stats.
+        """
+        self.chatbot = BasicChatBot(llm, history_manager=history_manager, system_prompt=DRAFT_SYSTEM_PROMPT)
+        self.complexity_threshold = complexity_threshold
+        self.confidence_threshold = confidence_threshold
+        self.stats = stats or cascade_stats
+
+    @staticmethod
+    def _last_prompt(messages):
+        return next((m.content for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+
+    def _should_draft(self, state):
+        prompt = self._last_prompt(state["messages"])
+        if prompt is None:
+            return False
+        if prompt_complexity(prompt) > self.complexity_threshold:
+            self.stats.record("prompt")
+            return False
+        return True
+
+    def _decide(self, update):
+        """Keep the draft if it is confident enough, otherwise drop it."""
+        response = update["messages"][0] if update["messages"] else None
+        if response is None:
+            self.stats.record("score")
+            return {"messages": []}
+        confidence = response_confidence(response)
+        if confidence < self.confidence_threshold:
+            self.stats.record("score", confidence)
+            return {"messages": []}
+        self.stats.record("accepted", confidence)
+        response.response_metadata["cascade"] = {"confidence": confidence}
+        return {"messages": [response]}
+
+    def run(self, state, config=None):
+        """
+        Try to answer the last user message with the small model.
+
+        Args:
+            state: The current state of the conversation.
+            config: The runnable config supplied by LangGraph.
+
+        Returns:
+            dict: A state update with the accepted draft, or no new messages.
+        """
+        if not self._should_draft(state):
+            return {"messages": []}
+        return self._decide(self.chatbot.run(state, config=no_stream_config(config)))
+
+    async def arun(self, state, config=None):
+        """Async variant of run."""
+        if not self._should_draft(state):
+            return {"messages": []}
+        return self._decide(await self.chatbot.arun(state, config=no_stream_config(config)))
+
+    @staticmethod
+    def route(state):
+        """Route to END when the draft was accepted and to the main chatbot otherwise."""
+        messages = state["messages"]
+        if messages and isinstance(messages[-1], AIMessage):
+            return END
+        return "chatbot"
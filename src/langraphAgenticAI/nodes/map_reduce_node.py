@@ -0,0 +1,236 @@
+import threading
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.types import Send
+from src.langraphAgenticAI.utils.concurrency import LoopSemaphores
+from src.langraphAgenticAI.utils.text_chunking import split_text
+
+DEFAULT_INSTRUCTION = "Summarize the document. Cover its main points, decisions and figures."
+
+# Answer for a request without document text; no LLM call is made for it
+EMPTY_DOCUMENT_MESSAGE = (
+    "There is no document to summarize. Send the document text, optionally "
+    "after an instruction and a blank line."
+)
+
+# Intermediate calls are tagged so graph.stream(stream_mode="messages") only
+# surfaces the tokens of the final answer
+_INTERMEDIATE = {"tags": ["nostream"]}
+
+
+class MapReduceNode:
+    """
+    Process a long document with parallel LLM calls.
+
+    The last user message is split into chunks, and every chunk is sent to
+    its own "map" branch with LangGraph's Send. Partial results are then
+    merged in groups, level by level, until few enough remain for one final
+    call. A document of n chunks therefore takes about one call's latency
+    per tree level (log of n to the base group_size) instead of n serial
+    calls, and no single prompt holds more than group_size results.
+
+    A short first paragraph followed by a blank line is used as the
+    instruction (e.g. "List every deadline mentioned."); otherwise the
+    document is summarized.
+    """
+
+    def __init__(self, llm, chunk_chars=6000, overlap=200, group_size=4, max_concurrency=4,
+                 max_instruction_chars=300):
+        """
+        Initialize the map-reduce node.
+
+        Args:
+            llm: The language model.
+            chunk_chars (int): Maximum characters per document chunk.
+            overlap (int): Characters shared by consecutive chunks.
+            group_size (int): Partial results merged by one reduce call.
+            max_concurrency (int): Maximum LLM calls of this node running
+                at once, across all branches and runs in the process.
+            max_instruction_chars (int): Longest first paragraph that is
+                treated as the instruction.
+        """
+        self.llm = llm
+        self.chunk_chars = chunk_chars
+        self.overlap = overlap
+        self.group_size = max(group_size, 2)
+        self.max_concurrency = max_concurrency
+        self.max_instruction_chars = max_instruction_chars
+        self._thread_limit = threading.BoundedSemaphore(max_concurrency)
+        self._async_limits = LoopSemaphores()
+
+    def parse_request(self, state):
+        """
+        Return the instruction and the document from the last user message.
+
+        Args:
+            state: The current state of the graph.
+
+        Returns:
+            tuple: (instruction, document text).
+        """
+        text = next(
+            (m.content for m in reversed(state["messages"]) if isinstance(m, HumanMessage)),
+            ""
+        )
+        head, sep, rest = text.partition("\n\n")
+        if sep and rest.strip() and len(head) <= self.max_instruction_chars:
+            return head.strip(), rest
+        return DEFAULT_INSTRUCTION, text
+
+    def _call(self, prompt):
+        with self._thread_limit:
+            return self.llm.invoke(prompt, config=_INTERMEDIATE).content
+
+    async def _acall(self, prompt):
+        async with self._async_limits.get(self.max_concurrency):
+            return (await self.llm.ainvoke(prompt, config=_INTERMEDIATE)).content
+
+    @staticmethod
+    def _map_prompt(task):
+        return (
+            f"{task['instruction']}\n\n"
+            f"The text below is part {task['index'] + 1} of {task['total']} of a longer document. "
+            f"Work only from this part and keep the details needed to combine it with the "
+            f"other parts (names, numbers, dates).\n\n{task['text']}"
+        )
+
+    @staticmethod
+    def _reduce_prompt(instruction, texts, final=False):
+        parts = "\n\n".join(f"[Part {i}]\n{text}" for i, text in enumerate(texts, start=1))
+        goal = "Write the final answer" if final else "Merge them into one result"
+        return (
+            f"{instruction}\n\n"
+            f"Below are results for consecutive parts of a longer document. {goal}, "
+            f"keeping their order and removing repetition.\n\n{parts}"
+        )
+
+    def split(self, state):
+        """Start a run by clearing the partial results of earlier runs."""
+        return {"partials": None}
+
+    def fan_out(self, state):
+        """
+        Send every chunk of the document to its own map branch.
+
+        Args:
+            state: The current state of the graph.
+
+        Returns:
+            list: Send objects for the map branches, or "combine" when the
+            document fits in one chunk or is empty.
+        """
+        instruction, document = self.parse_request(state)
+        chunks = split_text(document, self.chunk_chars, self.overlap)
+        if len(chunks) <= 1:
+            return "combine"
+        return [
+            Send("map_chunk", {"instruction": instruction, "index": i, "total": len(chunks), "text": chunk})
+            for i, chunk in enumerate(chunks)
+        ]
+
+    def map_chunk(self, task):
+        """
+        Process one chunk.
+
+        Args:
+            task (dict): The payload sent by fan_out.
+
+        Returns:
+            dict: A state update with the chunk's partial result.
+        """
+        return {"partials": [{"level": 0, "index": task["index"], "text": self._call(self._map_prompt(task))}]}
+
+    async def amap_chunk(self, task):
+        """Async variant of map_chunk."""
+        text = await self._acall(self._map_prompt(task))
+        return {"partials": [{"level": 0, "index": task["index"], "text": text}]}
+
+    @staticmethod
+    def _current_level(state):
+        """Return the newest level's partial results in document order."""
+        partials = state.get("partials") or []
+        if not partials:
+            return []
+        level = max(p["level"] for p in partials)
+        return sorted((p for p in partials if p["level"] == level), key=lambda p: p["index"])
+
+    def collect(self, state):
+        """Join point of the parallel branches; routing happens in route_reduce."""
+        return {}
+
+    def route_reduce(self, state):
+        """
+        Merge the newest level in groups, or finish once it is small enough.
+
+        Args:
+            state: The current state of the graph.
+
+        Returns:
+            list: Send objects for the reduce branches, or "combine".
+        """
+        current = self._current_level(state)
+        if len(current) <= self.group_size:
+            return "combine"
+        instruction, _ = self.parse_request(state)
+        level = current[0]["level"] + 1
+        return [
+            Send("reduce_group", {
+                "instruction": instruction,
+                "level": level,
+                "index": start // self.group_size,
+                "texts": [p["text"] for p in current[start:start + self.group_size]]
+            })
+            for start in range(0, len(current), self.group_size)
+        ]
+
+    def reduce_group(self, task):
+        """
+        Merge one group of partial results into a partial result of the next level.
+
+        Args:
+            task (dict): The payload sent by route_reduce.
+
+        Returns:
+            dict: A state update with the merged result.
+        """
+        text = self._call(self._reduce_prompt(task["instruction"], task["texts"]))
+        return {"partials": [{"level": task["level"], "index": task["index"], "text": text}]}
+
+    async def areduce_group(self, task):
+        """Async variant of reduce_group."""
+        text = await self._acall(self._reduce_prompt(task["instruction"], task["texts"]))
+        return {"partials": [{"level": task["level"], "index": task["index"], "text": text}]}
+
+    def _is_empty(self, state):
+        """Return True if the request has no document text and nothing was mapped."""
+        return not self._current_level(state) and not self.parse_request(state)[1].strip()
+
+    def _final_prompt(self, state):
+        instruction, document = self.parse_request(state)
+        current = self._current_level(state)
+        if not current:
+            # The document fit in one chunk
+            return f"{instruction}\n\n{document}"
+        return self._reduce_prompt(instruction, [p["text"] for p in current], final=True)
+
+    def combine(self, state):
+        """
+        Write the answer from the remaining partial results.
+
+        The call is not tagged, so its tokens stream to the user. A request
+        without document text is answered without calling the LLM.
+
+        Args:
+            state: The current state of the graph.
+
+        Returns:
+            dict: A state update with the answer; the partial results are cleared.
+        """
+        if self._is_empty(state):
+            return {"messages": [AIMessage(content=EMPTY_DOCUMENT_MESSAGE)], "partials": None}
+        return {"messages": [self.llm.invoke(self._final_prompt(state))], "partials": None}
+
+    async def acombine(self, state):
+        """Async variant of combine."""
+        if self._is_empty(state):
+            return {"messages": [AIMessage(content=EMPTY_DOCUMENT_MESSAGE)], "partials": None}
+        return {"messages": [await self.llm.ainvoke(self._final_prompt(state))], "partials": None}
@@ -0,0 +1,55 @@
+from langchain_core.messages import HumanMessage
+
+
+class RetrievalNode:
+    """
+    A graph node that retrieves document chunks for the last user message.
+
+    The chunks are stored in the state's "context" channel, which
+    BasicChatBot adds to the prompt right before the user input.
+    """
+
+    def __init__(self, index, k=4, max_chars=4000, min_score=0.0):
+        """
+        Initialize the retrieval node.
+
+        Args:
+            index (DocumentIndex): The document index to search.
+            k (int): Number of chunks to retrieve.
+            max_chars (int): Maximum characters of context added to the prompt.
+            min_score (float): Minimum similarity of a retrieved chunk.
+        """
+        self.index = index
+        self.k = k
+        self.max_chars = max_chars
+        self.min_score = min_score
+
+    def format_context(self, hits):
+        """Format retrieved chunks as a numbered list with their sources."""
+        parts, used = [], 0
+        for i, hit in enumerate(hits, start=1):
+            part = f"[{i}] ({hit['source']})\n{hit['text']}"
+            if used + len(part) > self.max_chars:
+                break
+            parts.append(part)
+            used += len(part)
+        return "\n\n".join(parts)
+
+    def retrieve(self, state):
+        """
+        Search the index for the last user message.
+
+        Args:
+            state: The current state of the conversation.
+
+        Returns:
+            dict: A state update with the retrieved context.
+        """
+        query = next(
+            (m.content for m in reversed(state["messages"]) if isinstance(m, HumanMessage)),
+            None
+        )
+        if not query:
+            return {"context": ""}
+        hits = self.index.search(query, k=self.k, min_score=self.min_score)
+        return {"context": self.format_context(hits)}
@@ -0,0 +1,77 @@
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END
+
+
+class SemanticCacheNode:
+    """
+    Graph nodes that answer from the semantic cache before calling the LLM.
+
+    The lookup node runs first; on a hit it appends the cached answer and the
+    graph ends without invoking the chatbot. The store node runs after the
+    chatbot and caches its answer.
+    """
+
+    def __init__(self, cache, namespace, context_free_only=True):
+        """
+        Initialize the semantic cache nodes.
+
+        Args:
+            cache (SemanticCache): The cache to read from and write to.
+            namespace (str): Namespace identifying the model and parameters.
+            context_free_only (bool): Only use the cache for the first user
+                message of a conversation, where the answer cannot depend on
+                earlier turns.
+        """
+        self.cache = cache
+        self.namespace = namespace
+        self.context_free_only = context_free_only
+
+    def _get_prompt(self, messages):
+        """Return the last user prompt, or None if the cache should be skipped."""
+        human_messages = [m for m in messages if isinstance(m, HumanMessage)]
+        if not human_messages:
+            return None
+        if self.context_free_only and len(human_messages) > 1:
+            return None
+        return human_messages[-1].content
+
+    def lookup(self, state):
+        """
+        Answer the last user message from the cache if possible.
+
+        Args:
+            state: The current state of the conversation.
+
+        Returns:
+            dict: A state update with the cached answer, or no new messages.
+        """
+        prompt = self._get_prompt(state["messages"])
+        if prompt:
+            cached = self.cache.lookup(self.namespace, prompt)
+            if cached is not None:
+                return {"messages": [AIMessage(content=cached, response_metadata={"cache": "semantic"})]}
+        return {"messages": []}
+
+    def store(self, state):
+        """
+        Cache the chatbot's answer to the last user message.
+
+        Args:
+            state: The current state of the conversation.
+
+        Returns:
+            dict: An empty state update.
+        """
+        messages = state["messages"]
+        prompt = self._get_prompt(messages)
+        if prompt and messages and isinstance(messages[-1], AIMessage) and messages[-1].content:
+            self.cache.add(self.namespace, prompt, messages[-1].content)
+        return {"messages": []}
+
+    @staticmethod
+    def route(state):
+        """Route to END on a cache hit and to the chatbot otherwise."""
+        messages = state["messages"]
+        if messages and isinstance(messages[-1], AIMessage):
+            return END
+        return "chatbot"
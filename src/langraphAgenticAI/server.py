@@ -0,0 +1,336 @@
+"""
+Headless HTTP server for the agent graphs.
+
+Usage:
+    python -m src.langraphAgenticAI.server --host 0.0.0.0 --port 8000 --workers 4
+
+Endpoints:
+    GET  /healthz   Liveness and load information.
+    POST /v1/chat   {"message": "...", "thread_id": "...", "graph": "chat", "stream": true}
+                    or {"messages": [{"role": "user", "content": "..."}], ...}
+
+With "stream": true the answer is sent as server-sent events: one "token"
+event per text chunk ({"text": "..."}), then "done" ({"response": "..."}) or
+"error" ({"error": "..."}). Otherwise the full answer is returned as JSON.
+
+The server builds graphs with the same code as the Streamlit app and runs
+them on the shared background event loop. Each worker process has its own
+caches and in-memory checkpoints, so multi-worker deployments that resume
+conversations by thread_id should use CHECKPOINTER = sqlite (or route a
+thread to one worker).
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from langchain_core.messages import HumanMessage
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from src.langraphAgenticAI.graph.checkpointer import thread_config
+from src.langraphAgenticAI.graph.factory import get_graph
+from src.langraphAgenticAI.graph.streaming import astream_graph_response, history_to_messages
+from src.langraphAgenticAI.ui.uiconfigfile import Config
+from src.langraphAgenticAI.utils.async_runner import get_background_loop
+from src.langraphAgenticAI.utils.env_loader import load_env_variables
+from src.langraphAgenticAI.utils.rate_limiter import PRIORITY_INTERACTIVE
+from src.langraphAgenticAI.utils.single_flight import llm_flights
+
+# Graph name in requests -> use case
+GRAPHS = {
+    "chat": "Basic Chatbot",
+    "rag": "RAG Chatbot",
+    "summarize": "Document Summarizer"
+}
+
+# Tools served by the "tools" graph. Register tools here (or with
+# register_tool) to expose the tool-using chatbot.
+TOOLS = []
+
+
+def register_tool(tool):
+    """Expose a LangChain tool through the "tools" graph."""
+    TOOLS.append(tool)
+
+
+def default_user_controls():
+    """
+    Build graph settings from uiconfigfile.ini and environment variables.
+
+    LLM_PROVIDER, LLM_MODEL, LLM_TEMPERATURE and LLM_MAX_TOKENS override the
+    configured defaults.
+
+    Returns:
+        dict: Settings in the format the Streamlit sidebar produces.
+    """
+    config = Config()
+    llm_options = config.get_llm_options()
+    provider = os.environ.get("LLM_PROVIDER") or llm_options['llm_option'] or "Groq"
+    models = llm_options['model_options'].get(provider.lower(), [])
+    return {
+        "llm_provider": provider,
+        "selected_model": os.environ.get("LLM_MODEL") or (models[0] if models else None),
+        "temperature": float(os.environ.get("LLM_TEMPERATURE", llm_options['temperature'])),
+        "max_tokens": int(os.environ.get("LLM_MAX_TOKENS", llm_options['max_tokens'])),
+        "history_token_budget": llm_options['history_token_budget'],
+        "summarize_history": llm_options['summarize_history'],
+        "model_options": llm_options['model_options'],
+        **config.get_cache_options(),
+        **config.get_checkpoint_options(),
+        **config.get_routing_options(),
+        **config.get_cascade_options(),
+        **config.get_rate_limit_options(),
+        **config.get_tracing_options(),
+        **config.get_rag_options(),
+        **config.get_map_reduce_options()
+    }
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted in time."""
+
+
+class AdmissionControl:
+    """
+    Bound the number of graph runs per worker.
+
+    Up to max_concurrency requests run at once; up to max_queue more wait
+    for a slot for at most queue_timeout seconds. Anything beyond that is
+    rejected immediately, so overload turns into fast 503s that a load
+    balancer can retry elsewhere instead of growing latency for everyone.
+    """
+
+    def __init__(self, max_concurrency=32, max_queue=64, queue_timeout=5.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def acquire(self):
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("Too many queued requests.")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise Overloaded("Timed out waiting for a free slot.")
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self):
+        return {"active": self.active, "waiting": self.waiting, "rejected": self.rejected,
+                "max_concurrency": self.max_concurrency, "max_queue": self.max_queue}
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    A streaming response holding an admission slot until it is done.
+
+    The slot is released however sending ends: after the last event, on a
+    client disconnect, or when the body is never iterated at all.
+    """
+
+    def __init__(self, content, release, **kwargs):
+        """
+        Initialize the response.
+
+        Args:
+            content: The async iterable of response chunks.
+            release: Called once when the response has been sent or abandoned.
+            **kwargs: Passed to StreamingResponse.
+        """
+        super().__init__(content, **kwargs)
+        self._release = release
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._release()
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_app(user_controls=None, max_concurrency=32, max_queue=64, queue_timeout=5.0, request_timeout=120.0):
+    """
+    Create the ASGI application.
+
+    Args:
+        user_controls (dict): Graph settings; defaults to default_user_controls().
+        max_concurrency (int): Concurrent graph runs per worker.
+        max_queue (int): Requests allowed to wait for a slot.
+        queue_timeout (float): Seconds a request may wait for a slot.
+        request_timeout (float): Maximum seconds for one graph run.
+
+    Returns:
+        Starlette: The application.
+    """
+    settings = {"controls": user_controls}
+    admission = {}
+
+    def controls():
+        if settings["controls"] is None:
+            load_env_variables()
+            settings["controls"] = default_user_controls()
+        return settings["controls"]
+
+    def admission_control():
+        # Created lazily so it binds to the server's event loop
+        if "control" not in admission:
+            admission["control"] = AdmissionControl(max_concurrency, max_queue, queue_timeout)
+        return admission["control"]
+
+    def resolve_graph(name):
+        if name == "tools":
+            if not TOOLS:
+                return None
+            return get_graph(controls(), tools=TOOLS)
+        if name not in GRAPHS:
+            return None
+        return get_graph({**controls(), "usecase": GRAPHS[name]})
+
+    async def healthz(request):
+        return JSONResponse({"status": "ok", "pid": os.getpid(), **admission_control().stats(),
+                             "coalescing": llm_flights.stats()})
+
+    async def chat(request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "Request body must be JSON."}, status_code=400)
+
+        graph_name = body.get("graph", "chat")
+        # Building a graph the first time may block on client setup
+        graph = await asyncio.to_thread(resolve_graph, graph_name)
+        if graph is None:
+            return JSONResponse({"error": f"Graph {graph_name!r} is not available."}, status_code=404)
+
+        thread_id = body.get("thread_id")
+        if graph.checkpointer:
+            # The checkpointer holds the history; only the new message is sent
+            thread_id = thread_id or uuid.uuid4().hex
+            config = thread_config(thread_id)
+            if "message" in body:
+                messages = [HumanMessage(content=body["message"])]
+            else:
+                messages = history_to_messages(body.get("messages", [])[-1:])
+        else:
+            config = {}
+            messages = history_to_messages(body.get("messages") or [{"role": "user", "content": body.get("message", "")}])
+        if not messages:
+            return JSONResponse({"error": "No message given."}, status_code=400)
+        config["metadata"] = {"priority": PRIORITY_INTERACTIVE}
+
+        control = admission_control()
+        try:
+            await control.acquire()
+        except Overloaded as e:
+            return JSONResponse({"error": str(e)}, status_code=503, headers={"Retry-After": "1"})
+
+        deadline = time.monotonic() + request_timeout
+
+        async def chunks():
+            # Runs on the background loop that owns the graph's checkpointer
+            # and HTTP clients; the bounded hand-over queue provides
+            # backpressure when the client reads slowly
+            stream = get_background_loop().aiterate(astream_graph_response(graph, messages, config=config))
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        yield await asyncio.wait_for(stream.__anext__(), remaining)
+                    except StopAsyncIteration:
+                        return
+            finally:
+                await stream.aclose()
+
+        if not body.get("stream", False):
+            try:
+                text = "".join([chunk async for chunk in chunks()])
+            except asyncio.TimeoutError:
+                return JSONResponse({"error": "Request timed out."}, status_code=504)
+            except Exception as e:
+                return JSONResponse({"error": str(e)}, status_code=500)
+            finally:
+                control.release()
+            return JSONResponse({"response": text, "thread_id": thread_id})
+
+        async def events():
+            text = ""
+            try:
+                async for chunk in chunks():
+                    text += chunk
+                    yield _sse("token", {"text": chunk})
+                yield _sse("done", {"response": text, "thread_id": thread_id})
+            except asyncio.TimeoutError:
+                yield _sse("error", {"error": "Request timed out."})
+            except Exception as e:
+                yield _sse("error", {"error": str(e)})
+
+        return AdmittedStreamingResponse(events(), control.release, media_type="text/event-stream",
+                                         headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    return Starlette(routes=[
+        Route("/healthz", healthz, methods=["GET"]),
+        Route("/v1/chat", chat, methods=["POST"])
+    ])
+
+
+def app_factory():
+    """Build the application from environment settings (used by uvicorn workers)."""
+    return create_app(
+        max_concurrency=int(os.environ.get("SERVER_MAX_CONCURRENCY", 32)),
+        max_queue=int(os.environ.get("SERVER_MAX_QUEUE", 64)),
+        queue_timeout=float(os.environ.get("SERVER_QUEUE_TIMEOUT", 5.0)),
+        request_timeout=float(os.environ.get("SERVER_REQUEST_TIMEOUT", 120.0))
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the agent graphs over HTTP with SSE streaming.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="Concurrent graph runs per worker")
+    parser.add_argument("--max-queue", type=int, default=64, help="Requests waiting for a slot per worker")
+    parser.add_argument("--queue-timeout", type=float, default=5.0, help="Seconds a request may wait for a slot")
+    parser.add_argument("--request-timeout", type=float, default=120.0, help="Maximum seconds per request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import uvicorn
+
+    args = parse_args(argv)
+    # Workers are separate processes that build the app from the environment
+    os.environ["SERVER_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    os.environ["SERVER_MAX_QUEUE"] = str(args.max_queue)
+    os.environ["SERVER_QUEUE_TIMEOUT"] = str(args.queue_timeout)
+    os.environ["SERVER_REQUEST_TIMEOUT"] = str(args.request_timeout)
+    uvicorn.run(
+        "src.langraphAgenticAI.server:app_factory",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers
+    )
+
+
+if __name__ == "__main__":
+    main()
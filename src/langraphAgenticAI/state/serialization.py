@@ -0,0 +1,94 @@
+"""
+Compact serialization of graph state for checkpointing.
+"""
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+# Message type -> (short code, class). Other message types keep the default
+# serialization.
+_MESSAGE_TYPES = {
+    "human": ("h", HumanMessage),
+    "ai": ("a", AIMessage),
+    "system": ("s", SystemMessage),
+    "tool": ("t", ToolMessage)
+}
+_CLASSES_BY_CODE = {code: cls for code, cls in _MESSAGE_TYPES.values()}
+_MARKER = "__msg"
+
+
+def message_to_compact(message):
+    """
+    Encode a message as a compact list.
+
+    The default encoding stores the class path and every field, including
+    empty defaults; this keeps only the type code, content, id and the
+    fields that differ from their defaults.
+
+    Args:
+        message (BaseMessage): The message.
+
+    Returns:
+        list: [code, content, id, extra fields], or None if the message type
+        has no compact form.
+    """
+    entry = _MESSAGE_TYPES.get(message.type)
+    if entry is None or type(message) is not entry[1]:
+        return None
+    extras = message.model_dump(exclude_defaults=True)
+    for field in ("type", "content", "id"):
+        extras.pop(field, None)
+    compact = [entry[0], message.content, message.id]
+    if extras:
+        compact.append(extras)
+    return compact
+
+
+def compact_to_message(compact):
+    """Decode a message encoded by message_to_compact."""
+    code, content, message_id = compact[:3]
+    extras = compact[3] if len(compact) > 3 else {}
+    return _CLASSES_BY_CODE[code](content=content, id=message_id, **extras)
+
+
+def _pack(value):
+    """Replace messages nested in lists and dicts with compact markers."""
+    if isinstance(value, BaseMessage):
+        compact = message_to_compact(value)
+        return value if compact is None else {_MARKER: compact}
+    if isinstance(value, list):
+        return [_pack(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_pack(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _pack(item) for key, item in value.items()}
+    return value
+
+
+def _unpack(value):
+    """Restore messages replaced by _pack."""
+    if isinstance(value, dict):
+        if len(value) == 1 and _MARKER in value:
+            return compact_to_message(value[_MARKER])
+        return {key: _unpack(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_unpack(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unpack(item) for item in value)
+    return value
+
+
+class CompactSerializer(JsonPlusSerializer):
+    """
+    Checkpoint serializer storing messages in compact form.
+
+    Messages dominate the size of a chat checkpoint, so they are encoded as
+    short lists before the default serializer runs. Everything else is
+    serialized as usual.
+    """
+
+    def dumps_typed(self, obj):
+        return super().dumps_typed(_pack(obj))
+
+    def loads_typed(self, data):
+        return _unpack(super().loads_typed(data))
+
@@ -1,47 +1,57 @@
-from typing import Dict, List, Any, Optional
+from typing import Annotated, Any, Dict, List
+from typing_extensions import NotRequired, TypedDict
 from langchain_core.messages import BaseMessage
-from langgraph.graph import MessagesState
+from langgraph.graph.message import add_messages
 
 
-class AgentState(MessagesState):
+def merge_metadata(left, right):
+    """Reducer merging metadata updates into the existing metadata."""
+    if not left:
+        return right or {}
+    if not right:
+        return left
+    return {**left, **right}
+
+
+class AgentState(TypedDict):
+    """
+    State schema of the agent graphs.
+
+    Every key is a LangGraph channel. Nodes return only the keys they change
+    (a delta), and reducers merge the delta into the state, so no node copies
+    or returns the whole conversation.
+
+    Attributes:
+        messages (List[BaseMessage]): The conversation. Returned messages are
+            appended (or replace the message with the same id) by add_messages.
+            Tool calls and tool results are part of the AI and tool messages.
+        context (str): Retrieved document context for the current turn; each
+            update replaces the previous value.
+        metadata (Dict[str, Any]): Additional metadata for the agent, merged
+            key by key.
+    """
+
+    messages: Annotated[List[BaseMessage], add_messages]
+    context: NotRequired[str]
+    metadata: NotRequired[Annotated[Dict[str, Any], merge_metadata]]
+
+
+def collect_partials(left, right):
+    """Reducer appending partial results; an update of None clears them."""
+    if right is None:
+        return []
+    return (left or []) + right
+
+
+class DocumentState(AgentState):
     """
-    State class for the agent, extending the MessagesState from LangGraph.
-    
+    State schema of the map-reduce document graph.
+
     Attributes:
-        messages (List[BaseMessage]): The list of messages in the conversation.
-        tool_calls (List[Dict]): The list of tool calls made by the agent.
-        tool_responses (Dict[str, Any]): The responses to tool calls.
-        metadata (Dict[str, Any]): Additional metadata for the agent.
+        partials (List[Dict[str, Any]]): Intermediate results of the map and
+            reduce steps, as {"level", "index", "text"} dicts. Parallel
+            branches append to it; the graph clears it when a run starts
+            and ends.
     """
-    
-    @classmethod
-    def get_lc_namespace(cls) -> List[str]:
-        """
-        Get the LangChain namespace for serialization.
-        
-        Returns:
-            List[str]: List of namespace components.
-        """
-        return ["langraphAgenticAI", "state"]
-
-    
-    def __init__(
-        self,
-        messages: Optional[List[BaseMessage]] = None,
-        tool_calls: Optional[List[Dict]] = None,
-        tool_responses: Optional[Dict[str, Any]] = None,
-        metadata: Optional[Dict[str, Any]] = None,
-    ):
-        """
-        Initialize the state with messages, tool calls, responses, and metadata.
-        
-        Args:
-            messages: The conversation messages.
-            tool_calls: Any tool calls made by the agent.
-            tool_responses: Responses from tools.
-            metadata: Additional metadata.
-        """
-        super().__init__(messages=messages or [])
-        self.tool_calls = tool_calls or []
-        self.tool_responses = tool_responses or {}
-        self.metadata = metadata or {}
+
+    partials: NotRequired[Annotated[List[Dict[str, Any]], collect_partials]]
@@ -0,0 +1,222 @@
+"""
+A local stub of the Groq/OpenAI chat-completions API for load testing.
+
+Usage:
+    python -m src.langraphAgenticAI.stub_llm_server --port 9000 --latency 0.3 --tokens-per-second 80
+
+Serves POST /openai/v1/chat/completions (Groq's path) and
+/v1/chat/completions (OpenAI's), streamed or not, with simulated latency,
+token rate, server errors and 429 rate limiting. Point a provider at it with
+GROQ_BASE_URL=http://127.0.0.1:9000 or OPENAI_BASE_URL=http://127.0.0.1:9000/v1
+and any API key. GET /stats returns the request counters.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import deque
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+WORDS = (
+    "the model answers with a steady stream of plain words so that clients parse many small chunks "
+    "exactly as they would from a real provider during a busy afternoon"
+).split()
+
+
+class StubStats:
+    """Counters of the requests the stub served."""
+
+    def __init__(self):
+        self.requests = 0
+        self.streamed = 0
+        self.completed = 0
+        self.server_errors = 0
+        self.rate_limited = 0
+        self.tokens = 0
+
+    def snapshot(self):
+        return dict(vars(self))
+
+
+def _rate_limit_window(rpm):
+    """Return a check(now) function allowing rpm requests per rolling minute."""
+    calls = deque()
+
+    def allowed(now):
+        while calls and now - calls[0] > 60.0:
+            calls.popleft()
+        if len(calls) >= rpm:
+            return False
+        calls.append(now)
+        return True
+    return allowed
+
+
+def create_stub_app(latency=0.2, jitter=0.0, tokens_per_second=100.0, response_tokens=60,
+                    error_rate=0.0, rate_limit_rate=0.0, rate_limit_rpm=0, seed=None):
+    """
+    Create the stub API application.
+
+    Args:
+        latency (float): Seconds before the first token.
+        jitter (float): Random extra latency, up to this many seconds.
+        tokens_per_second (float): Pace of the generated tokens (0 sends
+            them all at once).
+        response_tokens (int): Tokens per answer, capped by the request's
+            max_tokens.
+        error_rate (float): Fraction of requests failing with a 500.
+        rate_limit_rate (float): Fraction of requests rejected with a 429.
+        rate_limit_rpm (int): Also reject requests beyond this many per
+            minute with a 429 (0 disables the limit).
+        seed (int): Seed for the random failures and jitter.
+
+    Returns:
+        Starlette: The application; its counters are in app.state.stats.
+    """
+    rng = random.Random(seed)
+    stats = StubStats()
+    within_limit = _rate_limit_window(rate_limit_rpm) if rate_limit_rpm else None
+
+    def error(status, message, error_type, headers=None):
+        return JSONResponse({"error": {"message": message, "type": error_type}}, status_code=status,
+                            headers=headers)
+
+    def answer_tokens(max_tokens):
+        count = min(response_tokens, max_tokens) if max_tokens else response_tokens
+        return [WORDS[i % len(WORDS)] + " " for i in range(count)]
+
+    def usage(messages, completion_tokens):
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    async def completions(request):
+        stats.requests += 1
+        body = await request.json()
+        roll = rng.random()
+        if roll < rate_limit_rate or (within_limit and not within_limit(time.monotonic())):
+            stats.rate_limited += 1
+            return error(429, "Rate limit reached. Please try again in 1s.", "rate_limit_exceeded",
+                         headers={"Retry-After": "1"})
+        if roll < rate_limit_rate + error_rate:
+            stats.server_errors += 1
+            return error(500, "Injected server error.", "server_error")
+
+        model = body.get("model", "stub-model")
+        tokens = answer_tokens(body.get("max_tokens") or body.get("max_completion_tokens"))
+        token_delay = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+        first_token_delay = latency + rng.uniform(0, jitter)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        stats.tokens += len(tokens)
+
+        if not body.get("stream"):
+            await asyncio.sleep(first_token_delay + token_delay * len(tokens))
+            stats.completed += 1
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "length" if len(tokens) < response_tokens else "stop",
+                    "logprobs": None
+                }],
+                "usage": usage(body.get("messages", []), len(tokens))
+            })
+
+        stats.streamed += 1
+
+        def chunk(delta, finish_reason=None, **extra):
+            return "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason, "logprobs": None}],
+                **extra
+            }) + "\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            await asyncio.sleep(first_token_delay)
+            for i, token in enumerate(tokens):
+                if i:
+                    await asyncio.sleep(token_delay)
+                yield chunk({"content": token})
+            token_usage = usage(body.get("messages", []), len(tokens))
+            finish_reason = "length" if len(tokens) < response_tokens else "stop"
+            # Groq reports usage in x_groq on the last chunk; OpenAI in a
+            # separate chunk when stream_options.include_usage is set
+            yield chunk({}, finish_reason, x_groq={"id": completion_id, "usage": token_usage})
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield "data: " + json.dumps({
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created,
+                    "model": model, "choices": [], "usage": token_usage
+                }) + "\n\n"
+            yield "data: [DONE]\n\n"
+            stats.completed += 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def stats_endpoint(request):
+        return JSONResponse(stats.snapshot())
+
+    app = Starlette(routes=[
+        Route("/openai/v1/chat/completions", completions, methods=["POST"]),
+        Route("/v1/chat/completions", completions, methods=["POST"]),
+        Route("/stats", stats_endpoint, methods=["GET"])
+    ])
+    app.state.stats = stats
+    return app
+
+
+def add_stub_arguments(parser):
+    """Add the stub's simulation options to an argument parser."""
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra first-token latency")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0, help="Token rate of answers")
+    parser.add_argument("--response-tokens", type=int, default=60, help="Tokens per answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests failing with 429")
+    parser.add_argument("--rate-limit-rpm", type=int, default=0, help="Requests per minute before 429s")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for injected failures and jitter")
+
+
+def stub_options(args):
+    """Return create_stub_app keyword arguments from parsed arguments."""
+    return {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "tokens_per_second": args.tokens_per_second,
+        "response_tokens": args.response_tokens,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "rate_limit_rpm": args.rate_limit_rpm,
+        "seed": args.seed
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a stub of the Groq/OpenAI chat-completions API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    add_stub_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import uvicorn
+
+    args = parse_args(argv)
+    uvicorn.run(create_stub_app(**stub_options(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.types import Command
+from src.langraphAgenticAI.utils.cache import LRUCache
+from src.langraphAgenticAI.utils.concurrency import LoopSemaphores, get_executor
+
+# Size of the thread pool shared by every tool node for sync execution
+TOOL_POOL_WORKERS = 32
+
+# Sync calls of one tool that may keep running after timing out. Threads
+# cannot be cancelled, so further calls of a tool with this many stuck
+# calls fail fast instead of taking more of the shared pool.
+MAX_STUCK_CALLS_PER_TOOL = 4
+
+
+class _CallSlot:
+    """
+    A tool's concurrency slot for one sync call.
+
+    The slot is released once, by whichever comes first: the call finishing
+    or the caller giving up on it after a timeout. A hung call therefore
+    does not keep later calls of the tool waiting.
+    """
+
+    def __init__(self, limit):
+        self._limit = limit
+        self._lock = threading.Lock()
+        self._running = False
+        self._abandoned = False
+        self._released = False
+
+    def _release(self):
+        if not self._released:
+            self._released = True
+            if self._limit:
+                self._limit.release()
+
+    def acquire(self):
+        """Wait for the slot; return False if the caller gave up meanwhile."""
+        if self._limit:
+            self._limit.acquire()
+        with self._lock:
+            if self._abandoned:
+                self._release()
+                return False
+            self._running = True
+            return True
+
+    def finish(self):
+        """Release the slot after the call; return True if it had timed out."""
+        with self._lock:
+            self._running = False
+            self._release()
+            return self._abandoned
+
+    def abandon(self):
+        """Release the slot on timeout; return True if the call is still running."""
+        with self._lock:
+            self._abandoned = True
+            if self._running:
+                self._release()
+            return self._running
+
+
+class ToolResultCache:
+    """
+    Memoize results of idempotent tools, keyed on tool name and arguments.
+
+    Entries expire after a TTL so tools backed by changing data do not serve
+    stale results forever.
+    """
+
+    def __init__(self, ttl_seconds=300, maxsize=1024):
+        """
+        Initialize the tool result cache.
+
+        Args:
+            ttl_seconds (float): How long a result stays valid.
+            maxsize (int): Maximum number of cached results.
+        """
+        self.ttl_seconds = ttl_seconds
+        self._cache = LRUCache(maxsize=maxsize, name="tool_results")
+
+    @staticmethod
+    def make_key(tool_name, args):
+        """Build a cache key from a tool name and its arguments."""
+        return tool_name, json.dumps(args, sort_keys=True, default=str)
+
+    def get(self, tool_name, args):
+        """Return the cached result, or None if missing or expired."""
+        key = self.make_key(tool_name, args)
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() > expires_at:
+            self._cache.invalidate(lambda k: k == key)
+            return None
+        return result
+
+    def put(self, tool_name, args, result):
+        """Cache a tool result."""
+        self._cache.put(self.make_key(tool_name, args), (time.monotonic() + self.ttl_seconds, result))
+
+    def stats(self):
+        """Return hit/miss counters for the cache."""
+        return self._cache.stats()
+
+
+class ParallelToolNode:
+    """
+    Execute all tool calls of an AI message concurrently.
+
+    Replaces LangGraph's ToolNode in the tool-using graph so a turn that fans
+    out to several tools waits for the slowest tool instead of the sum of all
+    of them. Sync execution uses a shared thread pool; async execution
+    gathers the calls on the event loop.
+
+    Tools receive the full tool call, as with LangGraph's ToolNode, so
+    InjectedToolCallId arguments, artifacts and Command results work.
+    Timed-out sync calls cannot be cancelled: their thread runs until the
+    tool returns, but their concurrency slot is freed right away, and a
+    tool with MAX_STUCK_CALLS_PER_TOOL such calls is failed fast.
+    """
+
+    def __init__(self, tools, timeout=30.0, tool_timeouts=None,
+                 max_concurrency=None, cacheable_tools=None, cache=None):
+        """
+        Initialize the parallel tool node.
+
+        Args:
+            tools (list): The tools that can be called.
+            timeout (float): Default per-call timeout in seconds, including
+                the time spent waiting for a concurrency slot.
+            tool_timeouts (dict): Per-tool timeouts overriding the default.
+            max_concurrency (dict): Maximum concurrent calls per tool name.
+            cacheable_tools (set): Names of idempotent tools whose results may
+                be memoized. Tools with metadata {"idempotent": True} are
+                cached as well.
+            cache (ToolResultCache): Cache for idempotent tool results.
+        """
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.timeout = timeout
+        self.tool_timeouts = tool_timeouts or {}
+        self.max_concurrency = max_concurrency or {}
+        self.cacheable_tools = set(cacheable_tools or [])
+        for tool in tools:
+            if (tool.metadata or {}).get("idempotent"):
+                self.cacheable_tools.add(tool.name)
+        self.cache = cache if cache is not None else ToolResultCache()
+        self._executor = get_executor("tool", TOOL_POOL_WORKERS)
+        self._thread_limits = {
+            name: threading.BoundedSemaphore(limit) for name, limit in self.max_concurrency.items()
+        }
+        self._async_limits = LoopSemaphores()
+        self._stuck_calls = {}
+        self._stuck_lock = threading.Lock()
+
+    @staticmethod
+    def _get_tool_calls(state):
+        messages = state["messages"]
+        if not messages or not isinstance(messages[-1], AIMessage):
+            return []
+        return messages[-1].tool_calls or []
+
+    def _timeout_for(self, name):
+        return self.tool_timeouts.get(name, self.timeout)
+
+    @staticmethod
+    def _to_message(call, result):
+        if isinstance(result, Command):
+            return result
+        if isinstance(result, ToolMessage):
+            if result.tool_call_id == call["id"]:
+                return result
+            # A memoized result answering another call
+            return result.model_copy(update={"tool_call_id": call["id"], "id": None})
+        content = result if isinstance(result, str) else json.dumps(result, default=str)
+        return ToolMessage(content=content, name=call["name"], tool_call_id=call["id"])
+
+    @staticmethod
+    def _to_update(results):
+        """Build the node's update; Command results are returned alongside the messages."""
+        commands = [result for result in results if isinstance(result, Command)]
+        messages = [result for result in results if not isinstance(result, Command)]
+        if not commands:
+            return {"messages": messages}
+        return [*commands, {"messages": messages}] if messages else commands
+
+    @staticmethod
+    def _tool_input(call):
+        return {**call, "type": "tool_call"}
+
+    @staticmethod
+    def _error_message(call, error):
+        return ToolMessage(
+            content=f"Error: {error}",
+            name=call["name"],
+            tool_call_id=call["id"],
+            status="error"
+        )
+
+    def _lookup(self, call):
+        """Return a memoized result for the call, or None."""
+        if call["name"] in self.cacheable_tools:
+            return self.cache.get(call["name"], call["args"])
+        return None
+
+    def _remember(self, call, result):
+        # Commands change graph state, so they are never replayed from the cache
+        if call["name"] in self.cacheable_tools and not isinstance(result, Command):
+            self.cache.put(call["name"], call["args"], result)
+
+    def _count_stuck(self, name, delta):
+        with self._stuck_lock:
+            self._stuck_calls[name] = self._stuck_calls.get(name, 0) + delta
+
+    def _run_call(self, call, config, slot):
+        """Run one tool call in a worker thread, honoring its concurrency limit."""
+        if not slot.acquire():
+            return None
+        try:
+            return self.tools_by_name[call["name"]].invoke(self._tool_input(call), config)
+        finally:
+            if slot.finish():
+                self._count_stuck(call["name"], -1)
+
+    def invoke(self, state, config=None):
+        """
+        Execute the tool calls of the last AI message using the thread pool.
+
+        Args:
+            state: The current state of the conversation.
+            config: The runnable config supplied by LangGraph.
+
+        Returns:
+            dict: A state update with one ToolMessage per tool call, in call
+            order; a list of updates when tools returned Commands.
+        """
+        calls = self._get_tool_calls(state)
+        results = [None] * len(calls)
+        futures = {}
+        for i, call in enumerate(calls):
+            if call["name"] not in self.tools_by_name:
+                results[i] = self._error_message(call, f"unknown tool {call['name']}")
+                continue
+            cached = self._lookup(call)
+            if cached is not None:
+                results[i] = self._to_message(call, cached)
+                continue
+            if self._stuck_calls.get(call["name"], 0) >= MAX_STUCK_CALLS_PER_TOOL:
+                results[i] = self._error_message(call, f"tool {call['name']} is not responding")
+                continue
+            slot = _CallSlot(self._thread_limits.get(call["name"]))
+            futures[i] = (self._executor.submit(self._run_call, call, config, slot), slot)
+
+        # Calls run concurrently, so each one's deadline starts at submission
+        started = time.monotonic()
+        for i, (future, slot) in futures.items():
+            call = calls[i]
+            remaining = self._timeout_for(call["name"]) - (time.monotonic() - started)
+            try:
+                result = future.result(timeout=max(remaining, 0))
+                self._remember(call, result)
+                results[i] = self._to_message(call, result)
+            except FutureTimeoutError:
+                # A running call cannot be cancelled; free its slot instead
+                if not future.cancel() and slot.abandon():
+                    self._count_stuck(call["name"], 1)
+                results[i] = self._error_message(call, f"tool {call['name']} timed out")
+            except Exception as e:
+                results[i] = self._error_message(call, str(e))
+
+        return self._to_update(results)
+
+    def _async_limit(self, name):
+        """Return the asyncio semaphore for a tool on the running loop."""
+        if name not in self.max_concurrency:
+            return None
+        return self._async_limits.get(self.max_concurrency[name], key=name)
+
+    async def _arun_call(self, call, config):
+        if call["name"] not in self.tools_by_name:
+            return self._error_message(call, f"unknown tool {call['name']}")
+        cached = self._lookup(call)
+        if cached is not None:
+            return self._to_message(call, cached)
+
+        tool = self.tools_by_name[call["name"]]
+        limit = self._async_limit(call["name"])
+
+        async def run():
+            if limit:
+                async with limit:
+                    return await tool.ainvoke(self._tool_input(call), config)
+            return await tool.ainvoke(self._tool_input(call), config)
+
+        # Like the sync path, the timeout covers waiting for a slot
+        try:
+            result = await asyncio.wait_for(run(), self._timeout_for(call["name"]))
+        except asyncio.TimeoutError:
+            return self._error_message(call, f"tool {call['name']} timed out")
+        except Exception as e:
+            return self._error_message(call, str(e))
+
+        self._remember(call, result)
+        return self._to_message(call, result)
+
+    async def ainvoke(self, state, config=None):
+        """
+        Execute the tool calls of the last AI message concurrently on the event loop.
+
+        Sync tools are run in the default executor by BaseTool.ainvoke.
+
+        Args:
+            state: The current state of the conversation.
+            config: The runnable config supplied by LangGraph.
+
+        Returns:
+            dict: A state update with one ToolMessage per tool call, in call
+            order; a list of updates when tools returned Commands.
+        """
+        calls = self._get_tool_calls(state)
+        results = await asyncio.gather(*(self._arun_call(call, config) for call in calls))
+        return self._to_update(list(results))
@@ -0,0 +1,130 @@
+import sys
+import streamlit as st
+from src.langraphAgenticAI.utils.cache import LRUCache
+
+ROLE_LABELS = {"user": "You", "assistant": "Assistant"}
+
+# Rendered markdown of older, immutable message pages, shared by all sessions
+rendered_page_cache = LRUCache(maxsize=256, name="rendered_pages")
+
+
+class Transcript:
+    """
+    A compact, append-only chat transcript.
+
+    Messages are stored as (role, content) tuples instead of dicts, and
+    iterating yields {"role", "content"} dicts so existing callers (such as
+    history_to_messages) keep working.
+    """
+
+    def __init__(self, messages=None):
+        """
+        Initialize the transcript.
+
+        Args:
+            messages (list): Optional {"role", "content"} dicts to start with.
+        """
+        self._items = []
+        for message in messages or []:
+            self.append(message)
+
+    def append(self, message):
+        """Append a {"role", "content"} dict."""
+        # Interning keeps one copy of each role string
+        self._items.append((sys.intern(message["role"]), message["content"]))
+
+    def window(self, start, end=None):
+        """Return the (role, content) tuples in [start, end)."""
+        return tuple(self._items[start:end])
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        for role, content in self._items:
+            yield {"role": role, "content": content}
+
+    def __getitem__(self, index):
+        role, content = self._items[index]
+        return {"role": role, "content": content}
+
+
+def render_page_markdown(messages):
+    """
+    Render a page of past messages as one markdown block.
+
+    Past messages never change, so the result is cached by content and each
+    older page costs a single Streamlit element instead of one per message.
+
+    Args:
+        messages (tuple): (role, content) tuples.
+
+    Returns:
+        str: The rendered markdown.
+    """
+    def render():
+        return "\n\n---\n\n".join(
+            f"**{ROLE_LABELS.get(role, role)}:**\n\n{content}" for role, content in messages
+        )
+    return rendered_page_cache.get_or_create(messages, render)
+
+
+class ChatHistoryView:
+    """
+    Render the chat history incrementally.
+
+    Only the most recent page of messages is rendered as chat bubbles. Older
+    messages stay hidden behind a "Load older messages" control and, once
+    loaded, are rendered a page at a time from cached markdown. Pages are
+    aligned to absolute message positions so they stay cacheable as the
+    conversation grows.
+    """
+
+    def __init__(self, page_size=30, state_key="history_pages"):
+        """
+        Initialize the view.
+
+        Args:
+            page_size (int): Messages per page.
+            state_key (str): Session state key holding the number of older
+                pages the user has loaded.
+        """
+        self.page_size = max(int(page_size), 1)
+        self.state_key = state_key
+
+    def reset(self):
+        """Hide the older pages again, e.g. when a new conversation starts."""
+        st.session_state[self.state_key] = 0
+
+    def render(self, transcript):
+        """
+        Render the transcript.
+
+        Args:
+            transcript (Transcript): The chat transcript.
+        """
+        total = len(transcript)
+        # Older pages start at multiples of page_size, so a page's messages
+        # (its cache key) never change as the conversation grows. The
+        # recent section holds the last page_size to 2 * page_size - 1 messages.
+        recent_start = max(total - self.page_size, 0)
+        recent_start -= recent_start % self.page_size
+        loaded_pages = st.session_state.get(self.state_key, 0)
+        older_start = max(recent_start - loaded_pages * self.page_size, 0)
+
+        if older_start > 0:
+            if st.button(f"Load older messages ({older_start} hidden)", key=f"{self.state_key}_more"):
+                st.session_state[self.state_key] = loaded_pages + 1
+                st.rerun()
+
+        for page_start in range(older_start, recent_start, self.page_size):
+            messages = transcript.window(page_start, page_start + self.page_size)
+            with st.container(border=True):
+                st.markdown(render_page_markdown(messages))
+
+        for role, content in transcript.window(recent_start):
+            with st.chat_message(role):
+                st.markdown(content)
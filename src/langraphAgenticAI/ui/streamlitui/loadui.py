@@ -1,15 +1,28 @@
 import streamlit as st
 import os
+import uuid
 from datetime import date
-from langchain_core.messages import AIMessage, HumanMessage
 from src.langraphAgenticAI.ui.uiconfigfile import Config
-from src.langraphAgenticAI.LLMS.groqllm import GroqLLM
+from src.langraphAgenticAI.ui.streamlitui.display_result import ChatHistoryView, Transcript
+from src.langraphAgenticAI.LLMS.registry import get_llm_handler, get_provider_class
 from src.langraphAgenticAI.utils.env_loader import get_env_var
+from src.langraphAgenticAI.utils.cache import get_cache_stats, use_llm_settings
+from src.langraphAgenticAI.utils.single_flight import llm_flights
+from src.langraphAgenticAI.utils.rate_limiter import get_rate_limiter
 
 class LoadStreamUI:
     def __init__(self):
         self.config = Config()
         self.llm_options = self.config.get_llm_options()
+        self.cache_options = self.config.get_cache_options()
+        self.checkpoint_options = self.config.get_checkpoint_options()
+        self.routing_options = self.config.get_routing_options()
+        self.cascade_options = self.config.get_cascade_options()
+        self.rate_limit_options = self.config.get_rate_limit_options()
+        self.tracing_options = self.config.get_tracing_options()
+        self.rag_options = self.config.get_rag_options()
+        self.map_reduce_options = self.config.get_map_reduce_options()
+        self.history_view = ChatHistoryView(self.config.get_display_options()['chat_page_size'])
         self.user_controls = {}
         self.message_processor = None
         
@@ -57,6 +70,7 @@ class LoadStreamUI:
                 options=model_options,
                 index=0
             )
+            self.user_controls["selected_model"] = selected_model
             self.user_controls["selected_groq_model"] = selected_model
             
             # Temperature Slider
@@ -89,6 +103,18 @@ class LoadStreamUI:
             )
             self.user_controls["top_p"] = top_p
             
+            # History token budget (0 derives it from the model's context window)
+            history_token_budget = st.number_input(
+                "History Token Budget",
+                min_value=0,
+                max_value=131072,
+                value=self.llm_options['history_token_budget'],
+                step=256,
+                help="0 uses the model context window minus Max Tokens"
+            )
+            self.user_controls["history_token_budget"] = history_token_budget
+            self.user_controls["summarize_history"] = self.llm_options['summarize_history']
+            
             # Use Case Selection
             usecase = st.selectbox(
                 "Select Use Case",
@@ -96,6 +122,108 @@ class LoadStreamUI:
                 index=0
             )
             self.user_controls["usecase"] = usecase
+            self.user_controls.update(self.rag_options)
+            self.user_controls.update(self.map_reduce_options)
+            
+            # Semantic response cache for near-duplicate prompts
+            semantic_cache = st.checkbox(
+                "Semantic Cache",
+                value=self.cache_options['semantic_cache_enabled'],
+                help="Answer near-duplicate questions from a local FAISS cache"
+            )
+            self.user_controls.update(self.cache_options)
+            self.user_controls["semantic_cache"] = semantic_cache
+            
+            # Exact-match cache; temperature 0 responses are always cached
+            cache_responses = st.checkbox(
+                "Cache All Responses",
+                value=self.cache_options['cache_responses'],
+                help="Also cache identical requests when temperature is above 0"
+            )
+            self.user_controls["cache_responses"] = cache_responses
+            
+            # Latency-aware routing across all configured models
+            routing = st.checkbox(
+                "Latency-aware Routing",
+                value=self.routing_options['routing'],
+                help="Send each turn to the fastest healthy model and fall back on errors"
+            )
+            hedge_requests = st.checkbox(
+                "Hedge Slow Requests",
+                value=self.routing_options['hedge_requests'],
+                disabled=not routing,
+                help="Also ask the next model once a request exceeds its p95 latency"
+            )
+            self.user_controls["routing"] = routing
+            self.user_controls["hedge_requests"] = routing and hedge_requests
+            self.user_controls["router_max_retries"] = self.routing_options['router_max_retries']
+            self.user_controls["model_options"] = self.llm_options['model_options']
+            
+            # Small model first, main model only when the draft is not good enough
+            cascade = st.checkbox(
+                "Model Cascade",
+                value=self.cascade_options['cascade'],
+                help="Let a smaller model answer simple questions and escalate the rest"
+            )
+            self.user_controls.update(self.cascade_options)
+            self.user_controls["cascade"] = cascade
+            
+            self.user_controls.update(self.checkpoint_options)
+            self.user_controls.update(self.rate_limit_options)
+            self.user_controls.update(self.tracing_options)
+            if st.button("New Conversation"):
+                self.reset_conversation()
+            
+            # Drop cached clients and graphs of settings no session uses any more
+            self._track_llm_settings()
+            
+            with st.expander("Cache stats"):
+                cache_stats = get_cache_stats()
+                if semantic_cache:
+                    # FAISS is only imported once the semantic cache is used;
+                    # the graph factory creates the cache with its settings
+                    from src.langraphAgenticAI.vectorstore.semantic_cache import get_semantic_cache_stats
+                    semantic_stats = get_semantic_cache_stats()
+                    if semantic_stats:
+                        cache_stats.append(semantic_stats)
+                llm_handler = get_llm_handler(self.user_controls)
+                response_cache = llm_handler.get_response_cache() if llm_handler else None
+                if response_cache:
+                    cache_stats.append(response_cache.stats())
+                if routing:
+                    from src.langraphAgenticAI.LLMS.router import get_all_model_stats
+                    for key, stats in get_all_model_stats().items():
+                        p50 = f"{stats['p50']:.2f}s" if stats['p50'] is not None else "n/a"
+                        st.caption(
+                            f"{key}: p50 {p50}, {stats['error_rate']:.0%} errors"
+                            f"{'' if stats['healthy'] else ' (cooling down)'}"
+                        )
+                for (provider, _, model), metrics in get_rate_limiter().metrics().items():
+                    st.caption(
+                        f"rate limit {provider}/{model}: {metrics['queue_depth']} queued, "
+                        f"avg wait {metrics['avg_wait']:.2f}s, max {metrics['max_wait']:.2f}s"
+                    )
+                if cascade:
+                    from src.langraphAgenticAI.nodes.cascade_node import cascade_stats
+                    stats = cascade_stats.snapshot()
+                    st.caption(
+                        f"cascade: {stats['accepted']}/{stats['turns']} answered by the small model, "
+                        f"{stats['escalation_rate']:.0%} escalated"
+                    )
+                if self.user_controls.get("coalesce_requests"):
+                    flights = llm_flights.stats()
+                    st.caption(
+                        f"{flights['name']}: {flights['followers']} coalesced / {flights['leaders']} upstream "
+                        f"({flights['in_flight']} in flight)"
+                    )
+                for stats in cache_stats:
+                    st.caption(
+                        f"{stats['name']}: {stats['hits']} hits / {stats['misses']} misses "
+                        f"({stats['size']}/{stats['maxsize']} entries)"
+                    )
+            
+            if self.tracing_options['tracing']:
+                self.show_latency_breakdown()
             
             st.divider()
             st.markdown("### About")
@@ -104,16 +232,88 @@ class LoadStreamUI:
             It provides a flexible interface for interacting with various LLM providers.
             """)
             
+    def show_latency_breakdown(self):
+        """Show where the time of the previous turn went."""
+        from src.langraphAgenticAI.utils.tracing import get_tracer, latency_breakdown
+        
+        with st.expander("Latency (last turn)"):
+            trace_id = st.session_state.get("last_trace_id")
+            spans = get_tracer(self.tracing_options['trace_file']).get_trace(trace_id) if trace_id else []
+            if not spans:
+                st.caption("No traced turn yet.")
+                return
+            
+            breakdown = latency_breakdown(spans)
+            if breakdown['total_ms'] is not None:
+                ttft = f"{breakdown['ttft_ms']:.0f} ms" if breakdown['ttft_ms'] is not None else "n/a"
+                st.caption(f"total {breakdown['total_ms']:.0f} ms, first token {ttft}")
+            for name, duration in breakdown['nodes'].items():
+                st.caption(f"node {name}: {duration:.0f} ms")
+            for kind in ("prompt", "llm", "tool"):
+                if kind in breakdown['kinds']:
+                    st.caption(f"{kind}: {breakdown['kinds'][kind]:.0f} ms")
+            if 'overhead_ms' in breakdown:
+                st.caption(f"graph overhead: {breakdown['overhead_ms']:.0f} ms")
+            st.caption(f"tokens: {breakdown['input_tokens']} in / {breakdown['output_tokens']} out")
+            
+    def _track_llm_settings(self):
+        """Register this session's LLM settings so stale cache entries can be dropped."""
+        handler_class = get_provider_class(self.user_controls.get("llm_provider", "Groq"))
+        if handler_class is None:
+            return
+        
+        if "cache_session_id" not in st.session_state:
+            st.session_state.cache_session_id = uuid.uuid4().hex
+        settings_key = handler_class(self.user_controls).get_cache_key()
+        use_llm_settings(st.session_state.cache_session_id, settings_key)
+            
+    def get_thread_id(self):
+        """
+        Return the checkpointer thread id of this conversation.
+        
+        The id is kept in the URL so reloading the page, or reconnecting after
+        a server restart, resumes the same conversation.
+        
+        Returns:
+            str: The thread id.
+        """
+        if "thread_id" not in st.session_state:
+            st.session_state.thread_id = st.query_params.get("thread") or uuid.uuid4().hex
+        st.query_params["thread"] = st.session_state.thread_id
+        return st.session_state.thread_id
+    
+    def reset_conversation(self):
+        """Start a new conversation thread."""
+        st.session_state.thread_id = uuid.uuid4().hex
+        st.session_state.messages = Transcript()
+        self.history_view.reset()
+        st.query_params["thread"] = st.session_state.thread_id
+    
+    def restore_messages(self, graph, config):
+        """
+        Load the chat transcript of a resumed thread from the graph's checkpointer.
+        
+        Args:
+            graph: The compiled graph with a checkpointer.
+            config (dict): The config selecting the thread.
+        """
+        if st.session_state.get("messages"):
+            return
+        
+        from langchain_core.messages import AIMessage, HumanMessage
+        
+        snapshot = graph.get_state(config)
+        messages = []
+        for message in snapshot.values.get("messages", []) if snapshot else []:
+            if isinstance(message, HumanMessage):
+                messages.append({"role": "user", "content": message.content})
+            elif isinstance(message, AIMessage) and message.content:
+                messages.append({"role": "assistant", "content": message.content})
+        st.session_state.messages = Transcript(messages)
+            
     def get_llm(self):
         """Get the appropriate LLM based on user selection."""
-        llm_provider = self.user_controls.get("llm_provider", "Groq")
-        
-        if llm_provider == "Groq":
-            return GroqLLM(self.user_controls)
-        # Add more LLM providers here as needed
-        else:
-            st.error(f"LLM provider {llm_provider} not implemented yet.")
-            return None
+        return get_llm_handler(self.user_controls)
             
     def create_main_interface(self):
         """Create the main chat interface."""
@@ -121,12 +321,10 @@ class LoadStreamUI:
         
         # Initialize chat history
         if "messages" not in st.session_state:
-            st.session_state.messages = []
+            st.session_state.messages = Transcript()
             
-        # Display chat messages
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+        # Display the recent chat messages; older ones are paged in on demand
+        self.history_view.render(st.session_state.messages)
                 
         # Chat input
         if prompt := st.chat_input("What would you like to know?"):
@@ -137,20 +335,48 @@ class LoadStreamUI:
                 
             # Add AI response to chat history
             with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    # Process the message using the provided processor
-                    if self.message_processor:
-                        response = self.message_processor(prompt)
+                placeholder = st.empty()
+                placeholder.markdown("Thinking...")
+                
+                # Process the message using the provided processor
+                if self.message_processor:
+                    response = self.message_processor(prompt)
+                else:
+                    # Fallback to direct LLM if no processor is set
+                    llm = self.get_llm()
+                    if llm:
+                        response = llm.stream_response(prompt)
                     else:
-                        # Fallback to direct LLM if no processor is set
-                        llm = self.get_llm()
-                        if llm:
-                            response = llm.generate_response(prompt)
-                        else:
-                            response = "Unable to initialize LLM. Please check your configuration."
-                    
-                    st.markdown(response)
-                    st.session_state.messages.append({"role": "assistant", "content": response})
+                        response = "Unable to initialize LLM. Please check your configuration."
+                
+                response = self.render_response(placeholder, response)
+                st.session_state.messages.append({"role": "assistant", "content": response})
+    
+    @staticmethod
+    def render_response(placeholder, response):
+        """
+        Render a response into a placeholder, incrementally if it is streamed.
+        
+        Args:
+            placeholder: The Streamlit placeholder to render into.
+            response: Either the full response text or an iterable of text chunks.
+            
+        Returns:
+            str: The full response text.
+        """
+        if isinstance(response, str):
+            placeholder.markdown(response)
+            return response
+        
+        text = ""
+        try:
+            for chunk in response:
+                text += chunk
+                placeholder.markdown(text + "\u258c")
+        except Exception as e:
+            text += f"\n\nError: {str(e)}"
+        placeholder.markdown(text)
+        return text
                     
     def run(self):
         """Run the Streamlit interface."""
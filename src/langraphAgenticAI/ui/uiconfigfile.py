@@ -1,6 +1,23 @@
 import os
+import threading
 from configparser import ConfigParser
 
+# Parsed config files, shared by every Config instance in the process. The
+# UI is rebuilt on each Streamlit rerun, but the file is only read once.
+_parsed_configs = {}
+_parsed_configs_lock = threading.Lock()
+
+
+def _read_config(config_path):
+    """Parse a config file once per process."""
+    with _parsed_configs_lock:
+        if config_path not in _parsed_configs:
+            parser = ConfigParser()
+            parser.read(config_path)
+            _parsed_configs[config_path] = parser
+        return _parsed_configs[config_path]
+
+
 class Config:
     def __init__(self, config_file='uiconfigfile.ini'):
         # Get the directory where this script is located
@@ -8,8 +25,7 @@ class Config:
         # Construct the full path to the config file
         config_path = os.path.join(current_dir, config_file)
         
-        self.config = ConfigParser()
-        self.config.read(config_path)
+        self.config = _read_config(config_path)
         
     def get(self, section, option, fallback=None):
         """Get a configuration value with optional fallback."""
@@ -38,5 +54,79 @@ class Config:
             'max_tokens': int(self.get('Default', 'MAX_TOKENS', '4096')),
             'top_p': float(self.get('Default', 'TOP_P', '0.95')),
             'frequency_penalty': float(self.get('Default', 'FREQUENCY_PENALTY', '0.0')),
-            'presence_penalty': float(self.get('Default', 'PRESENCE_PENALTY', '0.0'))
-        }
\ No newline at end of file
+            'presence_penalty': float(self.get('Default', 'PRESENCE_PENALTY', '0.0')),
+            'history_token_budget': int(self.get('Default', 'HISTORY_TOKEN_BUDGET', '0')),
+            'summarize_history': self.config.getboolean('Default', 'SUMMARIZE_HISTORY', fallback=False)
+        }
+
+    def get_cache_options(self):
+        """Get response cache options from the Default section."""
+        return {
+            'semantic_cache_enabled': self.config.getboolean('Default', 'SEMANTIC_CACHE_ENABLED', fallback=False),
+            'semantic_cache_threshold': float(self.get('Default', 'SEMANTIC_CACHE_THRESHOLD', '0.92')),
+            'semantic_cache_ttl_seconds': float(self.get('Default', 'SEMANTIC_CACHE_TTL_SECONDS', '0')) or None,
+            'semantic_cache_dir': self.get('Default', 'SEMANTIC_CACHE_DIR', '') or None,
+            'cache_responses': self.config.getboolean('Default', 'RESPONSE_CACHE_ENABLED', fallback=False),
+            'response_cache_db': self.get('Default', 'RESPONSE_CACHE_DB', '') or None,
+            'coalesce_requests': self.config.getboolean('Default', 'COALESCE_REQUESTS', fallback=False)
+        }
+
+    def get_checkpoint_options(self):
+        """Get graph checkpointing options from the Default section."""
+        return {
+            'checkpointer': self.get('Default', 'CHECKPOINTER', 'memory').strip().lower(),
+            'checkpoint_db': self.get('Default', 'CHECKPOINT_DB', '') or None
+        }
+
+    def get_routing_options(self):
+        """Get model routing options from the Default section."""
+        return {
+            'routing': self.config.getboolean('Default', 'ROUTING_ENABLED', fallback=False),
+            'hedge_requests': self.config.getboolean('Default', 'HEDGE_REQUESTS', fallback=False),
+            'router_max_retries': int(self.get('Default', 'ROUTER_MAX_RETRIES', '1'))
+        }
+
+    def get_cascade_options(self):
+        """Get small-model-first cascade options from the Default section."""
+        return {
+            'cascade': self.config.getboolean('Default', 'CASCADE_ENABLED', fallback=False),
+            'cascade_small_model': self.get('Default', 'CASCADE_SMALL_MODEL', '') or None,
+            'cascade_complexity_threshold': float(self.get('Default', 'CASCADE_COMPLEXITY_THRESHOLD', '0.6')),
+            'cascade_confidence_threshold': float(self.get('Default', 'CASCADE_CONFIDENCE_THRESHOLD', '0.7'))
+        }
+
+    def get_rate_limit_options(self):
+        """Get outbound LLM rate limits from the Default section (0 disables a limit)."""
+        return {
+            'rate_limit_rpm': int(self.get('Default', 'RATE_LIMIT_RPM', '0')),
+            'rate_limit_tpm': int(self.get('Default', 'RATE_LIMIT_TPM', '0'))
+        }
+
+    def get_tracing_options(self):
+        """Get latency tracing options from the Default section."""
+        return {
+            'tracing': self.config.getboolean('Default', 'TRACING_ENABLED', fallback=False),
+            'trace_file': self.get('Default', 'TRACE_FILE', '') or None
+        }
+
+    def get_display_options(self):
+        """Get chat display options from the Default section."""
+        return {
+            'chat_page_size': int(self.get('Default', 'CHAT_PAGE_SIZE', '30'))
+        }
+
+    def get_rag_options(self):
+        """Get retrieval-augmented generation options from the Default section."""
+        return {
+            'rag_index_dir': self.get('Default', 'RAG_INDEX_DIR', '.cache/rag'),
+            'rag_top_k': int(self.get('Default', 'RAG_TOP_K', '4')),
+            'rag_max_context_chars': int(self.get('Default', 'RAG_MAX_CONTEXT_CHARS', '4000'))
+        }
+
+    def get_map_reduce_options(self):
+        """Get map-reduce document processing options from the Default section."""
+        return {
+            'map_reduce_chunk_chars': int(self.get('Default', 'MAP_REDUCE_CHUNK_CHARS', '6000')),
+            'map_reduce_group_size': int(self.get('Default', 'MAP_REDUCE_GROUP_SIZE', '4')),
+            'map_reduce_max_concurrency': int(self.get('Default', 'MAP_REDUCE_MAX_CONCURRENCY', '4'))
+        }
@@ -0,0 +1,184 @@
+"""
+A long-lived background event loop and shared HTTP connection pools.
+"""
+import asyncio
+import queue
+import threading
+import httpx
+
+_DONE = object()
+
+
+class BackgroundEventLoop:
+    """
+    Run coroutines on one event loop owned by a daemon thread.
+
+    Streamlit executes every session's script in its own thread. Submitting
+    graph runs here lets all sessions share a single loop (and a single async
+    HTTP connection pool) instead of each blocking a thread on the network.
+    """
+
+    def __init__(self, name="agentic-ai-loop"):
+        """
+        Start the loop thread.
+
+        Args:
+            name (str): Name of the daemon thread.
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            concurrent.futures.Future: Future for the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coro: The coroutine to run.
+            timeout (float): Seconds to wait before raising TimeoutError.
+
+        Returns:
+            The coroutine's result.
+        """
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, async_iterable, timeout=None):
+        """
+        Consume an async iterable on the loop from synchronous code.
+
+        Args:
+            async_iterable: The async iterable (e.g. an async generator).
+            timeout (float): Maximum seconds to wait for each item.
+
+        Yields:
+            The items produced by the async iterable.
+        """
+        items = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in async_iterable:
+                    items.put(item)
+            except BaseException as e:
+                items.put(e)
+            finally:
+                items.put(_DONE)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item = items.get(timeout=timeout)
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Stop the producer if the consumer goes away early
+            future.cancel()
+
+    async def aiterate(self, async_iterable, maxsize=64):
+        """
+        Consume an async iterable on the loop from another event loop.
+
+        Items are handed over through a bounded queue, so a slow consumer
+        pauses the producer instead of buffering without limit.
+
+        Args:
+            async_iterable: The async iterable (e.g. an async generator).
+            maxsize (int): Maximum items buffered between the loops.
+
+        Yields:
+            The items produced by the async iterable.
+        """
+        caller = asyncio.get_running_loop()
+        items = asyncio.Queue(maxsize=maxsize)
+
+        async def put(item):
+            # Runs on the caller's loop, where the queue lives
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(items.put(item), caller))
+
+        async def pump():
+            iterator = async_iterable.__aiter__()
+            try:
+                async for item in iterator:
+                    await put(item)
+                await put(_DONE)
+            except Exception as e:
+                await put(e)
+            finally:
+                # When the consumer goes away the pump is cancelled, possibly
+                # while waiting on a full queue; nothing more is put then,
+                # and the source is closed so its own cleanup runs
+                aclose = getattr(iterator, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item = await items.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Stop the producer if the consumer goes away early
+            future.cancel()
+
+    def stop(self):
+        """Stop the loop and wait for its thread to exit."""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+_background_loop = None
+_http_clients = None
+_lock = threading.Lock()
+
+# Connection pool limits shared by every LLM client in the process
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+def get_background_loop():
+    """Return the process-wide background event loop, starting it on first use."""
+    global _background_loop
+    with _lock:
+        if _background_loop is None:
+            _background_loop = BackgroundEventLoop()
+        return _background_loop
+
+
+def get_http_clients():
+    """
+    Return the process-wide HTTP clients used by LLM providers.
+
+    Returns:
+        tuple: (httpx.Client, httpx.AsyncClient) sharing the same pool limits.
+            The async client must only be used from the background loop.
+    """
+    global _http_clients
+    with _lock:
+        if _http_clients is None:
+            _http_clients = (
+                httpx.Client(limits=HTTP_LIMITS),
+                httpx.AsyncClient(limits=HTTP_LIMITS)
+            )
+        return _http_clients
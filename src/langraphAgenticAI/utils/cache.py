@@ -0,0 +1,226 @@
+"""
+In-process caching utilities.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def hash_secret(value):
+    """
+    Hash a secret (e.g. an API key) so it can be used inside a cache key.
+
+    Args:
+        value: The secret to hash.
+
+    Returns:
+        str: A short, stable digest of the secret.
+    """
+    if not value:
+        return ""
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:16]
+
+
+class _Build:
+    """A value being built by get_or_create, shared with concurrent callers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LRUCache:
+    """
+    A thread-safe, keyed LRU cache with hit/miss counters.
+
+    Streamlit reruns the script for every interaction, so expensive objects
+    (LLM clients, compiled graphs) are kept here at module level and shared
+    across reruns and sessions within the same process.
+    """
+
+    def __init__(self, maxsize=32, name="cache"):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries before the least recently
+                used entry is evicted.
+            name (str): Name used when reporting stats.
+        """
+        self.maxsize = maxsize
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self._building = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """
+        Return the cached value for key, building it with factory on a miss.
+
+        The factory runs outside the cache lock, so a slow build does not
+        block lookups of other keys. Concurrent misses on the same key wait
+        for the first caller's build instead of building it again.
+
+        Args:
+            key: A hashable cache key.
+            factory: Zero-argument callable producing the value.
+
+        Returns:
+            The cached or newly created value. None results are not cached.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            build = self._building.get(key)
+            leader = build is None
+            if leader:
+                build = self._building[key] = _Build()
+
+        if not leader:
+            build.done.wait()
+            if build.error is not None:
+                raise build.error
+            return build.value
+
+        try:
+            build.value = factory()
+            if build.value is not None:
+                self.put(key, build.value)
+            return build.value
+        except BaseException as e:
+            build.error = e
+            raise
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
+            build.done.set()
+
+    def invalidate(self, predicate=None):
+        """
+        Remove entries from the cache.
+
+        Args:
+            predicate: Callable taking a key and returning True for entries to
+                drop. If None, the whole cache is cleared.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._data)
+                self._data.clear()
+                return removed
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        """Return hit/miss counters for this cache."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+# Process-wide caches shared by every Streamlit session.
+llm_client_cache = LRUCache(maxsize=16, name="llm_clients")
+graph_cache = LRUCache(maxsize=16, name="graphs")
+
+# LLM settings key used by each session, and number of sessions per key
+_session_settings = {}
+_settings_users = {}
+_settings_lock = threading.Lock()
+
+
+def invalidate_llm_settings(settings_key):
+    """
+    Drop cached LLM clients and graphs built for the given settings key.
+
+    Args:
+        settings_key (tuple): The key returned by BaseLLM.get_cache_key().
+
+    Returns:
+        int: Number of entries removed across both caches.
+    """
+    removed = llm_client_cache.invalidate(lambda key: key == settings_key)
+    removed += graph_cache.invalidate(lambda key: key[0] == settings_key)
+    return removed
+
+
+def use_llm_settings(session_id, settings_key):
+    """
+    Record the LLM settings a session uses, dropping settings no session uses any more.
+
+    Clients and graphs are shared by every session with the same settings,
+    so when a session switches settings, the entries of its previous ones
+    are only invalidated if no other session still uses them. Settings of
+    sessions that ended without switching age out of the LRU.
+
+    Args:
+        session_id (str): Identifies the session.
+        settings_key (tuple): The key returned by BaseLLM.get_cache_key().
+
+    Returns:
+        int: Number of cache entries removed.
+    """
+    with _settings_lock:
+        previous = _session_settings.get(session_id)
+        if previous == settings_key:
+            return 0
+        _session_settings[session_id] = settings_key
+        _settings_users[settings_key] = _settings_users.get(settings_key, 0) + 1
+        if previous is None:
+            return 0
+        _settings_users[previous] -= 1
+        if _settings_users[previous] > 0:
+            return 0
+        del _settings_users[previous]
+        return invalidate_llm_settings(previous)
+
+
+def get_cache_stats():
+    """Return stats for all process-wide caches."""
+    return [llm_client_cache.stats(), graph_cache.stats()]
@@ -0,0 +1,61 @@
+"""
+Process-wide thread pools and per-event-loop semaphores.
+"""
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def get_executor(name, max_workers):
+    """
+    Return the process-wide thread pool with the given name, creating it on first use.
+
+    Pools are shared by every node and graph in the process and live as long
+    as it does, so building graphs never leaks threads.
+
+    Args:
+        name (str): Pool name, also the prefix of its thread names.
+        max_workers (int): Size of the pool when it is created.
+
+    Returns:
+        ThreadPoolExecutor: The shared pool.
+    """
+    with _lock:
+        if name not in _executors:
+            _executors[name] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        return _executors[name]
+
+
+class LoopSemaphores:
+    """
+    Concurrency limits for asyncio code that may run on several event loops.
+
+    An asyncio.Semaphore belongs to one loop, so each loop gets its own set.
+    They are held weakly by loop and go away when the loop is collected.
+    """
+
+    def __init__(self):
+        self._by_loop = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, limit, key=None):
+        """
+        Return the semaphore for key on the running loop.
+
+        Args:
+            limit (int): Size of the semaphore when it is created.
+            key: Distinguishes several limits of the same owner.
+
+        Returns:
+            asyncio.Semaphore: The semaphore for the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._by_loop.setdefault(loop, {})
+            if key not in semaphores:
+                semaphores[key] = asyncio.Semaphore(limit)
+            return semaphores[key]
@@ -0,0 +1,280 @@
+"""
+Conversation history windowing with token budgeting.
+"""
+import hashlib
+import logging
+import re
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from src.langraphAgenticAI.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Per-message overhead (role, separators) added by chat formats
+MESSAGE_TOKEN_OVERHEAD = 4
+
+# Tokens kept free for the system prompt and the current user input
+DEFAULT_PROMPT_RESERVE = 1024
+
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Largest share of the context window reserved for the answer, so a
+# MAX_TOKENS as large as the window still leaves room for history
+MAX_ANSWER_SHARE = 0.5
+
+# Smallest history budget derived from a context window
+MIN_HISTORY_BUDGET = 512
+
+# Tokens kept free for the rolling summary when turns are evicted
+DEFAULT_SUMMARY_RESERVE = 256
+
+
+def approximate_token_count(text):
+    """
+    Cheaply estimate the number of tokens in a text.
+
+    Uses the common ~4 characters per token heuristic, which avoids loading a
+    tokenizer on the hot path.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Estimated number of tokens.
+    """
+    return (len(text) + 3) // 4
+
+
+def get_context_window(model_name, default=DEFAULT_CONTEXT_WINDOW):
+    """
+    Derive a model's context window from its name.
+
+    Groq model names carry the context size as a suffix
+    (e.g. "mixtral-8x7b-32768", "llama3-8b-8192").
+
+    Args:
+        model_name (str): The model name.
+        default (int): Value used when the name carries no context size.
+
+    Returns:
+        int: The context window in tokens.
+    """
+    match = re.search(r'-(\d{4,6})$', model_name or '')
+    return int(match.group(1)) if match else default
+
+
+def _message_text(message):
+    """Return the textual content of a message."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    # Multi-part content: keep only the text parts
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+    )
+
+
+def _message_digest(message, previous=b""):
+    """Hash a message, optionally chained onto a previous digest."""
+    digest = hashlib.sha1(previous)
+    digest.update(message.type.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(_message_text(message).encode("utf-8"))
+    return digest.digest()
+
+
+class LLMSummarizer:
+    """Summarize evicted conversation turns with an LLM."""
+
+    def __init__(self, llm, max_words=150):
+        """
+        Initialize the summarizer.
+
+        Args:
+            llm: The language model used to write summaries.
+            max_words (int): Target length of the rolling summary.
+        """
+        self.llm = llm
+        self.max_words = max_words
+
+    def __call__(self, previous_summary, messages):
+        """
+        Fold messages into the previous summary.
+
+        Args:
+            previous_summary (str): The current rolling summary, may be empty.
+            messages (list): The messages being evicted from the window.
+
+        Returns:
+            str: The updated summary.
+        """
+        transcript = "\n".join(f"{m.type}: {_message_text(m)}" for m in messages)
+        prompt = (
+            f"Update the summary of an ongoing conversation in at most {self.max_words} words. "
+            f"Keep facts, decisions and open questions.\n\n"
+            f"Current summary:\n{previous_summary or '(none)'}\n\n"
+            f"New messages:\n{transcript}\n\nUpdated summary:"
+        )
+        # Tagged so graph.stream(stream_mode="messages") does not surface the
+        # summary tokens as part of the chatbot's answer
+        return self.llm.invoke(prompt, config={"tags": ["nostream"]}).content.strip()
+
+
+class HistoryManager:
+    """
+    Trim conversation history to a token budget.
+
+    System messages are always kept. Tool messages stay attached to the AI
+    message that requested them so a tool call is never sent without its
+    result. Older turns are dropped first and, when a summarizer is set,
+    folded into a rolling summary that is sent as a system message.
+    """
+
+    def __init__(self, token_budget, token_counter=None, summarizer=None, cache_size=4096,
+                 summary_reserve=DEFAULT_SUMMARY_RESERVE):
+        """
+        Initialize the history manager.
+
+        Args:
+            token_budget (int): Maximum number of tokens of history to send.
+            token_counter: Callable mapping a text to a token count. Defaults
+                to approximate_token_count.
+            summarizer: Optional callable (previous_summary, messages) -> str
+                used to summarize evicted turns.
+            cache_size (int): Number of per-message token counts and summaries
+                to keep.
+            summary_reserve (int): Tokens of the budget left for the summary
+                message when older turns are evicted.
+        """
+        self.token_budget = token_budget
+        self.summary_reserve = summary_reserve if summarizer else 0
+        self.token_counter = token_counter or approximate_token_count
+        self.summarizer = summarizer
+        # Token counts keyed by message digest, so each message is only
+        # tokenized once no matter how many turns it stays in the window.
+        self._token_counts = LRUCache(maxsize=cache_size, name="history_tokens")
+        # Rolling summaries keyed by the chained digest of the evicted prefix
+        self._summaries = LRUCache(maxsize=cache_size, name="history_summaries")
+
+    @classmethod
+    def from_config(cls, model_name, max_tokens, token_budget=0, context_window=None,
+                    prompt_reserve=DEFAULT_PROMPT_RESERVE, **kwargs):
+        """
+        Create a history manager sized for a model.
+
+        Args:
+            model_name (str): The model name, used to derive its context window.
+            max_tokens (int): Tokens reserved for the model's answer, capped at
+                half of the context window.
+            token_budget (int): Explicit history budget; 0 derives it from the
+                context window.
+            context_window (int): Overrides the context window derived from
+                the model name.
+            prompt_reserve (int): Tokens reserved for the system prompt and input.
+            **kwargs: Passed on to the constructor.
+
+        Returns:
+            HistoryManager: The configured history manager.
+        """
+        context_window = context_window or get_context_window(model_name)
+        answer_reserve = min(int(max_tokens), int(context_window * MAX_ANSWER_SHARE))
+        derived_budget = context_window - answer_reserve - prompt_reserve
+        if derived_budget < MIN_HISTORY_BUDGET:
+            logger.warning(
+                "Context window of %s (%d tokens) leaves %d tokens for history; using %d.",
+                model_name, context_window, derived_budget, MIN_HISTORY_BUDGET
+            )
+            derived_budget = MIN_HISTORY_BUDGET
+        if token_budget and int(token_budget) > 0:
+            derived_budget = min(int(token_budget), derived_budget) if derived_budget else int(token_budget)
+        return cls(derived_budget, **kwargs)
+
+    def count_tokens(self, message):
+        """
+        Count the tokens of a single message, using the per-message cache.
+
+        Args:
+            message: A LangChain message.
+
+        Returns:
+            int: Number of tokens including per-message overhead.
+        """
+        key = _message_digest(message)
+        count = self._token_counts.get(key)
+        if count is None:
+            count = self.token_counter(_message_text(message)) + MESSAGE_TOKEN_OVERHEAD
+            self._token_counts.put(key, count)
+        return count
+
+    @staticmethod
+    def _group_turns(messages):
+        """Group messages so tool results stay with the AI message that called them."""
+        units = []
+        for message in messages:
+            if isinstance(message, ToolMessage) and units and units[-1][-1].type in ("ai", "tool"):
+                units[-1].append(message)
+            else:
+                units.append([message])
+        return units
+
+    def _summarize(self, evicted):
+        """Return the rolling summary for the evicted prefix, extending a cached one."""
+        digests = []
+        digest = b""
+        for message in evicted:
+            digest = _message_digest(message, digest)
+            digests.append(digest)
+
+        summary = self._summaries.get(digests[-1])
+        if summary is not None:
+            return summary
+
+        # Resume from the longest prefix that was already summarized
+        start, previous_summary = 0, ""
+        for index in range(len(digests) - 2, -1, -1):
+            cached = self._summaries.get(digests[index])
+            if cached is not None:
+                start, previous_summary = index + 1, cached
+                break
+
+        summary = self.summarizer(previous_summary, evicted[start:])
+        self._summaries.put(digests[-1], summary)
+        return summary
+
+    def trim(self, messages):
+        """
+        Trim messages to the token budget, keeping the most recent turns.
+
+        Args:
+            messages (list): The conversation history, oldest first.
+
+        Returns:
+            list: The messages to send to the model.
+        """
+        pinned = [m for m in messages if isinstance(m, SystemMessage)]
+        history = [m for m in messages if not isinstance(m, SystemMessage)]
+
+        remaining = self.token_budget - sum(self.count_tokens(m) for m in pinned)
+        units = self._group_turns(history)
+        costs = [sum(self.count_tokens(m) for m in unit) for unit in units]
+        if sum(costs) > remaining:
+            # Turns will be evicted, so leave room for their summary
+            remaining -= self.summary_reserve
+        cutoff = len(units)
+        for index in range(len(units) - 1, -1, -1):
+            if costs[index] > remaining:
+                break
+            remaining -= costs[index]
+            cutoff = index
+
+        # An AI message is only meaningful after the user turn that prompted it
+        while cutoff < len(units) and isinstance(units[cutoff][0], AIMessage):
+            cutoff += 1
+
+        kept = [m for unit in units[cutoff:] for m in unit]
+        evicted = [m for unit in units[:cutoff] for m in unit]
+        if evicted and self.summarizer:
+            summary = self._summarize(evicted)
+            pinned = pinned + [SystemMessage(content=f"Summary of the earlier conversation: {summary}")]
+
+        return pinned + kept
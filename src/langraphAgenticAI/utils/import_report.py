@@ -0,0 +1,73 @@
+"""
+Report which imports dominate the cold start of a module.
+
+Usage:
+    python -m src.langraphAgenticAI.utils.import_report
+    python -m src.langraphAgenticAI.utils.import_report --module src.langraphAgenticAI.graph.graph_builder --top 30
+
+The module is imported in a fresh interpreter with `-X importtime`, so the
+numbers match a cold process start.
+"""
+import argparse
+import subprocess
+import sys
+
+
+def measure_imports(module):
+    """
+    Import a module in a fresh interpreter and collect import timings.
+
+    Args:
+        module (str): The dotted module name to import.
+
+    Returns:
+        list: (cumulative microseconds, self microseconds, module name)
+        tuples, one per imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings.append((int(cumulative_us), int(self_us), name.strip()))
+    return timings
+
+
+def top_level_packages(timings):
+    """Sum the self time of every module per top-level package."""
+    totals = {}
+    for _, self_us, name in timings:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the slowest imports of a module.")
+    parser.add_argument("--module", default="src.langraphAgenticAI.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Number of entries to show")
+    args = parser.parse_args(argv)
+
+    timings = measure_imports(args.module)
+    total = max((cumulative for cumulative, _, _ in timings), default=0)
+    print(f"Importing {args.module}: {total / 1000:.1f} ms, {len(timings)} modules\n")
+
+    print("Slowest packages (self time):")
+    for package, self_us in top_level_packages(timings)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    print("\nSlowest modules (cumulative time):")
+    for cumulative, _, name in sorted(timings, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+LangChain callbacks that admit chat model calls through the rate limiter.
+
+Kept apart from rate_limiter so the limiter and its priorities can be
+imported without loading LangChain.
+"""
+import asyncio
+from langchain_core.callbacks import AsyncCallbackHandler, BaseCallbackHandler
+from src.langraphAgenticAI.utils.rate_limiter import PRIORITY_DEFAULT
+
+# Completion tokens assumed for a request before any answer has been seen
+INITIAL_COMPLETION_ESTIMATE = 256
+
+# Weight of the newest answer in the running average of completion sizes
+COMPLETION_SMOOTHING = 0.2
+
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """
+    Admit chat model calls through the rate limiter.
+
+    Attached to every LLM client, so all invoke/stream calls (from the UI,
+    graph nodes, summarizer or router) go through the same queue. The
+    priority can be set per run with config={"metadata": {"priority": ...}}.
+
+    This handler admits sync runs. Async runs are admitted by its
+    AsyncRateLimitCallbackHandler, which awaits the limiter on the event
+    loop instead of blocking an executor thread; see rate_limit_callbacks.
+
+    The token estimate of a request is its prompt plus the running average
+    of the completions seen so far, capped at max_tokens. Reserving the full
+    max_tokens would let a single request take most of a small TPM budget.
+    """
+
+    # Runs on the event loop thread in async runs, so it can tell them apart
+    # from sync runs; it never blocks there
+    run_inline = True
+    raise_error = True
+
+    def __init__(self, limiter, key, max_tokens=0):
+        """
+        Initialize the handler.
+
+        Args:
+            limiter (RateLimiter): The shared limiter.
+            key (tuple): The (API key hash, model) lane key.
+            max_tokens (int): Completion token limit, capping the estimate.
+        """
+        self.limiter = limiter
+        self.key = key
+        self.max_tokens = max_tokens
+        self.completion_tokens = (
+            min(max_tokens, INITIAL_COMPLETION_ESTIMATE) if max_tokens else INITIAL_COMPLETION_ESTIMATE
+        )
+        self._estimates = {}
+
+    def _estimate(self, messages):
+        chars = sum(len(str(m.content)) for batch in messages for m in batch)
+        return chars // 4 + round(self.completion_tokens)
+
+    def _admission(self, run_id, messages, metadata):
+        """Return (estimate, priority) of a run and mark it as admitted."""
+        estimate = self._estimate(messages)
+        self._estimates[run_id] = estimate
+        return estimate, (metadata or {}).get("priority", PRIORITY_DEFAULT)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            # An async run: AsyncRateLimitCallbackHandler admits it
+            return
+        except RuntimeError:
+            pass
+        estimate, priority = self._admission(run_id, messages, metadata)
+        try:
+            self.limiter.acquire(self.key, estimate, priority)
+        except BaseException:
+            self._estimates.pop(run_id, None)
+            raise
+
+    @staticmethod
+    def _usage(response):
+        """Return (total, completion) tokens reported for a response, or None for unknown values."""
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        total, completion = usage.get("total_tokens"), usage.get("completion_tokens")
+        if total is None:
+            for generations in response.generations:
+                for generation in generations:
+                    message = getattr(generation, "message", None)
+                    if message is not None and getattr(message, "usage_metadata", None):
+                        total = message.usage_metadata.get("total_tokens")
+                        completion = message.usage_metadata.get("output_tokens")
+        return total, completion
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        estimate = self._estimates.pop(run_id, None)
+        if estimate is None:
+            return
+        total, completion = self._usage(response)
+        if completion is not None:
+            average = self.completion_tokens + COMPLETION_SMOOTHING * (completion - self.completion_tokens)
+            self.completion_tokens = min(average, self.max_tokens) if self.max_tokens else average
+        if total is not None:
+            self.limiter.record_usage(self.key, estimate, total)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._estimates.pop(run_id, None)
+
+
+class AsyncRateLimitCallbackHandler(AsyncCallbackHandler):
+    """Admit async chat model runs by awaiting the rate limiter."""
+
+    raise_error = True
+
+    def __init__(self, admission):
+        """
+        Initialize the handler.
+
+        Args:
+            admission (RateLimitCallbackHandler): The client's sync handler,
+                which keeps the estimates and records the actual usage.
+        """
+        self.admission = admission
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        if run_id in self.admission._estimates:
+            # A sync run, already admitted by the sync handler
+            return
+        estimate, priority = self.admission._admission(run_id, messages, metadata)
+        try:
+            await self.admission.limiter.aacquire(self.admission.key, estimate, priority)
+        except BaseException:
+            self.admission._estimates.pop(run_id, None)
+            raise
+
+
+def rate_limit_callbacks(limiter, key, max_tokens=0):
+    """
+    Return the callbacks that route a client's calls through the limiter.
+
+    Args:
+        limiter (RateLimiter): The shared limiter.
+        key (tuple): The (API key hash, model) lane key.
+        max_tokens (int): Completion token limit of the client.
+
+    Returns:
+        list: The sync and async handlers; each admits the runs of its kind.
+    """
+    handler = RateLimitCallbackHandler(limiter, key, max_tokens=max_tokens)
+    return [handler, AsyncRateLimitCallbackHandler(handler)]
@@ -0,0 +1,269 @@
+"""
+Process-wide rate limiting for outbound LLM calls.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+# Priorities: lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BATCH = 2
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, per_minute):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute (float): Refill rate and capacity per minute.
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until amount can be consumed (0 if available now)."""
+        self._refill(now)
+        # Requests larger than the bucket are allowed once it is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, amount):
+        """Give back (positive) or take (negative) tokens after the fact."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _Lane:
+    """Buckets, waiting queue and metrics for one (API key, model) pair."""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.waiters = []
+        self.granted = 0
+        self.waits = deque(maxlen=200)
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter with a fair priority queue per API key and model.
+
+    Each lane enforces requests/minute and tokens/minute. Callers queue by
+    priority and arrival order, so a burst from one session cannot starve
+    requests that were queued earlier, and interactive traffic is served
+    before batch traffic.
+    """
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute (int): Default request limit per lane; 0 disables it.
+            tokens_per_minute (int): Default token limit per lane; 0 disables it.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lanes = {}
+        self._limits = {}
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def configure(self, key, requests_per_minute=None, tokens_per_minute=None):
+        """
+        Set the limits of one lane.
+
+        Args:
+            key (tuple): The (API key hash, model) lane key.
+            requests_per_minute (int): Request limit; None keeps the default.
+            tokens_per_minute (int): Token limit; None keeps the default.
+        """
+        with self._cond:
+            limits = (
+                self.requests_per_minute if requests_per_minute is None else requests_per_minute,
+                self.tokens_per_minute if tokens_per_minute is None else tokens_per_minute
+            )
+            if self._limits.get(key) != limits:
+                self._limits[key] = limits
+                if key in self._lanes:
+                    # Replace the buckets but keep the queued waiters
+                    lane = self._lanes[key]
+                    fresh = _Lane(*limits)
+                    lane.requests, lane.tokens = fresh.requests, fresh.tokens
+                    self._cond.notify_all()
+
+    def _lane(self, key):
+        if key not in self._lanes:
+            rpm, tpm = self._limits.get(key, (self.requests_per_minute, self.tokens_per_minute))
+            self._lanes[key] = _Lane(rpm, tpm)
+        return self._lanes[key]
+
+    def _enqueue(self, key, tokens, priority):
+        with self._cond:
+            waiter = (priority, next(self._sequence), tokens)
+            heapq.heappush(self._lane(key).waiters, waiter)
+            return waiter
+
+    def _try_grant(self, key, waiter):
+        """Grant the waiter if it is first in line and the buckets allow it; else return the wait."""
+        lane = self._lane(key)
+        if lane.waiters[0] is not waiter:
+            return None
+        now = time.monotonic()
+        tokens = waiter[2]
+        wait = max(
+            lane.requests.wait_time(1, now) if lane.requests else 0.0,
+            lane.tokens.wait_time(tokens, now) if lane.tokens else 0.0
+        )
+        if wait > 0:
+            return wait
+        heapq.heappop(lane.waiters)
+        if lane.requests:
+            lane.requests.consume(1)
+        if lane.tokens:
+            lane.tokens.consume(tokens)
+        lane.granted += 1
+        self._cond.notify_all()
+        return 0.0
+
+    def _record_wait(self, key, started):
+        with self._cond:
+            self._lane(key).waits.append(time.monotonic() - started)
+
+    def _abandon(self, key, waiter):
+        with self._cond:
+            lane = self._lane(key)
+            if waiter in lane.waiters:
+                lane.waiters.remove(waiter)
+                heapq.heapify(lane.waiters)
+                self._cond.notify_all()
+
+    def acquire(self, key, tokens=0, priority=PRIORITY_DEFAULT, timeout=None):
+        """
+        Block until a request with the given token estimate may be sent.
+
+        Args:
+            key (tuple): The (API key hash, model) lane key.
+            tokens (int): Estimated tokens of the request.
+            priority (int): Lower values are served first.
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            TimeoutError: If the request could not be admitted in time.
+        """
+        started = time.monotonic()
+        waiter = self._enqueue(key, tokens, priority)
+        try:
+            with self._cond:
+                while True:
+                    wait = self._try_grant(key, waiter)
+                    if wait == 0.0:
+                        break
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - started)
+                        if remaining <= 0:
+                            raise TimeoutError("Timed out waiting for the LLM rate limiter.")
+                        wait = min(wait, remaining) if wait else remaining
+                    # Woken early when the head of the queue changes
+                    self._cond.wait(wait)
+        except BaseException:
+            self._abandon(key, waiter)
+            raise
+        self._record_wait(key, started)
+        return time.monotonic() - started
+
+    async def aacquire(self, key, tokens=0, priority=PRIORITY_DEFAULT, timeout=None):
+        """Async variant of acquire that waits without blocking the event loop."""
+        started = time.monotonic()
+        waiter = self._enqueue(key, tokens, priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_grant(key, waiter)
+                if wait == 0.0:
+                    break
+                if timeout is not None and time.monotonic() - started >= timeout:
+                    raise TimeoutError("Timed out waiting for the LLM rate limiter.")
+                # Poll, since threads releasing the lock cannot wake a coroutine
+                await asyncio.sleep(min(wait or 0.05, 0.05))
+        except BaseException:
+            self._abandon(key, waiter)
+            raise
+        self._record_wait(key, started)
+        return time.monotonic() - started
+
+    def record_usage(self, key, estimated_tokens, actual_tokens):
+        """
+        Correct the token bucket once the real usage of a request is known.
+
+        Args:
+            key (tuple): The lane key.
+            estimated_tokens (int): Tokens consumed at admission.
+            actual_tokens (int): Tokens actually used.
+        """
+        with self._cond:
+            lane = self._lane(key)
+            if lane.tokens:
+                lane.tokens.adjust(estimated_tokens - actual_tokens)
+            self._cond.notify_all()
+
+    def metrics(self):
+        """
+        Return queue depth and wait time metrics per lane.
+
+        Returns:
+            dict: Lane key -> metrics.
+        """
+        with self._cond:
+            result = {}
+            for key, lane in self._lanes.items():
+                waits = list(lane.waits)
+                result[key] = {
+                    'queue_depth': len(lane.waiters),
+                    'granted': lane.granted,
+                    'avg_wait': sum(waits) / len(waits) if waits else 0.0,
+                    'max_wait': max(waits) if waits else 0.0
+                }
+            return result
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter(requests_per_minute=0, tokens_per_minute=0):
+    """
+    Return the process-wide rate limiter, creating it on first use.
+
+    Args:
+        requests_per_minute (int): Default request limit per lane.
+        tokens_per_minute (int): Default token limit per lane.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        return _rate_limiter
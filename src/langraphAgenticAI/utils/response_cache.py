@@ -0,0 +1,190 @@
+"""
+Exact-match LLM response cache with an in-memory and an on-disk tier.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from src.langraphAgenticAI.utils.cache import LRUCache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    """Normalize a prompt so insignificant whitespace does not change the key."""
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+
+def hash_history(messages):
+    """
+    Hash a list of LangChain messages.
+
+    Args:
+        messages (list): The chat history.
+
+    Returns:
+        str: A digest of the message types and contents.
+    """
+    digest = hashlib.sha256()
+    for message in messages or []:
+        digest.update(message.type.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json.dumps(message.content, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_cache_key(prompt, history=None, model=None, **params):
+    """
+    Build a deterministic cache key for an LLM request.
+
+    Args:
+        prompt (str): The user prompt.
+        history (list): The chat history sent with the prompt.
+        model (str): The model name.
+        **params: Sampling parameters (temperature, max_tokens, ...).
+
+    Returns:
+        str: The cache key.
+    """
+    payload = json.dumps({
+        "prompt": normalize_prompt(prompt),
+        "history": hash_history(history),
+        "model": model,
+        "params": params
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteResponseStore:
+    """A small key/value table in SQLite that survives process restarts."""
+
+    def __init__(self, db_path):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+class ResponseCache:
+    """
+    Deterministic response cache keyed by build_cache_key().
+
+    Lookups hit the in-memory LRU first and fall back to the SQLite tier,
+    promoting disk hits into memory.
+    """
+
+    def __init__(self, memory_size=512, db_path=None):
+        """
+        Initialize the response cache.
+
+        Args:
+            memory_size (int): Number of responses kept in memory.
+            db_path (str): Path of the SQLite tier. None keeps the cache in
+                memory only.
+        """
+        self.memory = LRUCache(maxsize=memory_size, name="responses")
+        self.store = SQLiteResponseStore(db_path) if db_path else None
+        self.disk_hits = 0
+
+    @staticmethod
+    def is_cacheable(temperature, opt_in=False):
+        """
+        Decide whether responses for these settings may be cached.
+
+        Only deterministic (temperature 0) requests are cached unless the
+        caller explicitly opts in.
+
+        Args:
+            temperature (float): The sampling temperature.
+            opt_in (bool): Cache even when sampling is not deterministic.
+
+        Returns:
+            bool: True if responses may be cached.
+        """
+        return opt_in or float(temperature) == 0.0
+
+    def get(self, key):
+        """Return the cached response for key, or None."""
+        value = self.memory.get(key)
+        if value is None and self.store:
+            value = self.store.get(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """Cache a response in both tiers."""
+        self.memory.put(key, value)
+        if self.store:
+            self.store.put(key, value)
+
+    def stats(self):
+        """Return hit/miss counters for the cache."""
+        stats = self.memory.stats()
+        # Memory misses that were served from disk count as hits
+        stats['hits'] += self.disk_hits
+        stats['misses'] -= self.disk_hits
+        stats['disk_hits'] = self.disk_hits
+        total = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / total if total else 0.0
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(db_path=None, memory_size=512):
+    """
+    Return the process-wide response cache for a database path.
+
+    Args:
+        db_path (str): Path of the SQLite tier, or None for memory only.
+        memory_size (int): Number of responses kept in memory.
+
+    Returns:
+        ResponseCache: The shared cache instance.
+    """
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = ResponseCache(memory_size=memory_size, db_path=db_path)
+        return _caches[db_path]
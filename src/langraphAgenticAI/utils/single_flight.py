@@ -0,0 +1,216 @@
+"""
+Single-flight execution: concurrent identical requests share one upstream call.
+"""
+import asyncio
+import threading
+from src.langraphAgenticAI.utils.concurrency import get_executor
+
+# Threads running the shared calls of the synchronous API
+FLIGHT_POOL_WORKERS = 32
+
+
+class _Flight:
+    """The shared output of one in-flight call."""
+
+    def __init__(self):
+        # Created with the flight so followers can wait on it right away;
+        # async flights replace it with an asyncio.Condition in _join
+        self.condition = threading.Condition()
+        self.items = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.cancelled = False
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the call in the background; callers
+    arriving while it is in flight subscribe to it. Every subscriber gets
+    all items from the start, so late joiners replay what was already
+    produced and then follow live. Once the call finishes the key is
+    released: nothing is cached, only in-flight work is shared. If every
+    subscriber goes away, the call is cancelled.
+
+    Followers can be handed a modified copy of each item through
+    follower_copy, e.g. without the leader's token usage, so work done once
+    is not accounted for once per subscriber.
+    """
+
+    def __init__(self, name="single_flight"):
+        """
+        Initialize the coalescer.
+
+        Args:
+            name (str): Name used when reporting stats.
+        """
+        self.name = name
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def _join(self, key, is_async=False):
+        """Return (flight, is_leader) for a key, creating the flight if needed."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                if is_async:
+                    flight.condition = asyncio.Condition()
+                self._flights[key] = flight
+                self.leaders += 1
+            else:
+                self.followers += 1
+            flight.subscribers += 1
+            return flight, leader
+
+    def _release(self, key, flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def _leave(self, key, flight):
+        """
+        Drop a subscriber.
+
+        Returns:
+            bool: True if it was the last subscriber of an unfinished call,
+            which is then released so new callers start a fresh one.
+        """
+        with self._lock:
+            flight.subscribers -= 1
+            abandoned = flight.subscribers == 0 and not flight.done
+            if abandoned and self._flights.get(key) is flight:
+                del self._flights[key]
+            return abandoned
+
+    async def astream(self, key, factory, follower_copy=None):
+        """
+        Run factory() once per key among concurrent callers and stream its items.
+
+        Args:
+            key: A hashable key identifying identical requests.
+            factory: Zero-argument callable returning an async iterable.
+            follower_copy: Optional callable applied to the items handed to
+                callers that joined an existing call.
+
+        Yields:
+            The items produced by the shared call.
+        """
+        loop = asyncio.get_running_loop()
+        # Flights are shared only within one event loop
+        key = ("async", id(loop), key)
+        flight, leader = self._join(key, is_async=True)
+        if leader:
+            flight.task = loop.create_task(self._aproduce(key, flight, factory))
+
+        index = 0
+        try:
+            while True:
+                async with flight.condition:
+                    while index >= len(flight.items) and not flight.done:
+                        await flight.condition.wait()
+                    items = flight.items[index:]
+                    done = flight.done
+                for item in items:
+                    yield item if leader or follower_copy is None else follower_copy(item)
+                index += len(items)
+                if done and index >= len(flight.items):
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+        finally:
+            if self._leave(key, flight):
+                flight.task.cancel()
+
+    async def _aproduce(self, key, flight, factory):
+        try:
+            async for item in factory():
+                async with flight.condition:
+                    flight.items.append(item)
+                    flight.condition.notify_all()
+        except BaseException as e:
+            flight.error = e
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            self._release(key, flight)
+            async with flight.condition:
+                flight.done = True
+                flight.condition.notify_all()
+
+    def stream(self, key, factory, follower_copy=None):
+        """
+        Synchronous variant of astream; the shared call runs on a process-wide thread pool.
+
+        Args:
+            key: A hashable key identifying identical requests.
+            factory: Zero-argument callable returning an iterable.
+            follower_copy: Optional callable applied to the items handed to
+                callers that joined an existing call.
+
+        Yields:
+            The items produced by the shared call.
+        """
+        key = ("sync", key)
+        flight, leader = self._join(key)
+        if leader:
+            get_executor("single_flight", FLIGHT_POOL_WORKERS).submit(self._produce, key, flight, factory)
+
+        index = 0
+        try:
+            while True:
+                with flight.condition:
+                    while index >= len(flight.items) and not flight.done:
+                        flight.condition.wait()
+                    items = flight.items[index:]
+                    done = flight.done
+                for item in items:
+                    yield item if leader or follower_copy is None else follower_copy(item)
+                index += len(items)
+                if done and index >= len(flight.items):
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+        finally:
+            if self._leave(key, flight):
+                flight.cancelled = True
+
+    def _produce(self, key, flight, factory):
+        try:
+            # Every subscriber may have left while the call waited for a thread
+            if flight.cancelled:
+                return
+            for item in factory():
+                if flight.cancelled:
+                    break
+                with flight.condition:
+                    flight.items.append(item)
+                    flight.condition.notify_all()
+        except Exception as e:
+            flight.error = e
+        finally:
+            self._release(key, flight)
+            with flight.condition:
+                flight.done = True
+                flight.condition.notify_all()
+
+    def stats(self):
+        """Return leader/follower counters and the number of calls in flight."""
+        with self._lock:
+            total = self.leaders + self.followers
+            return {
+                'name': self.name,
+                'in_flight': len(self._flights),
+                'leaders': self.leaders,
+                'followers': self.followers,
+                'coalesced_rate': self.followers / total if total else 0.0
+            }
+
+
+# Process-wide coalescer for LLM calls
+llm_flights = SingleFlight(name="llm_requests")
@@ -0,0 +1,49 @@
+"""
+Splitting text into overlapping chunks.
+"""
+
+
+def chunk_stream(blocks, chunk_chars=1000, overlap=200):
+    """
+    Split a stream of text blocks into overlapping chunks.
+
+    Chunks end at the last whitespace before chunk_chars where possible, so
+    words are not cut in half.
+
+    Args:
+        blocks: Iterable of text blocks.
+        chunk_chars (int): Maximum characters per chunk.
+        overlap (int): Characters repeated at the start of the next chunk.
+
+    Yields:
+        str: The chunks.
+    """
+    if overlap >= chunk_chars // 2:
+        raise ValueError("overlap must be less than half of chunk_chars.")
+    buffer = ""
+    for block in blocks:
+        buffer += block
+        while len(buffer) >= chunk_chars:
+            cut = buffer.rfind(" ", chunk_chars // 2, chunk_chars)
+            cut = cut if cut > 0 else chunk_chars
+            chunk = buffer[:cut].strip()
+            if chunk:
+                yield chunk
+            buffer = buffer[max(cut - overlap, 1):]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def split_text(text, chunk_chars=1000, overlap=200):
+    """
+    Split a string into overlapping chunks.
+
+    Args:
+        text (str): The text.
+        chunk_chars (int): Maximum characters per chunk.
+        overlap (int): Characters repeated at the start of the next chunk.
+
+    Returns:
+        list: The chunks.
+    """
+    return list(chunk_stream([text], chunk_chars, overlap))
@@ -0,0 +1,404 @@
+"""
+Latency tracing for graph runs.
+
+Spans are plain dicts using OpenTelemetry's JSON field names (traceId, spanId,
+parentSpanId, startTimeUnixNano, ...) so the JSONL export can be loaded by
+OTel-compatible tooling.
+"""
+import atexit
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+def new_id():
+    """Return a new random span/trace id."""
+    return uuid.uuid4().hex[:16]
+
+
+def run_span_id(run_id):
+    """Return the span id of a LangChain run (the random end of its UUID)."""
+    return run_id.hex[-16:]
+
+
+class JsonlSpanSink:
+    """
+    Append finished spans to a JSONL file.
+
+    Spans are queued and written by a background thread, which appends
+    everything queued since its last write in one go, so recording a span
+    never waits for the disk.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="span-writer", daemon=True)
+        self._thread.start()
+        # Write spans still queued on shutdown
+        atexit.register(self.flush)
+
+    def export(self, span):
+        self._queue.put(span)
+
+    def flush(self, timeout=5.0):
+        """Wait until the spans exported so far are written."""
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait(timeout)
+
+    def _write_loop(self):
+        while True:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [json.dumps(item, default=str) + "\n" for item in items if isinstance(item, dict)]
+            try:
+                if lines:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.writelines(lines)
+            except OSError:
+                # Tracing must never break a user turn
+                pass
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+
+class InMemorySpanSink:
+    """Keep the most recent spans in memory for the UI."""
+
+    def __init__(self, maxlen=2000):
+        self.spans = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def get_trace(self, trace_id):
+        """Return the spans of one trace, oldest first."""
+        with self._lock:
+            return [span for span in self.spans if span["traceId"] == trace_id]
+
+
+class Tracer:
+    """Record spans and hand them to the configured sinks."""
+
+    def __init__(self, sinks=None):
+        self.memory = InMemorySpanSink()
+        self.sinks = [self.memory] + list(sinks or [])
+
+    def record(self, name, kind, start_ns, end_ns, trace_id, span_id=None,
+               parent_id=None, attributes=None):
+        """
+        Record a finished span.
+
+        Args:
+            name (str): Span name (node, model or tool name).
+            kind (str): One of "turn", "node", "prompt", "llm", "tool".
+            start_ns (int): Start time in nanoseconds since the epoch.
+            end_ns (int): End time in nanoseconds since the epoch.
+            trace_id (str): The trace (turn) the span belongs to.
+            span_id (str): The span id; generated if None.
+            parent_id (str): The parent span id, if any.
+            attributes (dict): Extra attributes such as token counts.
+
+        Returns:
+            dict: The recorded span.
+        """
+        span = {
+            "traceId": trace_id,
+            "spanId": span_id or new_id(),
+            "parentSpanId": parent_id,
+            "name": name,
+            "kind": kind,
+            "startTimeUnixNano": start_ns,
+            "endTimeUnixNano": end_ns,
+            "durationMs": (end_ns - start_ns) / 1e6,
+            "attributes": attributes or {}
+        }
+        for sink in self.sinks:
+            try:
+                sink.export(span)
+            except Exception:
+                # Tracing must never break a user turn
+                pass
+        return span
+
+    @contextmanager
+    def span(self, name, kind, trace_id, span_id=None, parent_id=None, attributes=None):
+        """
+        Time a block of code as a span.
+
+        Yields:
+            dict: The attributes dict, which the block may add to.
+        """
+        attributes = dict(attributes or {})
+        start = time.time_ns()
+        try:
+            yield attributes
+        finally:
+            self.record(name, kind, start, time.time_ns(), trace_id,
+                        span_id=span_id, parent_id=parent_id, attributes=attributes)
+
+    def get_trace(self, trace_id):
+        """Return the recorded spans of a trace."""
+        return self.memory.get_trace(trace_id)
+
+
+class LatencyCallbackHandler(BaseCallbackHandler):
+    """
+    Record prompt formatting, LLM (with time-to-first-token and token counts)
+    and tool spans from LangChain callbacks.
+
+    The trace id is read from the run metadata ("trace_id"), which is set by
+    traced_config(). Span ids are derived from LangChain run ids, and each
+    span's parent is its nearest ancestor run that is recorded as a span:
+    an LLM call made by a graph node is a child of that node's span.
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self._runs = {}
+        # Parent of every open run, and the open runs that are spans
+        self._parents = {}
+        self._spanned = set()
+
+    def _enter(self, run_id, parent_run_id, spanned=False):
+        self._parents[run_id] = parent_run_id
+        if spanned:
+            self._spanned.add(run_id)
+
+    def _exit(self, run_id):
+        self._parents.pop(run_id, None)
+        self._spanned.discard(run_id)
+
+    def _parent_span_id(self, run_id):
+        parent = self._parents.get(run_id)
+        while parent is not None and parent not in self._spanned:
+            parent = self._parents.get(parent)
+        return run_span_id(parent) if parent is not None else None
+
+    def _start(self, run_id, parent_run_id, name, kind, metadata):
+        self._enter(run_id, parent_run_id, spanned=True)
+        self._runs[run_id] = {
+            "name": name,
+            "kind": kind,
+            "start": time.time_ns(),
+            "trace_id": (metadata or {}).get("trace_id") or "untraced",
+            "first_token": None,
+            "attributes": {}
+        }
+
+    def _end(self, run_id, **attributes):
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            self._exit(run_id)
+            return
+        run["attributes"].update(attributes)
+        if run["first_token"] is not None:
+            run["attributes"]["ttft_ms"] = (run["first_token"] - run["start"]) / 1e6
+        parent_id = self._parent_span_id(run_id)
+        self._exit(run_id)
+        self.tracer.record(run["name"], run["kind"], run["start"], time.time_ns(),
+                           run["trace_id"], span_id=run_span_id(run_id), parent_id=parent_id,
+                           attributes=run["attributes"])
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "")
+        if "PromptTemplate" in name:
+            self._start(run_id, parent_run_id, name, "prompt", metadata)
+        else:
+            # Graph node runs are recorded by traced_node under the run's span id
+            self._enter(run_id, parent_run_id, spanned=(metadata or {}).get("langgraph_node") == name)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=str(error))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        name = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name", "llm")
+        self._start(run_id, parent_run_id, name, "llm", metadata)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None and run["first_token"] is None:
+            run["first_token"] = time.time_ns()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        attributes = {}
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    attributes["input_tokens"] = usage.get("input_tokens", 0)
+                    attributes["output_tokens"] = usage.get("output_tokens", 0)
+        self._end(run_id, **attributes)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=str(error))
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self._start(run_id, parent_run_id, (serialized or {}).get("name", "tool"), "tool", metadata)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=str(error))
+
+
+def _trace_id(config):
+    return ((config or {}).get("metadata") or {}).get("trace_id") or "untraced"
+
+
+def _node_span_id(config):
+    """Return the span id of the node run a LangGraph config belongs to, if known."""
+    run_id = getattr((config or {}).get("callbacks"), "parent_run_id", None)
+    return run_span_id(run_id) if run_id else None
+
+
+def traced_node(name, func, tracer=None):
+    """
+    Wrap a graph node so each call is recorded as a "node" span.
+
+    Works for sync and async node functions; the LangGraph config is passed
+    on to the wrapped function if it accepts it.
+
+    Args:
+        name (str): The node name.
+        func: The node function.
+        tracer (Tracer): The tracer; defaults to the process-wide tracer.
+
+    Returns:
+        The wrapped function.
+    """
+    accepts_config = "config" in inspect.signature(func).parameters
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state, config=None):
+            with (tracer or get_tracer()).span(name, "node", _trace_id(config), _node_span_id(config)):
+                if accepts_config:
+                    return await func(state, config=config)
+                return await func(state)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state, config=None):
+        with (tracer or get_tracer()).span(name, "node", _trace_id(config), _node_span_id(config)):
+            if accepts_config:
+                return func(state, config=config)
+            return func(state)
+    return wrapper
+
+
+def traced_config(tracer=None, config=None):
+    """
+    Return a run config that traces the run under a new trace id.
+
+    Args:
+        tracer (Tracer): The tracer; defaults to the process-wide tracer.
+        config (dict): An existing config to extend.
+
+    Returns:
+        tuple: (config, trace_id).
+    """
+    tracer = tracer or get_tracer()
+    trace_id = new_id()
+    config = dict(config or {})
+    config["metadata"] = {**(config.get("metadata") or {}), "trace_id": trace_id}
+    config["callbacks"] = list(config.get("callbacks") or []) + [LatencyCallbackHandler(tracer)]
+    return config, trace_id
+
+
+def traced_stream(chunks, trace_id, name="turn", tracer=None):
+    """
+    Record a "turn" span, with time to first chunk, around a response stream.
+
+    Args:
+        chunks: Iterable of response chunks.
+        trace_id (str): The trace id of the turn.
+        name (str): The span name.
+        tracer (Tracer): The tracer; defaults to the process-wide tracer.
+
+    Yields:
+        The chunks, unchanged.
+    """
+    tracer = tracer or get_tracer()
+    start = time.time_ns()
+    first = None
+    try:
+        for chunk in chunks:
+            if first is None:
+                first = time.time_ns()
+            yield chunk
+    finally:
+        attributes = {"ttft_ms": (first - start) / 1e6} if first else {}
+        tracer.record(name, "turn", start, time.time_ns(), trace_id, attributes=attributes)
+
+
+def latency_breakdown(spans):
+    """
+    Summarize the spans of one turn.
+
+    Args:
+        spans (list): The spans of a trace.
+
+    Returns:
+        dict: Total, time to first token, per-kind totals, token counts and
+        graph overhead (turn time not spent in nodes), in milliseconds.
+    """
+    turn = next((span for span in spans if span["kind"] == "turn"), None)
+    breakdown = {"total_ms": turn["durationMs"] if turn else None,
+                 "ttft_ms": turn["attributes"].get("ttft_ms") if turn else None,
+                 "nodes": {}, "kinds": {}, "input_tokens": 0, "output_tokens": 0}
+    for span in spans:
+        if span["kind"] == "turn":
+            continue
+        breakdown["kinds"][span["kind"]] = breakdown["kinds"].get(span["kind"], 0.0) + span["durationMs"]
+        if span["kind"] == "node":
+            breakdown["nodes"][span["name"]] = breakdown["nodes"].get(span["name"], 0.0) + span["durationMs"]
+        breakdown["input_tokens"] += span["attributes"].get("input_tokens", 0)
+        breakdown["output_tokens"] += span["attributes"].get("output_tokens", 0)
+    if turn:
+        breakdown["overhead_ms"] = max(turn["durationMs"] - breakdown["kinds"].get("node", 0.0), 0.0)
+    return breakdown
+
+
+_tracers = {}
+_tracer_lock = threading.Lock()
+
+
+def get_tracer(trace_file=None):
+    """
+    Return the process-wide tracer for a trace file, creating it on first use.
+
+    Args:
+        trace_file (str): JSONL file spans are exported to; None keeps spans
+            in memory only.
+
+    Returns:
+        Tracer: The shared tracer.
+    """
+    with _tracer_lock:
+        if trace_file not in _tracers:
+            _tracers[trace_file] = Tracer([JsonlSpanSink(trace_file)] if trace_file else None)
+        return _tracers[trace_file]
@@ -0,0 +1,304 @@
+"""
+On-disk document index for retrieval-augmented generation.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import faiss
+import numpy as np
+from src.langraphAgenticAI.vectorstore.embeddings import HashingEmbedder, embed_to_array
+
+# HNSW graph degree and search breadth of new shards
+HNSW_NEIGHBORS = 32
+HNSW_EF_SEARCH = 64
+
+
+def _read_shard(path):
+    """Open a FAISS shard memory-mapped, falling back to a normal read."""
+    try:
+        return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        # Older FAISS builds only support mmap for some index types
+        return faiss.read_index(path)
+
+
+class DocumentIndex:
+    """
+    A sharded FAISS index of document chunks with the chunk texts in SQLite.
+
+    Vectors are written to fixed-size shard files, so ingestion never holds
+    more than one shard in memory and the corpus can be larger than RAM.
+    Shards are HNSW graphs, so a query visits a small part of each shard
+    instead of scanning every vector. Searches open the shards memory-mapped
+    and merge their top hits; the OS page cache keeps the hot parts
+    resident. Chunk texts and source fingerprints live in SQLite, so
+    re-ingesting a directory only embeds files that changed.
+    """
+
+    def __init__(self, index_dir, embedder=None, shard_size=20000):
+        """
+        Open (or create) the index.
+
+        Args:
+            index_dir (str): Directory holding the shards and the chunk database.
+            embedder: A LangChain Embeddings implementation. Defaults to the
+                offline HashingEmbedder; queries must use the same embedder
+                as ingestion.
+            shard_size (int): Maximum vectors per shard file.
+        """
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_dir = index_dir
+        self.embedder = embedder or HashingEmbedder()
+        self.shard_size = shard_size
+        self._lock = threading.RLock()
+        self._pending_vectors = []
+        self._pending_ids = []
+        self._pending_sources = []
+        self._shards = []
+        self._manifest_version = None
+
+        self._conn = sqlite3.connect(os.path.join(index_dir, "chunks.sqlite"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "path TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id INTEGER PRIMARY KEY, source TEXT NOT NULL, position INTEGER NOT NULL, "
+            "text TEXT NOT NULL, deleted INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS chunks_source ON chunks (source)")
+        self._conn.commit()
+
+    # Ingestion
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.index_dir, "manifest.json")
+
+    def _read_manifest(self):
+        if not os.path.exists(self._manifest_path):
+            return {"shards": [], "version": 0}
+        with open(self._manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        manifest["version"] += 1
+        with open(self._manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(self._manifest_path + ".tmp", self._manifest_path)
+
+    def is_current(self, source, fingerprint):
+        """Return True if the source was already ingested with this fingerprint."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint FROM sources WHERE path = ?", (source,)
+            ).fetchone()
+        return row is not None and row[0] == fingerprint
+
+    def delete_source(self, source):
+        """
+        Remove a source's chunks from search results.
+
+        The vectors stay in their shard and are filtered out at query time.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE chunks SET deleted = 1 WHERE source = ?", (source,))
+            self._conn.execute("DELETE FROM sources WHERE path = ?", (source,))
+            self._conn.commit()
+
+    def add_chunks(self, source, chunks, start_position=0):
+        """
+        Embed and add a batch of chunks of one source.
+
+        Args:
+            source (str): The source document path.
+            chunks (list): The chunk texts.
+            start_position (int): Position of the first chunk in the source.
+        """
+        if not chunks:
+            return
+        vectors = embed_to_array(self.embedder, chunks)
+        with self._lock:
+            ids = []
+            for offset, text in enumerate(chunks):
+                cursor = self._conn.execute(
+                    "INSERT INTO chunks (source, position, text) VALUES (?, ?, ?)",
+                    (source, start_position + offset, text)
+                )
+                ids.append(cursor.lastrowid)
+            self._conn.commit()
+            self._pending_vectors.append(vectors)
+            self._pending_ids.append(np.asarray(ids, dtype=np.int64))
+            if sum(len(batch) for batch in self._pending_ids) >= self.shard_size:
+                self.flush()
+
+    def mark_source(self, source, fingerprint):
+        """
+        Record that a source was fully ingested.
+
+        The fingerprint is only stored once the source's vectors are written
+        to a shard, so an interrupted run re-ingests the source instead of
+        skipping it with vectors missing.
+        """
+        with self._lock:
+            self._pending_sources.append((source, fingerprint))
+            if not self._pending_ids:
+                self._commit_sources()
+
+    def _commit_sources(self):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sources (path, fingerprint, updated) VALUES (?, ?, ?)",
+            [(source, fingerprint, time.time()) for source, fingerprint in self._pending_sources]
+        )
+        self._conn.commit()
+        self._pending_sources = []
+
+    def flush(self):
+        """Write pending vectors to shard files."""
+        with self._lock:
+            if not self._pending_ids:
+                return
+            vectors = np.concatenate(self._pending_vectors)
+            ids = np.concatenate(self._pending_ids)
+            self._pending_vectors, self._pending_ids = [], []
+
+            manifest = self._read_manifest()
+            start = 0
+            while start < len(ids):
+                # Top up the last shard before starting a new one
+                if manifest["shards"] and manifest["shards"][-1]["size"] < self.shard_size:
+                    shard = manifest["shards"][-1]
+                    index = faiss.read_index(os.path.join(self.index_dir, shard["file"]))
+                else:
+                    shard = {"file": f"shard-{len(manifest['shards']):05d}.faiss", "size": 0}
+                    manifest["shards"].append(shard)
+                    index = faiss.IndexIDMap2(
+                        faiss.IndexHNSWFlat(vectors.shape[1], HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT)
+                    )
+
+                end = min(start + self.shard_size - shard["size"], len(ids))
+                index.add_with_ids(vectors[start:end], ids[start:end])
+                path = os.path.join(self.index_dir, shard["file"])
+                # Write to a temporary file so readers never see a torn shard
+                faiss.write_index(index, path + ".tmp")
+                os.replace(path + ".tmp", path)
+                shard["size"] = index.ntotal
+                start = end
+            self._write_manifest(manifest)
+            self._commit_sources()
+
+    # Retrieval
+
+    def _load_shards(self):
+        """(Re)open the shards if the manifest changed since the last search."""
+        try:
+            stat = os.stat(self._manifest_path)
+        except FileNotFoundError:
+            return []
+        # The manifest is replaced on every write, so its inode changes too
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if version != self._manifest_version:
+                self._shards = [
+                    _read_shard(os.path.join(self.index_dir, shard["file"]))
+                    for shard in self._read_manifest()["shards"]
+                ]
+                self._manifest_version = version
+            return self._shards
+
+    @staticmethod
+    def _search_shards(shards, vector, fetch, min_score):
+        """Return the best (score, id) hits over all shards, and whether more exist."""
+        hits = []
+        truncated = False
+        for index in shards:
+            count = min(fetch, index.ntotal)
+            truncated = truncated or count < index.ntotal
+            params = faiss.SearchParametersHNSW(efSearch=max(HNSW_EF_SEARCH, count))
+            try:
+                scores, ids = index.search(vector, count, params=params)
+            except (RuntimeError, TypeError):
+                # Shards written before HNSW was used are flat indexes
+                scores, ids = index.search(vector, count)
+            hits.extend(
+                (float(score), int(chunk_id))
+                for score, chunk_id in zip(scores[0], ids[0])
+                if chunk_id >= 0 and score >= min_score
+            )
+        hits.sort(reverse=True)
+        return hits[:fetch], truncated or len(hits) > fetch
+
+    def search(self, query, k=4, min_score=0.0):
+        """
+        Return the chunks most similar to a query.
+
+        Shards are searched without holding the index lock, so queries run
+        concurrently with each other and with ingestion.
+
+        Args:
+            query (str): The query text.
+            k (int): Number of chunks to return.
+            min_score (float): Minimum cosine similarity.
+
+        Returns:
+            list: {"text", "source", "score"} dicts, best first.
+        """
+        vector = embed_to_array(self.embedder, [query])
+        shards = self._load_shards()
+        # Over-fetch so deleted chunks can be filtered out, and fetch more
+        # while deleted chunks leave fewer than k results
+        fetch = k * 2
+        while True:
+            hits, truncated = self._search_shards(shards, vector, fetch, min_score)
+            if not hits:
+                return []
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, source, text FROM chunks WHERE deleted = 0 AND id IN ({','.join('?' * len(hits))})",
+                    [chunk_id for _, chunk_id in hits]
+                ).fetchall()
+            if len(rows) >= k or not truncated:
+                break
+            fetch *= 4
+        by_id = {row[0]: row for row in rows}
+        results = []
+        for score, chunk_id in hits:
+            if chunk_id in by_id:
+                _, source, text = by_id[chunk_id]
+                results.append({"text": text, "source": source, "score": score})
+                if len(results) == k:
+                    break
+        return results
+
+    def stats(self):
+        """Return the number of live chunks, sources and shards."""
+        with self._lock:
+            chunks = self._conn.execute("SELECT COUNT(*) FROM chunks WHERE deleted = 0").fetchone()[0]
+            sources = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        return {'name': 'documents', 'chunks': chunks, 'sources': sources,
+                'shards': len(self._read_manifest()["shards"])}
+
+
+_document_indexes = {}
+_document_indexes_lock = threading.Lock()
+
+
+def get_document_index(index_dir):
+    """
+    Return the process-wide document index for a directory.
+
+    Args:
+        index_dir (str): The index directory.
+
+    Returns:
+        DocumentIndex: The shared index.
+    """
+    with _document_indexes_lock:
+        if index_dir not in _document_indexes:
+            _document_indexes[index_dir] = DocumentIndex(index_dir)
+        return _document_indexes[index_dir]
@@ -0,0 +1,80 @@
+"""
+Local embedders for the vector store.
+"""
+import hashlib
+import re
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbedder(Embeddings):
+    """
+    A dependency-free embedder based on feature hashing.
+
+    Words and character trigrams are hashed into a fixed number of signed
+    buckets and the result is L2-normalized, so inner product equals cosine
+    similarity. It needs no model download or network access, which makes it
+    a good default for caching near-duplicate prompts. Any LangChain
+    Embeddings implementation can be used instead.
+    """
+
+    def __init__(self, dim=512):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim (int): Dimension of the produced vectors.
+        """
+        self.dim = dim
+
+    def _features(self, text):
+        """Yield the hashed features of a text."""
+        words = _WORD_RE.findall(text.lower())
+        for word in words:
+            yield word
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3]
+
+    def _embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dim] += sign
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_documents(self, texts):
+        """Embed a list of texts."""
+        return [self._embed(text).tolist() for text in texts]
+
+    def embed_query(self, text):
+        """Embed a single text."""
+        return self._embed(text).tolist()
+
+
+def embed_to_array(embedder, texts):
+    """
+    Embed texts into a normalized float32 matrix suitable for FAISS.
+
+    Args:
+        embedder: A LangChain Embeddings implementation.
+        texts (list): The texts to embed.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(texts), dim).
+    """
+    if isinstance(embedder, HashingEmbedder):
+        vectors = np.stack([embedder._embed(text) for text in texts])
+    else:
+        vectors = np.asarray(embedder.embed_documents(texts), dtype=np.float32)
+    # Normalize so inner-product search returns cosine similarity
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms, dtype=np.float32)
@@ -0,0 +1,258 @@
+"""
+Semantic response cache backed by FAISS.
+"""
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import faiss
+import numpy as np
+from src.langraphAgenticAI.vectorstore.embeddings import HashingEmbedder, embed_to_array
+
+
+class _Namespace:
+    """The FAISS index and cached answers for one model/parameter combination."""
+
+    def __init__(self, dim):
+        # IDMap2 supports removing vectors by id, which TTL eviction needs
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.entries = {}
+        self.next_id = 0
+        self.dirty = False
+
+
+class SemanticCache:
+    """
+    Serve cached answers for prompts that are near-duplicates of earlier ones.
+
+    Prompts are embedded and searched in a per-namespace FAISS inner-product
+    index. A namespace identifies the model and sampling parameters, so an
+    answer is only reused for the configuration that produced it.
+    """
+
+    def __init__(self, embedder=None, threshold=0.92, ttl_seconds=None,
+                 max_entries=10000, persist_dir=None, autosave_every=20):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embedder: A LangChain Embeddings implementation. Defaults to the
+                offline HashingEmbedder.
+            threshold (float): Minimum cosine similarity for a cache hit.
+            ttl_seconds (float): Entries older than this are evicted. None
+                keeps entries until max_entries is reached.
+            max_entries (int): Maximum entries per namespace; the oldest are
+                evicted first.
+            persist_dir (str): Directory the indexes are saved to and loaded
+                from. None keeps the cache in memory only.
+            autosave_every (int): Save a namespace after this many new entries.
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persist_dir = persist_dir
+        self.autosave_every = autosave_every
+        self._namespaces = {}
+        self._pending_saves = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def namespace_key(*parts):
+        """
+        Build a namespace key from model name and parameters.
+
+        Args:
+            *parts: Values identifying the model configuration.
+
+        Returns:
+            str: A short stable key.
+        """
+        raw = json.dumps([str(part) for part in parts])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def _paths(self, namespace):
+        base = os.path.join(self.persist_dir, namespace)
+        return base + ".faiss", base + ".json"
+
+    def _get_namespace(self, namespace, dim=None):
+        """Return the namespace, loading it from disk or creating it if needed."""
+        ns = self._namespaces.get(namespace)
+        if ns is not None:
+            return ns
+
+        if self.persist_dir:
+            index_path, meta_path = self._paths(namespace)
+            if os.path.exists(index_path) and os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                ns = _Namespace(1)
+                ns.index = faiss.read_index(index_path)
+                ns.entries = {int(k): v for k, v in meta["entries"].items()}
+                ns.next_id = meta["next_id"]
+                self._namespaces[namespace] = ns
+                return ns
+
+        if dim is None:
+            return None
+        ns = _Namespace(dim)
+        self._namespaces[namespace] = ns
+        return ns
+
+    def _evict(self, ns, now):
+        """Remove expired entries and trim the namespace to max_entries."""
+        stale = []
+        if self.ttl_seconds:
+            stale = [i for i, e in ns.entries.items() if now - e["created"] > self.ttl_seconds]
+        overflow = len(ns.entries) - len(stale) - self.max_entries
+        if overflow > 0:
+            # Entry ids are assigned in insertion order
+            expired = set(stale)
+            remaining = sorted(i for i in ns.entries if i not in expired)
+            stale.extend(remaining[:overflow])
+        if stale:
+            ns.index.remove_ids(np.asarray(stale, dtype=np.int64))
+            for entry_id in stale:
+                del ns.entries[entry_id]
+            ns.dirty = True
+
+    def lookup(self, namespace, prompt):
+        """
+        Return the cached answer for a prompt similar enough to a stored one.
+
+        Args:
+            namespace (str): The namespace key for the model configuration.
+            prompt (str): The incoming prompt.
+
+        Returns:
+            str: The cached answer, or None on a miss.
+        """
+        query = embed_to_array(self.embedder, [prompt])
+        with self._lock:
+            ns = self._get_namespace(namespace)
+            if ns is None or ns.index.ntotal == 0:
+                self.misses += 1
+                return None
+
+            self._evict(ns, time.time())
+            if ns.index.ntotal == 0:
+                self.misses += 1
+                return None
+
+            scores, ids = ns.index.search(query, 1)
+            if ids[0][0] >= 0 and scores[0][0] >= self.threshold:
+                self.hits += 1
+                return ns.entries[int(ids[0][0])]["response"]
+
+            self.misses += 1
+            return None
+
+    def add(self, namespace, prompt, response):
+        """
+        Store an answer for a prompt.
+
+        Args:
+            namespace (str): The namespace key for the model configuration.
+            prompt (str): The prompt that was answered.
+            response (str): The answer to cache.
+        """
+        vector = embed_to_array(self.embedder, [prompt])
+        with self._lock:
+            ns = self._get_namespace(namespace, dim=vector.shape[1])
+            entry_id = ns.next_id
+            ns.next_id += 1
+            ns.index.add_with_ids(vector, np.asarray([entry_id], dtype=np.int64))
+            ns.entries[entry_id] = {
+                "prompt": prompt,
+                "response": response,
+                "created": time.time()
+            }
+            ns.dirty = True
+            self._evict(ns, time.time())
+
+            self._pending_saves[namespace] = self._pending_saves.get(namespace, 0) + 1
+            if self.persist_dir and self._pending_saves[namespace] >= self.autosave_every:
+                self._save_namespace(namespace, ns)
+
+    def _save_namespace(self, namespace, ns):
+        os.makedirs(self.persist_dir, exist_ok=True)
+        index_path, meta_path = self._paths(namespace)
+        # Write to temporary files first so a crash never leaves a torn index
+        faiss.write_index(ns.index, index_path + ".tmp")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"next_id": ns.next_id, "entries": ns.entries}, f)
+        os.replace(index_path + ".tmp", index_path)
+        os.replace(meta_path + ".tmp", meta_path)
+        ns.dirty = False
+        self._pending_saves[namespace] = 0
+
+    def save(self):
+        """Persist every namespace with unsaved changes."""
+        if not self.persist_dir:
+            return
+        with self._lock:
+            for namespace, ns in self._namespaces.items():
+                if ns.dirty:
+                    self._save_namespace(namespace, ns)
+
+    def stats(self):
+        """Return hit/miss counters and the number of cached entries."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'name': 'semantic',
+                'size': sum(len(ns.entries) for ns in self._namespaces.values()),
+                'maxsize': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+_default_cache = None
+_default_cache_settings = None
+_default_cache_lock = threading.Lock()
+
+
+def get_semantic_cache(**kwargs):
+    """
+    Return the process-wide semantic cache, creating it on first use.
+
+    Args:
+        **kwargs: Passed to SemanticCache the first time it is created.
+
+    Returns:
+        SemanticCache: The shared cache instance.
+
+    Raises:
+        ValueError: If the cache already exists with different settings.
+    """
+    global _default_cache, _default_cache_settings
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SemanticCache(**kwargs)
+            _default_cache_settings = kwargs
+            # Flush entries added since the last autosave on shutdown
+            atexit.register(_default_cache.save)
+        elif kwargs != _default_cache_settings:
+            raise ValueError(
+                f"The semantic cache was created with {_default_cache_settings}, "
+                f"not {kwargs}."
+            )
+        return _default_cache
+
+
+def get_semantic_cache_stats():
+    """
+    Return the stats of the process-wide semantic cache without creating it.
+
+    Returns:
+        dict: The cache stats, or None if no cache has been created yet.
+    """
+    with _default_cache_lock:
+        cache = _default_cache
+    return cache.stats() if cache else None
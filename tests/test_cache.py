@@ -0,0 +1,20 @@
+from src.langraphAgenticAI.utils import cache
+from src.langraphAgenticAI.utils.cache import graph_cache, llm_client_cache, use_llm_settings
+
+
+def test_settings_are_dropped_once_no_session_uses_them():
+    old, new = ("test", "old-model"), ("test", "new-model")
+    llm_client_cache.put(old, "client")
+    graph_cache.put((old, "Basic Chatbot"), "graph")
+
+    use_llm_settings("session-a", old)
+    use_llm_settings("session-b", old)
+    use_llm_settings("session-a", old)
+    # Session b still uses the old settings
+    assert use_llm_settings("session-a", new) == 0
+    assert old in llm_client_cache
+
+    assert use_llm_settings("session-b", new) == 2
+    assert old not in llm_client_cache
+    assert (old, "Basic Chatbot") not in graph_cache
+    assert cache._settings_users[new] == 2
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from typing import Annotated
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import InjectedToolCallId, tool
+from langgraph.types import Command
+from src.langraphAgenticAI.tool_node.parallel_tool_node import ParallelToolNode
+
+
+def state_with_calls(*calls):
+    return {"messages": [AIMessage(content="", tool_calls=[
+        {"name": name, "args": args, "id": call_id} for name, args, call_id in calls
+    ])]}
+
+
+@tool
+def add(a: int, b: int) -> dict:
+    """Add two numbers."""
+    return {"sum": a + b}
+
+
+@tool
+def whoami(tool_call_id: Annotated[str, InjectedToolCallId]) -> str:
+    """Return the id of the tool call."""
+    return f"called as {tool_call_id}"
+
+
+@tool(response_format="content_and_artifact")
+def search(query: str):
+    """Search with an artifact."""
+    return f"results for {query}", {"hits": [1, 2]}
+
+
+@tool
+def direct(tool_call_id: Annotated[str, InjectedToolCallId]) -> ToolMessage:
+    """Return a ToolMessage directly."""
+    return ToolMessage(content="direct", tool_call_id=tool_call_id, artifact={"raw": True})
+
+
+@tool
+def set_topic(topic: str, tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
+    """Update the graph state."""
+    return Command(update={"topic": topic, "messages": [
+        ToolMessage(content="topic set", tool_call_id=tool_call_id)
+    ]})
+
+
+def run_both(node, state):
+    return node.invoke(state), asyncio.run(node.ainvoke(state))
+
+
+def test_plain_results_are_stringified():
+    for update in run_both(ParallelToolNode([add]), state_with_calls(("add", {"a": 1, "b": 2}, "c1"))):
+        message, = update["messages"]
+        assert message.tool_call_id == "c1"
+        assert message.content == '{"sum": 3}'
+
+
+def test_injected_tool_call_id():
+    for update in run_both(ParallelToolNode([whoami]), state_with_calls(("whoami", {}, "c1"))):
+        message, = update["messages"]
+        assert message.status == "success"
+        assert message.content == "called as c1"
+
+
+def test_tool_messages_and_artifacts_pass_through():
+    node = ParallelToolNode([search, direct])
+    state = state_with_calls(("search", {"query": "x"}, "c1"), ("direct", {}, "c2"))
+    for update in run_both(node, state):
+        first, second = update["messages"]
+        assert (first.content, first.artifact) == ("results for x", {"hits": [1, 2]})
+        assert (second.content, second.artifact, second.tool_call_id) == ("direct", {"raw": True}, "c2")
+
+
+def test_command_results_are_returned_as_updates():
+    node = ParallelToolNode([set_topic, add])
+    state = state_with_calls(("set_topic", {"topic": "cats"}, "c1"), ("add", {"a": 1, "b": 1}, "c2"))
+    for update in run_both(node, state):
+        command, messages = update
+        assert isinstance(command, Command) and command.update["topic"] == "cats"
+        assert [m.tool_call_id for m in messages["messages"]] == ["c2"]
+
+
+def test_cached_results_answer_the_new_call():
+    node = ParallelToolNode([add], cacheable_tools={"add"})
+    node.invoke(state_with_calls(("add", {"a": 1, "b": 2}, "c1")))
+    message, = node.invoke(state_with_calls(("add", {"a": 1, "b": 2}, "c2")))["messages"]
+    assert (message.tool_call_id, message.content) == ("c2", '{"sum": 3}')
+
+
+def test_timed_out_sync_call_frees_its_slot():
+    release = threading.Event()
+
+    @tool
+    def slow(x: int) -> str:
+        """Block until released."""
+        if x == 0:
+            release.wait(5)
+        return str(x)
+
+    node = ParallelToolNode([slow], timeout=0.2, max_concurrency={"slow": 1})
+    try:
+        message, = node.invoke(state_with_calls(("slow", {"x": 0}, "c1")))["messages"]
+        assert message.status == "error"
+        # The hung call still runs, but no longer holds the only slot
+        message, = node.invoke(state_with_calls(("slow", {"x": 1}, "c2")))["messages"]
+        assert message.content == "1"
+    finally:
+        release.set()
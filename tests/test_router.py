@@ -0,0 +1,90 @@
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langgraph.graph import END, START, MessagesState, StateGraph
+from src.langraphAgenticAI.LLMS.router import ModelRouter, is_transient_error
+
+CALLS = []
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class ScriptedModel(BaseChatModel):
+    """Streams two tokens, failing as configured."""
+
+    label: str
+    error: object = None
+    fail_after_token: bool = False
+
+    @property
+    def _llm_type(self):
+        return "scripted"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        CALLS.append(self.label)
+        if self.error and not self.fail_after_token:
+            raise self.error
+        for token in (f"{self.label}1", f"{self.label}2"):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+            if self.error:
+                raise self.error
+
+
+def streamed_tokens(router):
+    graph = StateGraph(MessagesState)
+    graph.add_node("chatbot", lambda state: {"messages": [router.invoke(state["messages"])]})
+    graph.add_edge(START, "chatbot")
+    graph.add_edge("chatbot", END)
+    stream = graph.compile().stream({"messages": [("user", "hi")]}, stream_mode="messages")
+    return [chunk.content for chunk, _ in stream if chunk.content]
+
+
+def make_router(name, primary):
+    CALLS.clear()
+    return ModelRouter(
+        [((name, "primary"), primary), ((name, "fallback"), ScriptedModel(label="B"))],
+        max_retries=2, backoff_base=0.001
+    )
+
+
+def test_error_classification():
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(ConnectionResetError())
+    assert is_transient_error(StatusError(429))
+    assert is_transient_error(StatusError(503))
+    assert not is_transient_error(StatusError(401))
+    assert not is_transient_error(StatusError(400))
+    assert not is_transient_error(ValueError("bad input"))
+
+
+def test_transient_errors_are_retried_before_falling_back():
+    router = make_router("transient", ScriptedModel(label="A", error=TimeoutError()))
+    assert streamed_tokens(router) == ["B1", "B2"]
+    assert CALLS == ["A", "A", "A", "B"]
+
+
+def test_other_errors_fall_back_without_retrying():
+    router = make_router("client_error", ScriptedModel(label="A", error=StatusError(400)))
+    assert streamed_tokens(router) == ["B1", "B2"]
+    assert CALLS == ["A", "B"]
+
+
+def test_no_retry_after_tokens_were_streamed():
+    router = make_router("partial", ScriptedModel(label="A", error=TimeoutError(), fail_after_token=True))
+    with pytest.raises(TimeoutError):
+        streamed_tokens(router)
+    assert CALLS == ["A"]
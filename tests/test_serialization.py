@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
+from src.langraphAgenticAI.state.serialization import CompactSerializer, compact_to_message, message_to_compact
+
+
+def conversation():
+    return [
+        SystemMessage(content="You are helpful.", id="s1"),
+        HumanMessage(content="What is the weather in Paris?", id="h1"),
+        AIMessage(
+            content="",
+            id="a1",
+            tool_calls=[{"name": "weather", "args": {"city": "Paris", "days": 2}, "id": "call_1"}],
+            usage_metadata={"input_tokens": 12, "output_tokens": 8, "total_tokens": 20},
+            response_metadata={"finish_reason": "tool_calls"}
+        ),
+        ToolMessage(content='{"temp": 21}', tool_call_id="call_1", name="weather", id="t1"),
+        ToolMessage(content="Error: timed out", tool_call_id="call_2", status="error", id="t2"),
+        AIMessage(content=[{"type": "text", "text": "It is 21°C."}], id="a2"),
+    ]
+
+
+def test_messages_round_trip():
+    for message in conversation():
+        assert compact_to_message(message_to_compact(message)) == message
+
+
+def test_compact_form_omits_defaults():
+    assert message_to_compact(HumanMessage(content="hi", id="h1")) == ["h", "hi", "h1"]
+
+
+def test_checkpoint_round_trip():
+    serde = CompactSerializer()
+    state = {
+        "messages": conversation(),
+        "partials": [{"level": 0, "index": 0, "text": "part"}],
+        "nested": [{"message": HumanMessage(content="nested", id="h2")}],
+    }
+    assert serde.loads_typed(serde.dumps_typed(state)) == state
+
+
+def test_other_message_types_keep_default_serialization():
+    serde = CompactSerializer()
+    chunk = AIMessageChunk(content="partial", id="c1")
+    restored = serde.loads_typed(serde.dumps_typed({"messages": [chunk]}))
+    assert restored["messages"] == [chunk]
+    assert isinstance(restored["messages"][0], AIMessageChunk)
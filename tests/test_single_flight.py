@@ -0,0 +1,213 @@
+import asyncio
+import threading
+
+from src.langraphAgenticAI.utils.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        for item in ("a", "b", "c"):
+            await asyncio.sleep(0.01)
+            yield item
+
+    async def main():
+        async def collect():
+            return [item async for item in flights.astream("key", produce)]
+
+        return await asyncio.gather(collect(), collect(), collect())
+
+    assert asyncio.run(main()) == [["a", "b", "c"]] * 3
+    assert calls == [1]
+    stats = flights.stats()
+    assert (stats["leaders"], stats["followers"], stats["in_flight"]) == (1, 2, 0)
+
+
+def test_late_joiner_replays_earlier_items():
+    flights = SingleFlight()
+    release = None
+
+    async def produce():
+        yield 1
+        await release.wait()
+        yield 2
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        leader = flights.astream("key", produce)
+        assert await leader.__anext__() == 1
+
+        async def follow():
+            return [item async for item in flights.astream("key", produce)]
+
+        follower = asyncio.create_task(follow())
+        await asyncio.sleep(0.01)
+        release.set()
+        assert [item async for item in leader] == [2]
+        return await follower
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_follower_copy_applies_to_followers_only():
+    flights = SingleFlight()
+
+    async def produce():
+        await asyncio.sleep(0.01)
+        yield "item"
+
+    async def main():
+        async def collect():
+            return [item async for item in flights.astream("key", produce, follower_copy=str.upper)]
+
+        return await asyncio.gather(collect(), collect())
+
+    assert asyncio.run(main()) == [["item"], ["ITEM"]]
+
+
+def test_last_subscriber_leaving_cancels_the_call():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def produce():
+        try:
+            yield 1
+            await asyncio.sleep(10)
+            yield 2
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        stream = flights.astream("key", produce)
+        assert await stream.__anext__() == 1
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        assert flights.stats()["in_flight"] == 0
+        # The key is free again, so the next caller starts a fresh call
+        stream = flights.astream("key", produce)
+        assert await stream.__anext__() == 1
+        await stream.aclose()
+
+    asyncio.run(main())
+    assert cancelled == [True, True]
+    assert flights.stats()["leaders"] == 2
+
+
+def test_errors_reach_every_subscriber():
+    flights = SingleFlight()
+
+    async def produce():
+        await asyncio.sleep(0.01)
+        yield 1
+        raise ValueError("upstream failed")
+
+    async def collect(received):
+        async for item in flights.astream("key", produce):
+            received.append(item)
+
+    async def main():
+        received = [[], []]
+        results = await asyncio.gather(*(collect(r) for r in received), return_exceptions=True)
+        return received, results
+
+    received, results = asyncio.run(main())
+    assert received == [[1], [1]]
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_sync_callers_share_one_call_and_errors():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def produce():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        yield "x"
+        raise ValueError("upstream failed")
+
+    results = [None, None]
+
+    def collect(slot):
+        received = []
+        try:
+            for item in flights.stream("key", produce, follower_copy=str.upper):
+                received.append(item)
+        except ValueError as e:
+            received.append(e)
+        results[slot] = received
+
+    leader = threading.Thread(target=collect, args=(0,))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=collect, args=(1,))
+    follower.start()
+    while flights.stats()["followers"] < 1:
+        pass
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert calls == [1]
+    assert results[0][0] == "x" and results[1][0] == "X"
+    assert all(isinstance(received[1], ValueError) for received in results)
+
+
+def test_sync_call_stops_when_abandoned():
+    flights = SingleFlight()
+    produced = []
+    gate = threading.Event()
+    finished = threading.Event()
+
+    def produce():
+        try:
+            for i in range(100):
+                produced.append(i)
+                yield i
+                gate.wait(5)
+        finally:
+            finished.set()
+
+    stream = flights.stream("key", produce)
+    assert next(stream) == 0
+    stream.close()
+    assert flights.stats()["in_flight"] == 0
+    gate.set()
+    assert finished.wait(5)
+    assert len(produced) <= 2
+
+
+def test_sync_follower_joining_before_the_call_starts():
+    flights = SingleFlight()
+    join = flights._join
+    results = {}
+
+    def follow():
+        try:
+            results["follower"] = list(flights.stream("key", lambda: iter(["a", "b"])))
+        except Exception as e:
+            results["follower"] = e
+
+    def delayed_join(key, *args, **kwargs):
+        flight, leader = join(key, *args, **kwargs)
+        if leader:
+            # A follower joins before the leader has started the call
+            results["thread"] = threading.Thread(target=follow)
+            results["thread"].start()
+            while flights.stats()["followers"] < 1:
+                pass
+            results["thread"].join(0.1)
+        return flight, leader
+
+    flights._join = delayed_join
+    assert list(flights.stream("key", lambda: iter(["a", "b"]))) == ["a", "b"]
+    results["thread"].join(5)
+    assert results["follower"] == ["a", "b"]